@@ -0,0 +1,143 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Backup catalog
+
+One JSON file in the game directory lists every backup (id, folder,
+creation time, installer version, files with sizes and digests), newest
+last. Listing and choosing a backup reads only this file, however many
+backups exist. If the catalog is missing or unreadable it is rebuilt from
+the Backup_* folders and their manifests.
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import BACKUP_CATALOG_FILE, BACKUP_CATALOG_VERSION, BACKUP_ARCHIVE_FILE
+from backup_store import BackupStore
+
+BACKUP_PREFIX = "Backup_"
+BACKUP_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Files in a backup folder that are not backed-up game files
+BACKUP_METADATA_FILES = ("backup_log.txt", BACKUP_ARCHIVE_FILE)
+
+
+class BackupCatalog:
+    """Index of the backups in a game directory"""
+
+    def __init__(self, game_dir):
+        self.game_dir = Path(game_dir)
+        self.path = self.game_dir / BACKUP_CATALOG_FILE
+        self.logger = logging.getLogger('rebellion_installer')
+        self.entries: List[dict] = []
+        if not self.load():
+            self.rebuild()
+
+    def load(self) -> bool:
+        """Load the catalog; False if it is missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != BACKUP_CATALOG_VERSION:
+            return False
+        self.entries = data.get("backups", [])
+        return True
+
+    def save(self) -> bool:
+        """Write the catalog atomically"""
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": BACKUP_CATALOG_VERSION, "backups": self.entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not save backup catalog: {e}")
+            return False
+
+    def rebuild(self) -> int:
+        """Recreate the catalog from the backup folders on disk; returns the backup count"""
+        store = BackupStore(self.game_dir)
+        entries = []
+        for backup_dir in store.backup_dirs():
+            manifest = store.read_manifest(backup_dir)
+            if manifest is None:
+                manifest = self._manifest_from_folder(store, backup_dir)
+            entries.append(self._make_entry(backup_dir.name, manifest))
+
+        self.entries = sorted(entries, key=lambda entry: (entry["created"], entry["id"]))
+        store.save_stat_cache()
+        if entries or self.path.exists():
+            self.save()
+        self.logger.info(f"Rebuilt backup catalog: {len(entries)} backup(s)")
+        return len(entries)
+
+    def _manifest_from_folder(self, store: BackupStore, backup_dir: Path) -> dict:
+        """Describe a backup made before manifests existed"""
+        try:
+            created = datetime.strptime(backup_dir.name[len(BACKUP_PREFIX):], BACKUP_TIMESTAMP_FORMAT)
+        except ValueError:
+            created = datetime.fromtimestamp(backup_dir.stat().st_mtime)
+
+        files = {}
+        for item in backup_dir.iterdir():
+            if item.is_file() and item.name not in BACKUP_METADATA_FILES:
+                sha256, size = store.digest(item)
+                files[item.name] = {"sha256": sha256, "size": size}
+        return {"created": created.isoformat(timespec="seconds"), "installer_version": None, "files": files}
+
+    @staticmethod
+    def _make_entry(folder: str, manifest: dict) -> dict:
+        files = {
+            name: {"sha256": entry["sha256"], "size": entry["size"]}
+            for name, entry in manifest.get("files", {}).items()
+        }
+        return {
+            "id": folder[len(BACKUP_PREFIX):] if folder.startswith(BACKUP_PREFIX) else folder,
+            "folder": folder,
+            "created": manifest.get("created"),
+            "installer_version": manifest.get("installer_version"),
+            "files": files,
+            "size": sum(entry["size"] for entry in files.values()),
+            "archive": manifest.get("archive"),
+        }
+
+    def add(self, backup_dir: Path, manifest: dict) -> dict:
+        """Record a new backup"""
+        entry = self._make_entry(Path(backup_dir).name, manifest)
+        self.entries = [existing for existing in self.entries if existing["id"] != entry["id"]]
+        self.entries.append(entry)
+        self.save()
+        return entry
+
+    def remove(self, backup_id: str) -> bool:
+        """Forget a backup"""
+        remaining = [entry for entry in self.entries if entry["id"] != backup_id]
+        if len(remaining) == len(self.entries):
+            return False
+        self.entries = remaining
+        self.save()
+        return True
+
+    def list(self) -> List[dict]:
+        """All backups, newest first"""
+        return list(reversed(self.entries))
+
+    def latest(self) -> Optional[dict]:
+        return self.entries[-1] if self.entries else None
+
+    def get(self, backup_id: str) -> Optional[dict]:
+        """Find a backup by id ("20250101_120000") or folder name ("Backup_20250101_120000")"""
+        for entry in self.entries:
+            if backup_id in (entry["id"], entry["folder"]):
+                return entry
+        return None
+
+    def folder(self, entry: Dict) -> Path:
+        return self.game_dir / entry["folder"]
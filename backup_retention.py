@@ -0,0 +1,162 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Backup retention
+
+Decides which backups to delete: the newest keep_last backups and any
+backup younger than max_age_days are kept, then the oldest of the rest go
+until the backups fit in max_bytes. The newest backup of unpatched
+originals is never deleted, since it is the only way back to the stock
+game. Pruning removes the folders, drops them from the catalog and lets
+the backup store gc free objects no backup refers to any more.
+"""
+
+import os
+import shutil
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from config import BACKUP_KEEP_LAST, BACKUP_KEEP_DAYS, BACKUP_MAX_BYTES, PATCH_FILE_HASHES
+from backup_catalog import BackupCatalog
+from backup_store import BackupStore
+
+# Backup folders being deleted are renamed with this prefix first
+DELETED_PREFIX = ".deleted_"
+
+
+@dataclass
+class RetentionPolicy:
+    """Which backups to keep; 0 or None disables a rule"""
+    keep_last: int = BACKUP_KEEP_LAST
+    max_age_days: Optional[float] = BACKUP_KEEP_DAYS
+    max_bytes: Optional[int] = BACKUP_MAX_BYTES
+
+
+@dataclass
+class PruneResult:
+    """Backups deleted (or that would be, in a dry run) and the space freed"""
+    deleted: List[str] = field(default_factory=list)
+    kept: List[str] = field(default_factory=list)
+    protected: Optional[str] = None
+    bytes_before: int = 0
+    bytes_after: int = 0
+    objects_removed: int = 0
+
+
+def is_original_backup(entry: Dict) -> bool:
+    """Whether a backup holds unpatched game files: none of them is a patch file"""
+    files = entry.get("files", {})
+    if not files:
+        return False
+    for filename, file_entry in files.items():
+        patched = PATCH_FILE_HASHES.get(filename)
+        if patched and file_entry["sha256"] == patched["sha256"]:
+            return False
+    return True
+
+
+def backup_footprint(catalog: BackupCatalog, entries: List[Dict]) -> int:
+    """
+    Bytes the given backups take up: each stored object once however many
+    backups share it, plus the size of archived backups
+    """
+    objects = {}
+    total = 0
+    for entry in entries:
+        if entry.get("archive"):
+            try:
+                total += os.path.getsize(catalog.folder(entry) / entry["archive"])
+            except OSError:
+                pass
+            continue
+        for file_entry in entry["files"].values():
+            objects[file_entry["sha256"]] = file_entry["size"]
+    return total + sum(objects.values())
+
+
+def plan_prune(catalog: BackupCatalog, policy: RetentionPolicy,
+               now: Optional[datetime] = None) -> PruneResult:
+    """Work out which backups the policy deletes, without touching anything"""
+    now = now or datetime.now()
+    newest_first = catalog.list()
+    result = PruneResult(bytes_before=backup_footprint(catalog, newest_first))
+
+    protected = next((entry for entry in newest_first if is_original_backup(entry)), None)
+    if protected is None and newest_first:
+        # Nothing is known to be original: the oldest backup is the best bet
+        protected = newest_first[-1]
+    result.protected = protected["id"] if protected else None
+
+    keep = []
+    candidates = []
+    for index, entry in enumerate(newest_first):
+        if entry is protected or (policy.keep_last and index < policy.keep_last):
+            keep.append(entry)
+            continue
+        if policy.max_age_days and entry.get("created"):
+            try:
+                if now - datetime.fromisoformat(entry["created"]) < timedelta(days=policy.max_age_days):
+                    keep.append(entry)
+                    continue
+            except ValueError:
+                pass
+        candidates.append(entry)
+
+    if policy.max_bytes:
+        # Trim the oldest kept backups until the rest fit, sparing the newest
+        # one kept and the protected original
+        trimmable = [entry for entry in keep[1:] if entry is not protected]
+        while trimmable and backup_footprint(catalog, keep) > policy.max_bytes:
+            entry = trimmable.pop()
+            keep.remove(entry)
+            candidates.append(entry)
+
+    result.kept = [entry["id"] for entry in keep]
+    result.deleted = [entry["id"] for entry in candidates]
+    result.bytes_after = backup_footprint(catalog, keep)
+    return result
+
+
+def prune_backups(game_dir, policy: RetentionPolicy, dry_run: bool = False,
+                  cancel_event=None) -> PruneResult:
+    """Apply the retention policy to a game directory's backups"""
+    logger = logging.getLogger('rebellion_installer')
+    catalog = BackupCatalog(game_dir)
+    result = plan_prune(catalog, policy)
+    if not dry_run:
+        # Finish deletions an earlier run was interrupted in
+        for leftover in catalog.game_dir.glob(f"{DELETED_PREFIX}*"):
+            shutil.rmtree(leftover, ignore_errors=True)
+
+    if dry_run:
+        for backup_id in result.deleted:
+            logger.info(f"Would delete backup: {backup_id}")
+        return result
+
+    deleted = []
+    for backup_id in result.deleted:
+        if cancel_event is not None and cancel_event.is_set():
+            logger.info("Backup pruning cancelled")
+            break
+        entry = catalog.get(backup_id)
+        # Rename and unlist before deleting, so a half-deleted backup is
+        # never offered for restore and is cleaned up by the next prune
+        doomed = catalog.game_dir / f"{DELETED_PREFIX}{entry['folder']}"
+        try:
+            os.rename(catalog.folder(entry), doomed)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete backup {backup_id}: {e}")
+            continue
+        catalog.remove(backup_id)
+        shutil.rmtree(doomed, ignore_errors=True)
+        deleted.append(backup_id)
+        logger.info(f"Deleted backup: {backup_id}")
+
+    result.deleted = deleted
+    result.bytes_after = backup_footprint(catalog, catalog.list())
+    if deleted:
+        result.objects_removed = BackupStore(game_dir).gc()[0]
+    return result
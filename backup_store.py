@@ -0,0 +1,203 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Content-addressed deduplicating backup store
+
+Backed-up originals are stored once per content (by SHA-256) under
+<game>/.backup_store/objects. Each Backup_* folder keeps a manifest naming
+the objects it uses, and its files are hardlinks to those objects where
+the filesystem allows. Reference counts come from the manifests and the
+backup catalog (restore falls back to the store for either), and gc removes
+objects that no backup refers to any more.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import BACKUP_STORE_DIR, BACKUP_MANIFEST_FILE
+from checkpoint import CheckpointJournal
+from copy_scheduler import CopyJob, CopyScheduler
+from hashing import hash_file
+
+
+class BackupStore:
+    """Object store for backed-up game files"""
+
+    def __init__(self, game_dir):
+        self.game_dir = Path(game_dir)
+        self.root = self.game_dir / BACKUP_STORE_DIR
+        self.objects_dir = self.root / "objects"
+        self.stat_cache_file = self.root / "stat_cache.json"
+        self.logger = logging.getLogger('rebellion_installer')
+        self._stat_cache: Optional[Dict[str, list]] = None
+
+    # -- objects -----------------------------------------------------------
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / sha256
+
+    def _load_stat_cache(self) -> Dict[str, list]:
+        if self._stat_cache is None:
+            try:
+                with open(self.stat_cache_file, 'r', encoding='utf-8') as f:
+                    self._stat_cache = json.load(f)
+            except (OSError, ValueError):
+                self._stat_cache = {}
+        return self._stat_cache
+
+    def save_stat_cache(self):
+        """Persist the digest cache used to avoid rehashing unchanged files"""
+        if self._stat_cache is None:
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.stat_cache_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._stat_cache, f)
+            os.replace(tmp_file, self.stat_cache_file)
+        except OSError as e:
+            self.logger.warning(f"Could not save backup digest cache: {e}")
+
+    def digest(self, file_path: Path) -> Tuple[str, int]:
+        """Get (sha256, size) of a file, reusing the cached digest if its stat is unchanged"""
+        st = os.stat(file_path)
+        key = str(file_path)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino]
+        cache = self._load_stat_cache()
+        cached = cache.get(key)
+        if cached and cached[:4] == signature:
+            return cached[4], st.st_size
+
+        sha256 = hash_file(file_path, ("sha256",))["sha256"]
+        cache[key] = signature + [sha256]
+        return sha256, st.st_size
+
+    def add_files(self, source_files: List[Path],
+                  scheduler: Optional[CopyScheduler] = None) -> Dict[str, Dict[str, object]]:
+        """
+        Store several files, copying only content not stored yet, in parallel.
+        Returns {file name: manifest entry}.
+        """
+        entries = {}
+        jobs = {}
+        for source_file in source_files:
+            sha256, size = self.digest(source_file)
+            entries[source_file.name] = {"sha256": sha256, "size": size}
+            object_file = self.object_path(sha256)
+            if object_file.exists():
+                self.logger.info(f"Backup object already stored: {source_file.name}")
+            elif sha256 not in jobs:
+                object_file.parent.mkdir(parents=True, exist_ok=True)
+                jobs[sha256] = CopyJob(source_file, object_file.with_suffix(".tmp"), source_file.name, size,
+                                       expected_sha256=sha256)
+
+        scheduler = scheduler or CopyScheduler()
+        scheduler.run(list(jobs.values()))
+        failed = [job for job in jobs.values() if not job.ok]
+        if failed:
+            # Leave no partial objects behind, unless a checkpoint can resume them
+            for job in jobs.values() if scheduler.checkpoint is None else []:
+                try:
+                    job.dest.unlink()
+                except OSError:
+                    pass
+            raise OSError(f"Failed to back up {failed[0].name}: {failed[0].error}")
+        # How each object's content was checked when it was written
+        method = "read-back" if scheduler.read_back else "stream" if scheduler.verify else None
+        for sha256, job in jobs.items():
+            os.replace(job.dest, self.object_path(sha256))
+            if method:
+                entries[job.name]["verified"] = method
+
+        return entries
+
+    def link_into(self, sha256: str, dest_file: Path) -> bool:
+        """Hardlink an object into a backup folder; False if the filesystem does not allow it"""
+        try:
+            os.link(self.object_path(sha256), dest_file)
+            return True
+        except OSError:
+            return False
+
+    # -- manifests ---------------------------------------------------------
+
+    def write_manifest(self, backup_dir: Path, manifest: dict):
+        with open(Path(backup_dir) / BACKUP_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    def read_manifest(self, backup_dir: Path) -> Optional[dict]:
+        try:
+            with open(Path(backup_dir) / BACKUP_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def resolve(self, backup_dir: Path, filename: str) -> Optional[Path]:
+        """Find the backed-up copy of a file: in the backup folder, else in the object store"""
+        backup_file = Path(backup_dir) / filename
+        if backup_file.exists():
+            return backup_file
+
+        manifest = self.read_manifest(backup_dir)
+        entry = (manifest or {}).get("files", {}).get(filename)
+        if entry:
+            object_file = self.object_path(entry["sha256"])
+            if object_file.exists():
+                return object_file
+        return None
+
+    def backup_dirs(self) -> List[Path]:
+        try:
+            return [item for item in self.game_dir.iterdir()
+                    if item.is_dir() and item.name.startswith("Backup_")]
+        except OSError:
+            return []
+
+    # -- reference counting / gc --------------------------------------------
+
+    def refcounts(self) -> Dict[str, int]:
+        """Count how many backups refer to each object, by folder manifest or catalog entry"""
+        from backup_catalog import BackupCatalog
+
+        counts: Dict[str, int] = {}
+        manifests = [self.read_manifest(backup_dir) or {} for backup_dir in self.backup_dirs()]
+        for manifest in manifests + BackupCatalog(self.game_dir).list():
+            if manifest.get("archive"):
+                # Archived backups hold their own data
+                continue
+            for entry in manifest.get("files", {}).values():
+                counts[entry["sha256"]] = counts.get(entry["sha256"], 0) + 1
+        return counts
+
+    def gc(self, dry_run: bool = False) -> Tuple[int, int]:
+        """Remove unreferenced objects; returns (objects removed, bytes freed)"""
+        if not self.objects_dir.exists():
+            return 0, 0
+
+        counts = self.refcounts()
+        # Partial objects an interrupted backup will resume
+        resumable = set(CheckpointJournal(self.game_dir, "backup").entries)
+        removed = 0
+        freed = 0
+        for object_file in self.objects_dir.glob("*/*"):
+            if counts.get(object_file.name, 0) > 0 or str(object_file) in resumable:
+                continue
+            try:
+                size = object_file.stat().st_size
+                if not dry_run:
+                    object_file.unlink()
+                removed += 1
+                freed += size
+                self.logger.info(f"{'Would remove' if dry_run else 'Removed'} unreferenced backup object: {object_file.name}")
+            except OSError as e:
+                self.logger.warning(f"Could not remove backup object {object_file.name}: {e}")
+
+        if not dry_run:
+            # Forget cached digests for files that no longer exist
+            cache = self._load_stat_cache()
+            for key in [key for key in cache if not os.path.exists(key)]:
+                del cache[key]
+            self.save_stat_cache()
+        return removed, freed
@@ -19,11 +19,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        ('D3Dlmm.dll', '.'),
-        ('d3drm.dll', '.'),
-        ('DDraw.dll', '.'),
-        ('REBEXE.exe', '.'),
-        ('attached_assets', 'attached_assets'),
+        ('payload.rbpak', '.'),
+        ('deltas', 'deltas'),
     ],
     hiddenimports=[],
     hookspath=[],
@@ -65,6 +62,33 @@ exe = EXE(
     
     print("✓ Created PyInstaller specification file: installer.spec")
 
+def create_payload_archive():
+    """Pack the patch files into the compressed payload archive bundled with the installer"""
+    from config import PATCH_FILES, PAYLOAD_ARCHIVE
+    from payload import find_payload_source
+    from payload_archive import build_archive
+    
+    sources = {}
+    for filename in PATCH_FILES:
+        source = find_payload_source(filename)
+        if source is None:
+            raise FileNotFoundError(f"Patch file not found: {filename}")
+        sources[filename] = source
+    
+    members = build_archive(sources, PAYLOAD_ARCHIVE)
+    original_size = sum(member.size for member in members)
+    archive_size = Path(PAYLOAD_ARCHIVE).stat().st_size
+    print(f"✓ Created payload archive: {PAYLOAD_ARCHIVE} ({original_size // 1024} KB -> {archive_size // 1024} KB)")
+
+def collect_deltas():
+    """Make sure the delta directory bundled with the installer exists"""
+    from config import DELTA_DIR
+    
+    delta_dir = Path(DELTA_DIR)
+    delta_dir.mkdir(exist_ok=True)
+    deltas = list(delta_dir.glob('*.rbdelta'))
+    print(f"✓ Bundling {len(deltas)} delta(s) from {DELTA_DIR}/")
+
 def create_version_info():
     """Create version information file for Windows executable"""
     version_info = '''# UTF-8
@@ -239,6 +263,8 @@ def main():
             print(f"✓ Cleaned {cleanup_dir} directory")
     
     # Create build files
+    create_payload_archive()
+    collect_deltas()
     create_version_info()
     create_icon()
     create_pyinstaller_spec()
@@ -0,0 +1,119 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Checkpoint journal for resumable copies
+
+Backup, install and restore record how far each file transfer has durably
+progressed (the destination is fsynced before its offset is recorded) and
+which transfers completed. When an interrupted operation runs again, files
+already done are skipped and partial files continue from their offset, so
+only the remaining bytes are copied. Entries are invalidated if the source
+or destination changed in between.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict
+
+from config import CHECKPOINT_FILE
+
+
+class CheckpointJournal:
+    """Per-operation record of copy progress, keyed by destination path"""
+
+    def __init__(self, game_dir, operation: str):
+        self.path = Path(game_dir) / CHECKPOINT_FILE.format(operation=operation)
+        self.logger = logging.getLogger('rebellion_installer')
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("files", {})
+        except (OSError, ValueError, AttributeError):
+            self.entries = {}
+
+    def _save(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"files": self.entries}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save checkpoint {self.path.name}: {e}")
+
+    @property
+    def pending(self) -> bool:
+        """Whether an earlier run of this operation was interrupted"""
+        return bool(self.entries)
+
+    def resume_offset(self, source: Path, dest: Path) -> int:
+        """
+        Bytes of dest that can be kept: the full size if the transfer
+        already completed, the recorded offset for a partial one, else 0
+        """
+        entry = self.entries.get(str(dest))
+        if not entry:
+            return 0
+        try:
+            source_stat = os.stat(source)
+            dest_stat = os.stat(dest)
+        except OSError:
+            return 0
+
+        if entry["source"] != str(source) or entry["source_size"] != source_stat.st_size \
+                or entry["source_mtime_ns"] != source_stat.st_mtime_ns:
+            return 0
+        if entry["done"]:
+            if dest_stat.st_size == source_stat.st_size and entry.get("dest_mtime_ns") == dest_stat.st_mtime_ns:
+                return source_stat.st_size
+            return 0
+        return entry["offset"] if dest_stat.st_size >= entry["offset"] else 0
+
+    def record(self, source: Path, dest: Path, offset: int):
+        """Record that the first offset bytes of dest are durable"""
+        source_stat = os.stat(source)
+        with self._lock:
+            self.entries[str(dest)] = {
+                "source": str(source),
+                "source_size": source_stat.st_size,
+                "source_mtime_ns": source_stat.st_mtime_ns,
+                "offset": offset,
+                "done": False,
+            }
+            self._save()
+
+    def complete(self, source: Path, dest: Path):
+        """Record that dest is a complete copy of source"""
+        source_stat = os.stat(source)
+        with self._lock:
+            self.entries[str(dest)] = {
+                "source": str(source),
+                "source_size": source_stat.st_size,
+                "source_mtime_ns": source_stat.st_mtime_ns,
+                "offset": source_stat.st_size,
+                "done": True,
+                "dest_mtime_ns": os.stat(dest).st_mtime_ns,
+            }
+            self._save()
+
+    def discard(self, dest: Path):
+        """Forget a transfer so it starts over"""
+        with self._lock:
+            if self.entries.pop(str(dest), None) is not None:
+                self._save()
+
+    def clear(self):
+        """Forget all progress once the operation has finished"""
+        with self._lock:
+            self.entries = {}
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
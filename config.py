@@ -7,6 +7,8 @@ Contributors:
 - Stratus (via Replit Agent AI / Claude Sonnet 4): Creator of this installer application
 """
 
+import os
+
 # Installer version
 VERSION = "2.63.1.0"
 
@@ -21,6 +23,77 @@ COMMON_PATHS = [
     r"D:\Program Files (x86)\Steam\steamapps\common\Star Wars - Rebellion"
 ]
 
+# Game executable used to recognise an installation
+GAME_EXECUTABLE = "REBEXE.exe"
+
+# Storefront records used to resolve installs without probing the filesystem
+STEAM_APP_ID = "571800"
+STEAM_REGISTRY_KEYS = [
+    (r"HKCU\Software\Valve\Steam", "SteamPath"),
+    (r"HKLM\SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
+    (r"HKLM\SOFTWARE\Valve\Steam", "InstallPath"),
+]
+GOG_REGISTRY_KEYS = [
+    r"HKLM\SOFTWARE\WOW6432Node\GOG.com\Games",
+    r"HKLM\SOFTWARE\GOG.com\Games",
+]
+GOG_GALAXY_DB = r"%ProgramData%\GOG.com\Galaxy\storage\galaxy-2.0.db"
+# Storefront titles must contain all of these (lower-case) to match
+STOREFRONT_TITLE_KEYWORDS = ("star wars", "rebellion")
+
+# Whole-disk discovery settings (used when no common path matches)
+DISCOVERY_MAX_DEPTH = 6
+DISCOVERY_WORKERS = 16
+
+# Per-user cache of known installations (skips discovery on repeat launches)
+DISCOVERY_CACHE_FILE = "discovery_cache.json"
+DISCOVERY_CACHE_VERSION = 1
+
+# Directory names never descended into during discovery (compared lower-case)
+DISCOVERY_SKIP_DIRS = {
+    "windows",
+    "winsxs",
+    "system volume information",
+    "recovery",
+    "perflogs",
+    "msocache",
+    "proc",
+    "sys",
+    "dev",
+    "run",
+    "snap",
+    "lost+found",
+    "node_modules",
+    "__pycache__",
+}
+
+# Directory name prefixes never descended into during discovery (compared
+# lower-case): backup folders the installer creates inside a game directory
+# hold a copy of REBEXE.exe but are not installations. The installer's own
+# working directories (.backup_store, .install_staging, ...) are hidden and
+# pruned with the other dot directories.
+DISCOVERY_SKIP_PREFIXES = ("backup_",)
+
+# Hidden (dot) directories that can hold Wine prefixes or Steam libraries,
+# descended into even though other hidden trees are pruned (compared lower-case)
+DISCOVERY_HIDDEN_ALLOW = {".wine", ".local", ".steam", ".var", ".playonlinux"}
+
+# Directories scanned as if they were a volume root, so installs below a Wine
+# prefix or Steam library are within DISCOVERY_MAX_DEPTH (compared lower-case)
+DISCOVERY_ROOT_DIRS = {"drive_c", "steamapps"}
+
+# A candidate scoring this high (e.g. a folder named after the game) ends
+# the disk scan early instead of waiting for every volume to be walked
+DISCOVERY_CONFIDENT_SCORE = 40
+
+# Mount types that never hold game files (Linux/Wine)
+DISCOVERY_PSEUDO_FILESYSTEMS = {
+    "proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "cgroup", "cgroup2",
+    "securityfs", "pstore", "debugfs", "tracefs", "configfs", "fusectl",
+    "mqueue", "hugetlbfs", "bpf", "autofs", "binfmt_misc", "efivarfs",
+    "squashfs", "nsfs", "rpc_pipefs",
+}
+
 # Patch files that need to be installed
 PATCH_FILES = [
     "D3Dlmm.dll",
@@ -29,6 +102,10 @@ PATCH_FILES = [
     "REBEXE.exe"
 ]
 
+# FileVersion of the patched REBEXE.exe (game version 1.02), as stored in
+# its VS_FIXEDFILEINFO resource
+PATCHED_EXE_VERSION = (0, 1, 0, 2)
+
 # Files to backup before patching
 BACKUP_FILES = [
     "D3Dlmm.dll",
@@ -39,14 +116,112 @@ BACKUP_FILES = [
     "EMBRIEF.dll"   # Empire briefing files
 ]
 
-# Expected file hashes for verification (if needed)
+# Names of the patch files as stored in attached_assets
+PATCH_FILE_ASSET_NAMES = {
+    "REBEXE.exe": "REBEXE_1751323218170.EXE",
+    "D3Dlmm.dll": "D3DImm_1751323218171.dll",
+    "DDraw.dll": "DDraw_1751323218169.dll",
+    "d3drm.dll": "d3drm_1751323218167.dll",
+}
+
+# Binary deltas against known original builds (see delta.py); the full
+# patch files are used when no delta matches the installed original
+DELTA_DIR = "deltas"
+DELTA_BLOCK_SIZE = 64
+
+# Expected size and SHA-256 of each patch file
+# Generated with: python payload.py
 PATCH_FILE_HASHES = {
-    # These would be filled in with actual hashes of the patch files
-    # "REBEXE.exe": "expected_hash_here",
-    # "D3Dlmm.dll": "expected_hash_here",
-    # etc.
+    "D3Dlmm.dll": {
+        "size": 119808,
+        "sha256": "d46cd74f84578c55669e59001e39cf8eb9e8935a9f920f3bc16450765237c502",
+    },
+    "d3drm.dll": {
+        "size": 351744,
+        "sha256": "9325747683e9961beaf4a203098df159dd4e9858e9cc24f417a2fc10451528cb",
+    },
+    "DDraw.dll": {
+        "size": 145408,
+        "sha256": "49afc355716d47dccef604d3ed23334dc2bb0ca7fa6a502539b9bb9ed160012b",
+    },
+    "REBEXE.exe": {
+        "size": 2819584,
+        "sha256": "8f35db8e899770b557f9900e0267955b56018ddd2565e3052fccf750abdd1dc0",
+    },
 }
 
+# Hash engine settings
+HASH_BUFFER_SIZE = 1024 * 1024  # 1MB read buffer
+HASH_MMAP_THRESHOLD = 8 * 1024 * 1024  # Files this large are hashed via mmap
+HASH_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Userspace copy buffer (used when no kernel copy mechanism is available)
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+# Granularity of byte-level progress reports from kernel copies
+COPY_PROGRESS_CHUNK = 8 * 1024 * 1024
+
+# Parallel copy scheduler: fewer workers when source and destination share
+# a device (avoids seek thrashing on HDDs), more across devices
+COPY_WORKERS_SAME_DEVICE = 2
+COPY_WORKERS_CROSS_DEVICE = 4
+# Files at least this large are copied in checkpointed chunks (fsynced per
+# chunk) so an interrupted copy can resume; smaller ones use the fastest copy.
+# Sized so REBEXE.exe (about 2.7 MB) resumes; the other payload files are
+# copied in one go
+COPY_RESUMABLE_MIN_SIZE = 1024 * 1024
+COPY_CHECKPOINT_CHUNK = 512 * 1024
+
+# Content-addressed backup store inside the game directory
+BACKUP_STORE_DIR = ".backup_store"
+BACKUP_MANIFEST_FILE = "backup_manifest.json"
+
+# Catalog of all backups in a game directory
+BACKUP_CATALOG_FILE = ".backup_catalog.json"
+BACKUP_CATALOG_VERSION = 1
+
+# Single-file compressed backups (--archive-backup); zlib is cheap enough
+# to write on the target machine
+BACKUP_ARCHIVE_FILE = "backup.rbpak"
+BACKUP_ARCHIVE_METHOD = "zlib"
+
+# Backup retention (--prune-backups, and after each install): keep the
+# newest N and anything younger than the age limit, within the byte budget
+BACKUP_KEEP_LAST = 3
+BACKUP_KEEP_DAYS = 30
+BACKUP_MAX_BYTES = 512 * 1024 * 1024
+
+# Fingerprint database of the whole game directory (--scan)
+FINGERPRINT_FILE = ".fingerprints.json"
+FINGERPRINT_VERSION = 1
+
+# Patch watcher (--watch): quiet seconds before checking after a change,
+# longest wait while changes keep coming, and the stat polling fallback's period
+WATCH_DEBOUNCE = 2.0
+WATCH_MAX_DELAY = 60.0
+WATCH_POLL_INTERVAL = 5.0
+
+# Staging area and journal for atomic install transactions
+INSTALL_STAGING_DIR = ".install_staging"
+INSTALL_JOURNAL_FILE = ".install_journal.json"
+
+# Restored files are written here first, then swapped over the game files
+RESTORE_STAGING_DIR = ".restore_staging"
+
+# Archive holding every patch file, next to the installer
+PAYLOAD_ARCHIVE = "payload.rbpak"
+
+# Digests of the installed patch files, written after each install
+INSTALL_MANIFEST_FILE = ".install_manifest.json"
+
+# Checkpoint journal of resumable copies, per operation (backup/install/restore)
+CHECKPOINT_FILE = ".checkpoint_{operation}.json"
+
+# Game directories installed to concurrently in fleet (--targets) mode
+FLEET_WORKERS = 4
+
+# Minimum seconds between byte-progress events sent to subscribers
+PROGRESS_EVENT_INTERVAL = 0.1
+
 # Minimum disk space required (in bytes)
 MIN_DISK_SPACE = 50 * 1024 * 1024  # 50MB
 
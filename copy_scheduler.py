@@ -0,0 +1,200 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Parallel multi-file copy scheduler
+
+Runs a bounded pool of file transfers, largest files first, and reports
+aggregate byte-level progress as data moves. The worker count adapts to
+whether source and destination share a device. With verification on,
+every copy is hashed as it streams (no second read) and checked against
+the expected digest, optionally re-reading the written file from disk;
+with it off, copies use the fastest kernel mechanism available. Install,
+backup and restore all schedule their copies through it.
+"""
+
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from checkpoint import CheckpointJournal
+from config import COPY_WORKERS_SAME_DEVICE, COPY_WORKERS_CROSS_DEVICE, COPY_RESUMABLE_MIN_SIZE, HASH_BUFFER_SIZE
+from file_copy import copy_file, copy_file_resumable
+from hashing import hash_file_uncached
+
+# Called with (bytes done, bytes total) across all jobs
+SchedulerProgress = Callable[[int, int], None]
+
+
+class OperationCancelled(Exception):
+    """Raised inside a transfer when its cancel event is set"""
+
+
+@dataclass
+class CopyJob:
+    """One file transfer"""
+    source: Path
+    dest: Path
+    name: str = ""
+    size: int = 0
+    expected_sha256: Optional[str] = None
+    # Writes the data to dest instead of copying source: reader(dest, progress, hasher)
+    reader: Optional[Callable] = None
+    strategy: Optional[str] = None
+    sha256: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.strategy is not None and self.error is None
+
+
+def _device_of(path: Path) -> Optional[int]:
+    """Get the device id of a path, or of its nearest existing parent"""
+    for candidate in [path] + list(path.parents):
+        try:
+            return os.stat(candidate).st_dev
+        except OSError:
+            continue
+    return None
+
+
+def choose_worker_count(jobs: List[CopyJob]) -> int:
+    """Use fewer workers when every transfer stays on one device"""
+    if not jobs:
+        return 1
+    devices = set()
+    for job in jobs:
+        devices.add((_device_of(job.source), _device_of(job.dest.parent)))
+    same_device = all(source == dest for source, dest in devices)
+    workers = COPY_WORKERS_SAME_DEVICE if same_device else COPY_WORKERS_CROSS_DEVICE
+    return max(1, min(workers, len(jobs)))
+
+
+class CopyScheduler:
+    """Bounded thread pool of file copies with aggregate progress"""
+
+    def __init__(self, workers: Optional[int] = None, progress: Optional[SchedulerProgress] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 checkpoint: Optional[CheckpointJournal] = None,
+                 verify: bool = False, read_back: bool = False):
+        self.workers = workers
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.checkpoint = checkpoint
+        # verify: tee-hash every copy into job.sha256 and check expected_sha256
+        # read_back: also re-read the written file, bypassing the page cache
+        self.verify = verify or read_back
+        self.read_back = read_back
+        self._lock = threading.Lock()
+        self._done = 0
+        self._total = 0
+
+    def _report(self, count: int):
+        with self._lock:
+            self._done += count
+            done, total = self._done, self._total
+        if self.progress:
+            self.progress(done, total)
+
+    def _run_job(self, job: CopyJob) -> CopyJob:
+        copied = [0]
+
+        def on_progress(count: int):
+            copied[0] += count
+            self._report(count)
+            # Checked once per progress chunk, so a cancel lands within one chunk
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise OperationCancelled("Copy cancelled")
+
+        try:
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise OperationCancelled("Copy cancelled")
+            hasher = hashlib.sha256() if self.verify else None
+            if job.reader is not None:
+                job.strategy = job.reader(job.dest, on_progress, hasher)
+            else:
+                job.strategy = self._copy(job, copied, on_progress, hasher)
+            if hasher is not None:
+                self._verify(job, hasher.hexdigest())
+            if self.checkpoint is not None and job.reader is None:
+                self.checkpoint.complete(job.source, job.dest)
+        except Exception as e:
+            job.strategy = None
+            job.error = str(e)
+            # Keep the totals honest for the bytes that never arrived
+            self._report(job.size - copied[0])
+        return job
+
+    def _verify(self, job: CopyJob, sha256: str):
+        """Check a copy's streamed digest, and optionally its on-disk bytes"""
+        job.sha256 = sha256
+        error = None
+        if job.expected_sha256 and sha256 != job.expected_sha256:
+            error = f"Checksum mismatch copying {job.name}"
+        elif self.read_back and hash_file_uncached(job.dest) != sha256:
+            error = f"Read-back verification failed for {job.name}"
+        if error:
+            if self.checkpoint is not None:
+                # Never resume from bytes that failed verification
+                self.checkpoint.discard(job.dest)
+            raise OSError(error)
+
+    def _copy(self, job: CopyJob, copied: List[int], on_progress: Callable[[int], None],
+              hasher=None) -> str:
+        """
+        Copy a job, resuming from the checkpoint journal where an earlier run
+        stopped. Only large files are copied in checkpointed chunks.
+        """
+        offset = self.checkpoint.resume_offset(job.source, job.dest) if self.checkpoint is not None else 0
+        if offset:
+            copied[0] += offset
+            self._report(offset)
+        if offset and offset >= job.size:
+            if hasher is not None:
+                # Copied by an earlier run - its digest needs one read of the result
+                with open(job.dest, 'rb') as f:
+                    for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b''):
+                        hasher.update(chunk)
+            return "checkpoint"
+        if not offset and (self.checkpoint is None or job.size < COPY_RESUMABLE_MIN_SIZE):
+            return copy_file(job.source, job.dest, progress=on_progress, hasher=hasher)
+
+        return copy_file_resumable(
+            job.source, job.dest, offset, on_progress,
+            checkpoint=lambda position: self.checkpoint.record(job.source, job.dest, position),
+            hasher=hasher
+        )
+
+    def run(self, jobs: List[CopyJob]) -> List[CopyJob]:
+        """
+        Copy all jobs, largest first. Failures are recorded on the job
+        (job.error) rather than raised; returns the jobs in input order.
+        """
+        for job in jobs:
+            job.source = Path(job.source)
+            job.dest = Path(job.dest)
+            job.name = job.name or job.dest.name
+            if not job.size:
+                try:
+                    job.size = job.source.stat().st_size
+                except OSError:
+                    job.size = 0
+
+        self._done = 0
+        self._total = sum(job.size for job in jobs)
+        if not jobs:
+            return jobs
+
+        workers = self.workers or choose_worker_count(jobs)
+        ordered = sorted(jobs, key=lambda job: job.size, reverse=True)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self._run_job, ordered))
+        return jobs
+
+
+def copy_files(pairs: Dict[Path, Path], progress: Optional[SchedulerProgress] = None) -> List[CopyJob]:
+    """Copy {source: dest} pairs in parallel"""
+    return CopyScheduler(progress=progress).run([CopyJob(source, dest) for source, dest in pairs.items()])
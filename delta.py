@@ -0,0 +1,231 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Binary delta payloads
+
+A delta rebuilds a patched file from a known original build in a single
+streaming pass: the op stream copies ranges from the original and inserts
+new bytes, and the result is verified against the target SHA-256.
+
+Delta file layout (all integers little-endian):
+    magic        8 bytes  b"RBDELTA1"
+    source size  uint64
+    source hash  32 bytes (SHA-256)
+    target size  uint64
+    target hash  32 bytes (SHA-256)
+    zlib-compressed op stream:
+        0x01 COPY    uint64 source offset, uint32 length
+        0x02 INSERT  uint32 length, data
+        0x00 END
+
+Deltas are stored as deltas/<filename>.<source sha256[:16]>.rbdelta.
+Usage: python delta.py <original> <patched> <output.rbdelta>
+"""
+
+import os
+import sys
+import zlib
+import struct
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from config import DELTA_DIR, DELTA_BLOCK_SIZE
+from hashing import hash_file
+
+MAGIC = b"RBDELTA1"
+HEADER = struct.Struct("<8sQ32sQ32s")
+OP_END = 0
+OP_COPY = 1
+OP_INSERT = 2
+COPY_ARGS = struct.Struct("<QI")
+LENGTH = struct.Struct("<I")
+
+# Largest single COPY/INSERT, and the streaming chunk size when applying
+MAX_OP_LENGTH = 0xFFFFFFFF
+APPLY_CHUNK_SIZE = 1024 * 1024
+
+
+class DeltaError(Exception):
+    """Raised when a delta cannot be applied"""
+
+
+def delta_filename(filename: str, source_sha256: str) -> str:
+    """Get the file name a delta for the given original is stored under"""
+    return f"{filename}.{source_sha256[:16]}.rbdelta"
+
+
+def find_delta(filename: str, source_sha256: str, installer_dir: Optional[Path] = None) -> Optional[Path]:
+    """Find the bundled delta that upgrades the given original build"""
+    installer_dir = installer_dir or Path(__file__).parent
+    delta_path = installer_dir / DELTA_DIR / delta_filename(filename, source_sha256)
+    return delta_path if delta_path.exists() else None
+
+
+# ---------------------------------------------------------------------------
+# Creating deltas (release build time)
+# ---------------------------------------------------------------------------
+
+def create_delta(source: bytes, target: bytes, block_size: int = DELTA_BLOCK_SIZE) -> bytes:
+    """Build a delta that turns source into target"""
+    index = {}
+    for offset in range(0, len(source) - block_size + 1, block_size):
+        index.setdefault(source[offset:offset + block_size], offset)
+
+    ops = bytearray()
+    literal_start = 0
+    position = 0
+    target_length = len(target)
+
+    def flush_literal(end):
+        for start in range(literal_start, end, MAX_OP_LENGTH):
+            chunk = target[start:min(end, start + MAX_OP_LENGTH)]
+            ops.append(OP_INSERT)
+            ops.extend(LENGTH.pack(len(chunk)))
+            ops.extend(chunk)
+
+    while position + block_size <= target_length:
+        source_offset = index.get(target[position:position + block_size])
+        if source_offset is None:
+            position += 1
+            continue
+
+        # Extend the match forward as far as the bytes agree
+        length = block_size
+        while (position + length < target_length and source_offset + length < len(source)
+               and length < MAX_OP_LENGTH
+               and target[position + length] == source[source_offset + length]):
+            length += 1
+
+        flush_literal(position)
+        ops.append(OP_COPY)
+        ops.extend(COPY_ARGS.pack(source_offset, length))
+        position += length
+        literal_start = position
+
+    flush_literal(target_length)
+    ops.append(OP_END)
+
+    header = HEADER.pack(
+        MAGIC,
+        len(source), hashlib.sha256(source).digest(),
+        len(target), hashlib.sha256(target).digest(),
+    )
+    return header + zlib.compress(bytes(ops), 9)
+
+
+# ---------------------------------------------------------------------------
+# Applying deltas (install time)
+# ---------------------------------------------------------------------------
+
+class _InflatingReader:
+    """Read exact byte counts from a zlib stream in a file"""
+
+    def __init__(self, f):
+        self._file = f
+        self._inflater = zlib.decompressobj()
+        self._buffer = bytearray()
+
+    def read(self, count: int) -> bytes:
+        while len(self._buffer) < count:
+            compressed = self._file.read(64 * 1024)
+            if not compressed:
+                self._buffer.extend(self._inflater.flush())
+                if len(self._buffer) < count:
+                    raise DeltaError("Truncated delta op stream")
+                break
+            self._buffer.extend(self._inflater.decompress(compressed))
+        data = bytes(self._buffer[:count])
+        del self._buffer[:count]
+        return data
+
+
+def read_delta_header(delta_path) -> dict:
+    """Read the source/target sizes and digests from a delta"""
+    with open(delta_path, 'rb') as f:
+        raw = f.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise DeltaError("Truncated delta header")
+    magic, source_size, source_hash, target_size, target_hash = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise DeltaError("Not a delta file")
+    return {
+        "source_size": source_size,
+        "source_sha256": source_hash.hex(),
+        "target_size": target_size,
+        "target_sha256": target_hash.hex(),
+    }
+
+
+def apply_delta(source_path, delta_path, output_path, source_sha256: Optional[str] = None) -> str:
+    """
+    Rebuild the target from source_path into output_path in one streaming
+    pass. Returns the target SHA-256; raises DeltaError if the source does
+    not match or the result fails verification (output is then removed).
+    Pass source_sha256 if the caller has already hashed the source.
+    """
+    header = read_delta_header(delta_path)
+    if os.path.getsize(source_path) != header["source_size"]:
+        raise DeltaError("Original file does not match this delta")
+    if (source_sha256 or hash_file(source_path)["sha256"]) != header["source_sha256"]:
+        raise DeltaError("Original file does not match this delta")
+
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(delta_path, 'rb') as delta_file, \
+                open(source_path, 'rb') as source, \
+                open(output_path, 'wb') as output:
+            delta_file.seek(HEADER.size)
+            ops = _InflatingReader(delta_file)
+
+            while True:
+                opcode = ops.read(1)[0]
+                if opcode == OP_END:
+                    break
+                if opcode == OP_COPY:
+                    offset, length = COPY_ARGS.unpack(ops.read(COPY_ARGS.size))
+                    if offset + length > header["source_size"]:
+                        raise DeltaError("COPY outside the original file")
+                    source.seek(offset)
+                    while length:
+                        chunk = source.read(min(length, APPLY_CHUNK_SIZE))
+                        if not chunk:
+                            raise DeltaError("Original file ended early")
+                        output.write(chunk)
+                        digest.update(chunk)
+                        written += len(chunk)
+                        length -= len(chunk)
+                elif opcode == OP_INSERT:
+                    length, = LENGTH.unpack(ops.read(LENGTH.size))
+                    while length:
+                        chunk = ops.read(min(length, APPLY_CHUNK_SIZE))
+                        output.write(chunk)
+                        digest.update(chunk)
+                        written += len(chunk)
+                        length -= len(chunk)
+                else:
+                    raise DeltaError(f"Unknown delta opcode {opcode}")
+
+        if written != header["target_size"] or digest.hexdigest() != header["target_sha256"]:
+            raise DeltaError("Rebuilt file failed verification")
+    except Exception:
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        raise
+
+    return header["target_sha256"]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        print("Usage: python delta.py <original> <patched> <output.rbdelta>")
+        sys.exit(1)
+
+    original = Path(sys.argv[1]).read_bytes()
+    patched = Path(sys.argv[2]).read_bytes()
+    delta = create_delta(original, patched)
+    Path(sys.argv[3]).write_bytes(delta)
+    print(f"Wrote {sys.argv[3]}: {len(delta)} bytes ({len(delta) * 100 / max(1, len(patched)):.1f}% of target)")
+    print(f"Install name: {delta_filename(Path(sys.argv[2]).name, hashlib.sha256(original).hexdigest())}")
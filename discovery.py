@@ -0,0 +1,222 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Whole-disk game discovery engine
+
+Walks every mounted volume concurrently with os.scandir-based workers and
+streams candidate installations (directories containing REBEXE.exe) as soon
+as they are found.
+"""
+
+import os
+import sys
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from config import (
+    GAME_EXECUTABLE, DISCOVERY_MAX_DEPTH, DISCOVERY_WORKERS, DISCOVERY_SKIP_DIRS,
+    DISCOVERY_SKIP_PREFIXES, DISCOVERY_HIDDEN_ALLOW, DISCOVERY_ROOT_DIRS, DISCOVERY_PSEUDO_FILESYSTEMS
+)
+
+# Windows file attribute flags used to prune hidden and system trees
+FILE_ATTRIBUTE_HIDDEN = 0x2
+FILE_ATTRIBUTE_SYSTEM = 0x4
+
+
+@dataclass(frozen=True)
+class GameCandidate:
+    """A directory that contains the game executable"""
+    path: str
+    score: int
+    depth: int
+
+
+def get_mounted_volumes() -> List[str]:
+    """Return the root of every mounted volume worth scanning"""
+    if sys.platform == 'win32':
+        roots = []
+        try:
+            import ctypes
+            bitmask = ctypes.windll.kernel32.GetLogicalDrives()
+            for index in range(26):
+                if bitmask & (1 << index):
+                    roots.append(f"{chr(ord('A') + index)}:\\")
+        except Exception:
+            roots = [f"{letter}:\\" for letter in "CDEFGH" if os.path.exists(f"{letter}:\\")]
+        return roots
+
+    roots = []
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace('\\040', ' ')
+                if fields[2] in DISCOVERY_PSEUDO_FILESYSTEMS:
+                    continue
+                if mount_point not in roots:
+                    roots.append(mount_point)
+    except OSError:
+        pass
+
+    if not roots:
+        roots = ['/']
+    return roots
+
+
+def rank_candidate(path: str, depth: int) -> int:
+    """Score a candidate directory; higher scores are more likely to be the real install"""
+    lowered = path.lower().replace('\\', '/')
+    score = 0
+    if 'rebellion' in Path(lowered).name:
+        score += 50
+    elif 'rebellion' in lowered:
+        score += 20
+    if 'star wars' in lowered or 'starwars' in lowered:
+        score += 10
+    if 'gog' in lowered or 'steamapps/common' in lowered:
+        score += 15
+    if 'recycle' in lowered:
+        score -= 40
+    return score - depth
+
+
+def _should_prune(entry: os.DirEntry) -> bool:
+    """Check whether a directory entry should not be descended into"""
+    name = entry.name
+    if name.lower() in DISCOVERY_HIDDEN_ALLOW:
+        return False
+    if name.startswith('.') or name.startswith('$'):
+        return True
+    if name.lower() in DISCOVERY_SKIP_DIRS or name.lower().startswith(DISCOVERY_SKIP_PREFIXES):
+        return True
+    if sys.platform == 'win32':
+        try:
+            attributes = entry.stat(follow_symlinks=False).st_file_attributes
+        except (OSError, AttributeError):
+            return False
+        if attributes & (FILE_ATTRIBUTE_HIDDEN | FILE_ATTRIBUTE_SYSTEM):
+            return True
+    return False
+
+
+class GameDiscovery:
+    """Concurrent scandir walker that streams game candidates"""
+
+    def __init__(self, roots: Optional[List[str]] = None,
+                 max_depth: int = DISCOVERY_MAX_DEPTH,
+                 workers: int = DISCOVERY_WORKERS):
+        self.roots = roots if roots is not None else get_mounted_volumes()
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Ask all workers to finish as soon as possible"""
+        self._stop.set()
+
+    def iter_candidates(self) -> Iterator[GameCandidate]:
+        """
+        Scan all roots and yield candidates as soon as they are found.
+        Closing the iterator early stops the scan; a discovery that was
+        stopped, even before the scan started, yields nothing.
+        """
+        pending = queue.Queue()
+        results = queue.Queue()
+        outstanding = [0]
+        lock = threading.Lock()
+        done = object()
+
+        # Nested mount points are scanned from their own root, never twice
+        root_set = {os.path.normcase(os.path.abspath(root)) for root in self.roots}
+
+        for root in self.roots:
+            if os.path.isdir(root):
+                outstanding[0] += 1
+                pending.put((root, 0))
+
+        if not outstanding[0]:
+            return
+
+        def finish_one():
+            with lock:
+                outstanding[0] -= 1
+                finished = outstanding[0] == 0
+            if finished:
+                for _ in range(self.workers):
+                    pending.put(None)
+                results.put(done)
+
+        def worker():
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                directory, depth = item
+                try:
+                    if not self._stop.is_set():
+                        self._scan_directory(directory, depth, root_set, pending, results, lock, outstanding)
+                finally:
+                    finish_one()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                candidate = results.get()
+                if candidate is done:
+                    break
+                yield candidate
+        finally:
+            self._stop.set()
+
+    def _scan_directory(self, directory, depth, root_set, pending, results, lock, outstanding):
+        """List one directory, report a candidate and queue its subdirectories"""
+        subdirs = []
+        found = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() in DISCOVERY_ROOT_DIRS:
+                                subdirs.append((entry.path, 0))
+                            elif depth < self.max_depth and not _should_prune(entry):
+                                subdirs.append((entry.path, depth + 1))
+                        elif entry.name.lower() == GAME_EXECUTABLE.lower():
+                            found = True
+                    except OSError:
+                        continue
+        except OSError:
+            return
+
+        if found:
+            results.put(GameCandidate(directory, rank_candidate(directory, depth), depth))
+
+        for subdir, subdir_depth in subdirs:
+            if os.path.normcase(subdir) in root_set:
+                continue
+            with lock:
+                outstanding[0] += 1
+            pending.put((subdir, subdir_depth))
+
+    def find_all(self) -> Iterator[GameCandidate]:
+        """Yield every candidate as it is found; rank them with best_first()"""
+        return self.iter_candidates()
+
+
+def best_first(candidates: Iterable[GameCandidate]) -> List[GameCandidate]:
+    """Order candidates from most to least likely to be the real install"""
+    return sorted(candidates, key=lambda c: (-c.score, c.depth, c.path))
+
+
+def discover_game_installations(roots: Optional[List[str]] = None,
+                                max_depth: int = DISCOVERY_MAX_DEPTH,
+                                workers: int = DISCOVERY_WORKERS) -> List[str]:
+    """Scan mounted volumes and return candidate install paths, best match first"""
+    return [c.path for c in best_first(GameDiscovery(roots, max_depth, workers).find_all())]
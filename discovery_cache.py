@@ -0,0 +1,136 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Persistent cache of known game installations
+
+Each entry is keyed by install path and carries the directory mtime and the
+REBEXE.exe size/mtime as validators, so repeat launches can confirm a known
+install with a couple of stat calls instead of searching again.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import GAME_EXECUTABLE, DISCOVERY_CACHE_FILE, DISCOVERY_CACHE_VERSION
+
+
+def get_cache_path() -> Path:
+    """Get the per-user location of the discovery cache file"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / ".cache")
+    return Path(base) / "RebellionFix" / DISCOVERY_CACHE_FILE
+
+
+def _read_validators(path: str) -> Optional[Dict[str, int]]:
+    """Stat the install directory and its executable, None if either is missing"""
+    try:
+        dir_stat = os.stat(path)
+        exe_stat = os.stat(os.path.join(path, GAME_EXECUTABLE))
+    except OSError:
+        return None
+    return {
+        "dir_mtime_ns": dir_stat.st_mtime_ns,
+        "exe_size": exe_stat.st_size,
+        "exe_mtime_ns": exe_stat.st_mtime_ns,
+    }
+
+
+class DiscoveryCache:
+    """On-disk cache of known game installations"""
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = Path(cache_path) if cache_path else get_cache_path()
+        self.logger = logging.getLogger('rebellion_installer')
+        self.entries: Dict[str, dict] = {}
+        # Installers running concurrently (fleet mode) may share one cache
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """Load cache entries, ignoring a missing or unreadable file"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+            return
+
+        if not isinstance(data, dict) or data.get("version") != DISCOVERY_CACHE_VERSION:
+            self.entries = {}
+            return
+        self.entries = data.get("installs", {})
+
+    def save(self) -> bool:
+        """Write the cache atomically"""
+        with self._lock:
+            return self._save()
+
+    def _save(self) -> bool:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": DISCOVERY_CACHE_VERSION, "installs": self.entries}, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not save discovery cache: {e}")
+            return False
+
+    def remember(self, path: str, is_steam_version: bool = False) -> bool:
+        """Record a validated installation, by absolute path"""
+        path = str(Path(path).resolve())
+        validators = _read_validators(path)
+        if validators is None:
+            return False
+
+        entry = dict(validators, is_steam_version=is_steam_version, last_seen=time.time())
+        with self._lock:
+            self.entries[path] = entry
+            return self._save()
+
+    def forget(self, path: str):
+        """Drop an installation from the cache"""
+        with self._lock:
+            if self.entries.pop(str(Path(path).resolve()), None) is not None:
+                self._save()
+
+    def lookup(self) -> Optional[dict]:
+        """
+        Return the most recently seen install that is still valid, as
+        {"path": ..., "is_steam_version": ...}. Stale entries are revalidated
+        with a stat of REBEXE.exe; vanished installs are dropped.
+        """
+        with self._lock:
+            changed = False
+            result = None
+
+            for path, entry in sorted(self.entries.items(), key=lambda item: item[1].get("last_seen", 0),
+                                      reverse=True):
+                validators = _read_validators(path) if os.path.isabs(path) else None
+                if validators is None:
+                    # Gone, or a relative path saved by an older version
+                    self.logger.info(f"Cached installation no longer present: {path}")
+                    del self.entries[path]
+                    changed = True
+                    continue
+
+                if any(entry.get(k) != v for k, v in validators.items()):
+                    # Stale entry: the executable is still there, so refresh validators
+                    self.logger.info(f"Revalidated cached installation: {path}")
+                    entry.update(validators)
+                    changed = True
+
+                result = {"path": path, "is_steam_version": bool(entry.get("is_steam_version"))}
+                break
+
+            if changed:
+                self._save()
+            return result
@@ -0,0 +1,185 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Progress event bus
+
+The installer core publishes typed events (steps, bytes transferred with
+throughput and ETA, per-file results) to any number of subscribers: the
+GUI, a CLI progress renderer or a JSON-lines emitter. Byte progress is
+rate-limited so high-frequency updates never slow down the copy loop.
+"""
+
+import sys
+import json
+import time
+import threading
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional, TextIO
+
+from config import PROGRESS_EVENT_INTERVAL
+
+
+@dataclass
+class StepStarted:
+    """An installation step has begun"""
+    step: str
+    message: str
+    index: int
+    total: int
+
+
+@dataclass
+class StepFinished:
+    """An installation step has ended"""
+    step: str
+    ok: bool
+    seconds: float
+
+
+@dataclass
+class BytesTransferred:
+    """Aggregate copy progress for the current step"""
+    step: str
+    done: int
+    total: int
+    mb_per_second: float
+    eta_seconds: Optional[float]
+
+
+@dataclass
+class FileResult:
+    """Outcome for a single file (installed, skipped, backed_up, restored, failed)"""
+    step: str
+    name: str
+    action: str
+    detail: str = ""
+
+
+Subscriber = Callable[[object], None]
+
+
+class EventBus:
+    """Fan-out of installer events to subscribers"""
+
+    def __init__(self, interval: float = PROGRESS_EVENT_INTERVAL):
+        self.interval = interval
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._step = ""
+        self._step_started = 0.0
+        self._last_emit = 0.0
+        self._rate_start = 0.0
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def publish(self, event):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(event)
+            except Exception:
+                # A broken subscriber must never break the installation
+                pass
+
+    def step_started(self, step: str, message: str, index: int, total: int):
+        self._step = step
+        self._step_started = time.monotonic()
+        self.publish(StepStarted(step, message, index, total))
+
+    def step_finished(self, step: str, ok: bool):
+        self.publish(StepFinished(step, ok, time.monotonic() - self._step_started))
+
+    def file_result(self, name: str, action: str, detail: str = ""):
+        self.publish(FileResult(self._step, name, action, detail))
+
+    def bytes_progress(self, done: int, total: int):
+        """
+        Report copy progress for the current batch of transfers. Emits at
+        most once per interval (the first after one interval, so rates are
+        meaningful), always including the final update.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._rate_start:
+                self._rate_start = now
+                self._last_emit = now
+            finished = done >= total
+            if not finished and now - self._last_emit < self.interval:
+                return
+            self._last_emit = now
+            elapsed = now - self._rate_start
+            if finished:
+                # The next batch measures its own rate
+                self._rate_start = 0.0
+
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        self.publish(BytesTransferred(self._step, done, total, rate / (1024 * 1024), eta))
+
+
+def event_to_dict(event) -> dict:
+    """Convert an event to a JSON-ready dict with its type name"""
+    data = asdict(event)
+    data["type"] = type(event).__name__
+    return data
+
+
+class JsonLinesEmitter:
+    """
+    Subscriber writing one JSON object per event. With target set, each
+    object also names the game directory (for fleet runs sharing a stream).
+    """
+
+    # Emitters for concurrent installers may share one stream
+    _write_lock = threading.Lock()
+
+    def __init__(self, stream: TextIO = sys.stdout, target: Optional[str] = None):
+        self.stream = stream
+        self.target = target
+
+    def __call__(self, event):
+        data = event_to_dict(event)
+        if self.target is not None:
+            data["target"] = self.target
+        with self._write_lock:
+            self.stream.write(json.dumps(data) + "\n")
+            self.stream.flush()
+
+
+class CliProgressRenderer:
+    """Subscriber printing steps and a one-line transfer meter"""
+
+    def __init__(self, stream: TextIO = sys.stdout):
+        self.stream = stream
+        self._meter_shown = False
+
+    def _end_meter(self):
+        if self._meter_shown:
+            self.stream.write("\n")
+            self._meter_shown = False
+
+    def __call__(self, event):
+        if isinstance(event, StepStarted):
+            self._end_meter()
+            self.stream.write(f"{event.message}\n")
+        elif isinstance(event, BytesTransferred):
+            percent = event.done * 100 / event.total if event.total else 100
+            eta = f", ETA {event.eta_seconds:.0f}s" if event.eta_seconds else ""
+            self.stream.write(
+                f"\r  {event.done / (1024 * 1024):.1f}/{event.total / (1024 * 1024):.1f} MB "
+                f"({percent:.0f}%) at {event.mb_per_second:.1f} MB/s{eta}   "
+            )
+            self._meter_shown = True
+        elif isinstance(event, FileResult):
+            self._end_meter()
+            detail = f" ({event.detail})" if event.detail else ""
+            self.stream.write(f"  {event.action}: {event.name}{detail}\n")
+        elif isinstance(event, StepFinished):
+            self._end_meter()
+            if not event.ok:
+                self.stream.write(f"  step failed: {event.step}\n")
+        self.stream.flush()
@@ -0,0 +1,304 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Kernel-accelerated file copy backend
+
+copy_file is a drop-in replacement for shutil.copy2 that tries the cheapest
+mechanism the platform offers: a reflink/FICLONE clone (free on CoW
+filesystems), then os.copy_file_range, then os.sendfile, then CopyFileW on
+Windows, and finally a large-buffer userspace copy. Metadata is preserved
+the way copy2 does. When a hasher is passed, data goes through the
+userspace copy and is hashed as it streams (tee), so the copy's digest
+costs no second read. Run this module to benchmark each strategy locally.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import COPY_BUFFER_SIZE, COPY_PROGRESS_CHUNK, COPY_CHECKPOINT_CHUNK
+
+# Called with the number of bytes copied since the previous call
+ProgressCallback = Callable[[int], None]
+
+# hashlib object fed with the copied data
+Hasher = Any
+
+# Linux ioctl to clone a whole file: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+STRATEGY_REFLINK = "reflink"
+STRATEGY_COPY_FILE_RANGE = "copy_file_range"
+STRATEGY_SENDFILE = "sendfile"
+STRATEGY_WIN32 = "copyfilew"
+STRATEGY_BUFFERED = "buffered"
+STRATEGY_RESUMABLE = "resumable"
+
+
+class StrategyUnavailable(Exception):
+    """Raised when a copy strategy cannot be used for a pair of files"""
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int, progress: Optional[ProgressCallback] = None):
+    if not sys.platform.startswith('linux'):
+        raise StrategyUnavailable("reflink not supported on this platform")
+    import fcntl
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError as e:
+        raise StrategyUnavailable(str(e))
+    if progress:
+        progress(size)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int, progress: Optional[ProgressCallback] = None):
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        raise StrategyUnavailable("copy_file_range not available")
+    chunk = COPY_PROGRESS_CHUNK if progress else 1 << 30
+    offset = 0
+    while offset < size:
+        try:
+            copied = copy_range(src_fd, dst_fd, min(size - offset, chunk), offset, offset)
+        except OSError as e:
+            if offset == 0:
+                raise StrategyUnavailable(str(e))
+            raise
+        if copied == 0:
+            break
+        offset += copied
+        if progress:
+            progress(copied)
+    if offset != size:
+        raise OSError(f"copy_file_range copied {offset} of {size} bytes")
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int, progress: Optional[ProgressCallback] = None):
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is None or sys.platform == 'win32':
+        raise StrategyUnavailable("sendfile not available")
+    chunk = COPY_PROGRESS_CHUNK if progress else 1 << 30
+    offset = 0
+    while offset < size:
+        try:
+            sent = sendfile(dst_fd, src_fd, offset, min(size - offset, chunk))
+        except OSError as e:
+            if offset == 0:
+                raise StrategyUnavailable(str(e))
+            raise
+        if sent == 0:
+            break
+        offset += sent
+        if progress:
+            progress(sent)
+    if offset != size:
+        raise OSError(f"sendfile copied {offset} of {size} bytes")
+
+
+def _buffered(src_fd: int, dst_fd: int, size: int, progress: Optional[ProgressCallback] = None,
+              hasher: Optional[Hasher] = None):
+    buffer = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(src_fd, 'rb', buffering=0, closefd=False) as src, \
+            open(dst_fd, 'wb', buffering=0, closefd=False) as dst:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            if hasher is not None:
+                hasher.update(view[:count])
+            written = 0
+            while written < count:
+                written += dst.write(view[written:count])
+            if progress:
+                progress(count)
+
+
+FD_STRATEGIES: Dict[str, Callable[..., None]] = {
+    STRATEGY_REFLINK: _reflink,
+    STRATEGY_COPY_FILE_RANGE: _copy_file_range,
+    STRATEGY_SENDFILE: _sendfile,
+    STRATEGY_BUFFERED: _buffered,
+}
+
+DEFAULT_ORDER = [
+    STRATEGY_REFLINK,
+    STRATEGY_COPY_FILE_RANGE,
+    STRATEGY_SENDFILE,
+    STRATEGY_WIN32,
+    STRATEGY_BUFFERED,
+]
+
+
+def _copy_win32(src: str, dst: str, progress: Optional[ProgressCallback] = None):
+    """CopyFileW lets Windows pick block cloning (ReFS) or its own fast path"""
+    if sys.platform != 'win32':
+        raise StrategyUnavailable("CopyFileW is Windows only")
+    import ctypes
+    if not ctypes.windll.kernel32.CopyFileW(str(src), str(dst), False):
+        raise StrategyUnavailable(f"CopyFileW failed: {ctypes.GetLastError()}")
+    if progress:
+        progress(os.path.getsize(dst))
+
+
+def copy_data(src, dst, strategies: Optional[List[str]] = None,
+              progress: Optional[ProgressCallback] = None,
+              hasher: Optional[Hasher] = None) -> str:
+    """
+    Copy file contents using the first strategy that works; returns its name.
+    With a hasher, the data is hashed as it is copied (buffered strategy only).
+    """
+    if hasher is not None:
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            size = os.fstat(src_file.fileno()).st_size
+            _buffered(src_file.fileno(), dst_file.fileno(), size, progress, hasher)
+        return STRATEGY_BUFFERED
+
+    strategies = strategies or DEFAULT_ORDER
+    last_error: Optional[Exception] = None
+
+    for name in strategies:
+        if name == STRATEGY_WIN32:
+            try:
+                _copy_win32(src, dst, progress)
+                return name
+            except StrategyUnavailable as e:
+                last_error = e
+                continue
+
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            size = os.fstat(src_file.fileno()).st_size
+            try:
+                FD_STRATEGIES[name](src_file.fileno(), dst_file.fileno(), size, progress)
+                return name
+            except StrategyUnavailable as e:
+                last_error = e
+                dst_file.truncate(0)
+                dst_file.seek(0)
+
+    raise OSError(f"No copy strategy succeeded: {last_error}")
+
+
+def copy_file(src, dst, strategies: Optional[List[str]] = None,
+              progress: Optional[ProgressCallback] = None,
+              hasher: Optional[Hasher] = None) -> str:
+    """
+    Copy a file with data and metadata, like shutil.copy2.
+    progress, if given, is called with byte counts as data is copied.
+    hasher, if given, is updated with the copied data.
+    Returns the name of the strategy that copied the data.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    strategy = copy_data(src, dst, strategies, progress, hasher)
+    shutil.copystat(src, dst)
+    return strategy
+
+
+def _copy_chunk(src, dst, offset: int, count: int, hasher: Optional[Hasher] = None) -> int:
+    """Copy count bytes at offset between two open files; returns bytes copied"""
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None and hasher is None:
+        try:
+            return copy_range(src.fileno(), dst.fileno(), count, offset, offset)
+        except OSError:
+            pass
+    src.seek(offset)
+    data = src.read(count)
+    if hasher is not None:
+        hasher.update(data)
+    dst.seek(offset)
+    dst.write(data)
+    dst.flush()
+    return len(data)
+
+
+def copy_file_resumable(src, dst, offset: int = 0, progress: Optional[ProgressCallback] = None,
+                        checkpoint: Optional[Callable[[int], None]] = None,
+                        hasher: Optional[Hasher] = None) -> str:
+    """
+    Copy a file like copy_file, continuing after the first offset bytes
+    already present in dst. After every chunk (COPY_CHECKPOINT_CHUNK bytes
+    when checkpointing) dst is fsynced and checkpoint is called with the
+    durable offset, so an interrupted copy can resume.
+    A hasher is fed the whole file: the kept prefix is read back from dst.
+    """
+    if offset <= 0 and hasher is None:
+        # A clone is instant and all-or-nothing - nothing to resume
+        try:
+            strategy = copy_data(src, dst, [STRATEGY_REFLINK], progress)
+            shutil.copystat(src, dst)
+            return strategy
+        except OSError:
+            pass
+
+    size = os.path.getsize(src)
+    mode = 'r+b' if offset > 0 and os.path.exists(dst) else 'wb'
+    if mode == 'wb':
+        offset = 0
+    chunk_size = COPY_CHECKPOINT_CHUNK if checkpoint else COPY_PROGRESS_CHUNK
+    with open(src, 'rb') as src_file, open(dst, mode) as dst_file:
+        dst_file.truncate(offset)
+        if hasher is not None and offset:
+            dst_file.seek(0)
+            remaining = offset
+            while remaining:
+                data = dst_file.read(min(COPY_BUFFER_SIZE, remaining))
+                if not data:
+                    raise OSError(f"{dst} is shorter than its checkpoint")
+                hasher.update(data)
+                remaining -= len(data)
+        while offset < size:
+            count = _copy_chunk(src_file, dst_file, offset, min(chunk_size, size - offset), hasher)
+            if count == 0:
+                raise OSError(f"Copy of {src} stopped at {offset} of {size} bytes")
+            offset += count
+            if checkpoint:
+                dst_file.flush()
+                os.fsync(dst_file.fileno())
+                checkpoint(offset)
+            if progress:
+                progress(count)
+    shutil.copystat(src, dst)
+    return STRATEGY_RESUMABLE
+
+
+def benchmark(directory: Optional[str] = None, size_mb: int = 64) -> Dict[str, Optional[float]]:
+    """Time each strategy copying a size_mb file; None marks an unavailable strategy"""
+    results: Dict[str, Optional[float]] = {}
+    with tempfile.TemporaryDirectory(dir=directory) as work_dir:
+        source = Path(work_dir) / "source.bin"
+        with open(source, 'wb') as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                f.write(block)
+
+        for name in DEFAULT_ORDER:
+            dest = Path(work_dir) / f"copy_{name}.bin"
+            start = time.perf_counter()
+            try:
+                copy_data(source, dest, [name])
+                results[name] = time.perf_counter() - start
+            except OSError:
+                results[name] = None
+            if dest.exists():
+                dest.unlink()
+
+        start = time.perf_counter()
+        shutil.copy2(source, Path(work_dir) / "copy_shutil.bin")
+        results["shutil.copy2"] = time.perf_counter() - start
+    return results
+
+
+if __name__ == '__main__':
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    print(f"Copying a {size} MB file in {target_dir or tempfile.gettempdir()}")
+    for strategy_name, seconds in benchmark(target_dir, size).items():
+        if seconds is None:
+            print(f"  {strategy_name:<16} unavailable")
+        else:
+            print(f"  {strategy_name:<16} {seconds * 1000:8.1f} ms ({size / seconds if seconds else 0:.0f} MB/s)")
@@ -0,0 +1,196 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Game directory fingerprints and integrity scanning
+
+Fingerprints every file in a game directory (relative path, size,
+mtime_ns, inode, SHA-256) into a small JSON database in the directory.
+A rescan is one scandir walk: files whose stat tuple is unchanged keep
+their recorded digest and only new or changed files are hashed. The
+result can be diffed against a saved reference fingerprint or against the
+known-good patched build. Installer-owned entries (dot files, Backup_*
+folders) are not part of the fingerprint.
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import FINGERPRINT_FILE, FINGERPRINT_VERSION, PATCH_FILE_HASHES, HASH_WORKERS
+from hashing import hash_files
+
+# Reference name for the known-good patched build
+REFERENCE_PATCHED = "patched"
+
+# Index of each field in a database record
+SIZE, MTIME_NS, INODE, SHA256 = range(4)
+
+
+@dataclass
+class ScanStats:
+    """What a scan did"""
+    files: int = 0
+    hashed: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class FingerprintDiff:
+    """Differences between a game directory and a reference"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+    def format(self) -> str:
+        lines = [f"  {kind}: {path}" for kind, paths in
+                 (("modified", self.modified), ("missing", self.removed), ("added", self.added))
+                 for path in paths]
+        if self.clean:
+            lines.append("No differences from the reference")
+        else:
+            lines.append(f"{len(self.modified)} modified, {len(self.removed)} missing, "
+                         f"{len(self.added)} added")
+        return "\n".join(lines)
+
+
+def _is_installer_entry(name: str) -> bool:
+    return name.startswith(".") or name.startswith("Backup_")
+
+
+class FingerprintDB:
+    """Fingerprint database of one game directory"""
+
+    def __init__(self, game_dir):
+        self.game_dir = Path(game_dir)
+        self.path = self.game_dir / FINGERPRINT_FILE
+        self.logger = logging.getLogger('rebellion_installer')
+        self.records: Dict[str, list] = {}
+        self.scanned_ns = 0
+        self.load()
+
+    def load(self) -> bool:
+        """Load the last scan; False if there is none"""
+        data = read_fingerprint(self.path)
+        if data is None:
+            return False
+        self.records = data["files"]
+        self.scanned_ns = data.get("scanned_ns", 0)
+        return True
+
+    def save(self, path=None) -> bool:
+        """Write the database, or a copy of it to use as a reference elsewhere"""
+        path = Path(path) if path else self.path
+        try:
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": FINGERPRINT_VERSION, "scanned_ns": self.scanned_ns,
+                           "files": self.records}, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not save fingerprints to {path}: {e}")
+            return False
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        """Stat every game file in one scandir pass: {relative path: stat}"""
+        found = {}
+        pending = [("", str(self.game_dir))]
+        while pending:
+            prefix, directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not prefix and _is_installer_entry(entry.name):
+                            continue
+                        relative = prefix + entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((relative + "/", entry.path))
+                        elif entry.is_file(follow_symlinks=False):
+                            found[relative] = entry.stat(follow_symlinks=False)
+            except OSError as e:
+                self.logger.warning(f"Could not scan {directory}: {e}")
+        return found
+
+    def scan(self, workers: int = HASH_WORKERS) -> ScanStats:
+        """
+        Bring the database up to date with the directory, hashing only files
+        whose (size, mtime_ns, inode) changed. Files modified in the same
+        instant as the previous scan are rehashed too, since a later write
+        within the timestamp granularity would not change their mtime.
+        """
+        start = time.monotonic()
+        scan_ns = time.time_ns()
+        records = {}
+        to_hash = {}
+        for relative, st in self._walk().items():
+            old = self.records.get(relative)
+            if old and old[SIZE] == st.st_size and old[MTIME_NS] == st.st_mtime_ns \
+                    and old[INODE] == st.st_ino and st.st_mtime_ns < self.scanned_ns:
+                records[relative] = old
+            else:
+                records[relative] = [st.st_size, st.st_mtime_ns, st.st_ino, None]
+                to_hash[str(self.game_dir / relative)] = relative
+
+        for path, digests in hash_files(to_hash, workers=workers).items():
+            records[to_hash[path]][SHA256] = digests["sha256"]
+        # Files that vanished or became unreadable while hashing are left out
+        self.records = {relative: record for relative, record in records.items() if record[SHA256]}
+        self.scanned_ns = scan_ns
+
+        stats = ScanStats(len(self.records), len(to_hash), time.monotonic() - start)
+        self.logger.info(f"Fingerprinted {stats.files} file(s), hashed {stats.hashed}, "
+                         f"in {stats.seconds:.2f}s")
+        return stats
+
+    def diff(self, reference: Dict[str, list], partial: bool = False) -> FingerprintDiff:
+        """
+        Compare with reference records by size and digest. A partial
+        reference only describes some files, so others are not reported.
+        """
+        result = FingerprintDiff()
+        for relative, expected in sorted(reference.items()):
+            current = self.records.get(relative)
+            if current is None:
+                result.removed.append(relative)
+            elif current[SIZE] != expected[SIZE] or current[SHA256] != expected[SHA256]:
+                result.modified.append(relative)
+        if not partial:
+            result.added = sorted(set(self.records) - set(reference))
+        return result
+
+
+def read_fingerprint(path) -> Optional[dict]:
+    """Read a fingerprint database file; None if missing, unreadable or outdated"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != FINGERPRINT_VERSION:
+        return None
+    return data
+
+
+def patched_reference() -> Dict[str, list]:
+    """Records describing the patch files of the known-good patched build"""
+    return {name: [entry["size"], None, None, entry["sha256"]] for name, entry in PATCH_FILE_HASHES.items()}
+
+
+def load_reference(spec: str):
+    """
+    Resolve a --reference value to (records, partial): "patched" for the
+    known-good patched build, else a fingerprint file saved from another scan
+    """
+    if spec == REFERENCE_PATCHED:
+        return patched_reference(), True
+    data = read_fingerprint(spec)
+    if data is None:
+        raise ValueError(f"Not a fingerprint file: {spec}")
+    return data["files"], False
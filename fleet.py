@@ -0,0 +1,188 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Fleet (batch) installation
+
+Installs the community fix into many game directories from one run: a
+targets file lists one path per line, or a root directory is expanded to
+every installation found beneath it. Targets run on a bounded worker pool,
+so wall time scales with the worker count rather than the target count.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from backup_retention import RetentionPolicy
+from config import FLEET_WORKERS, GAME_EXECUTABLE, VERSION
+from discovery import discover_game_installations
+from installer import RebellionFixInstaller
+from preflight import run_preflight, CHECK_PATCH_FILES, CHECK_PERMISSIONS, CHECK_GAME_RUNNING, CHECK_DISK_SPACE
+
+# Target outcomes
+STATUS_INSTALLED = "installed"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+@dataclass
+class FleetOptions:
+    """Installation options applied to every target"""
+    skip_backup: bool = False
+    remove_briefings: bool = False
+    force_reinstall: bool = False
+    verify_read_back: bool = False
+    verify_copies: bool = True
+    archive_backups: bool = False
+    retention_policy: Optional[RetentionPolicy] = None
+    configure_compatibility: bool = True
+    modify_shortcuts: bool = True
+    # Called with each target's path to get a subscriber for its installer's events
+    progress_subscriber: Optional[Callable[[str], Callable]] = None
+
+
+@dataclass
+class TargetResult:
+    """Outcome of installing to one game directory"""
+    path: str
+    status: str = STATUS_FAILED
+    error: str = ""
+    files_installed: List[str] = field(default_factory=list)
+    files_skipped: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status != STATUS_FAILED
+
+
+def expand_targets(spec: str) -> List[str]:
+    """
+    Turn a --targets value into game directories: a text file with one
+    path per line (blank lines and # comments ignored), or a directory
+    searched for installations. Duplicates are dropped, order is kept.
+    """
+    spec_path = Path(spec)
+    if spec_path.is_file():
+        with open(spec_path, 'r', encoding='utf-8') as f:
+            paths = [line.strip() for line in f]
+        paths = [path for path in paths if path and not path.startswith('#')]
+    elif spec_path.is_dir():
+        if (spec_path / GAME_EXECUTABLE).exists():
+            paths = [str(spec_path)]
+        else:
+            paths = sorted(discover_game_installations(roots=[str(spec_path)]))
+    else:
+        raise FileNotFoundError(f"Targets file or directory not found: {spec}")
+
+    return list(dict.fromkeys(paths))
+
+
+def install_target(path: str, options: FleetOptions) -> TargetResult:
+    """Run preflight, backup, install, compatibility and shortcut steps on one target"""
+    result = TargetResult(path)
+    start = time.monotonic()
+    installer = RebellionFixInstaller()
+    installer.skip_backup = options.skip_backup
+    installer.remove_briefings = options.remove_briefings
+    installer.force_reinstall = options.force_reinstall
+    installer.verify_read_back = options.verify_read_back
+    installer.verify_copies = options.verify_copies
+    installer.archive_backups = options.archive_backups
+    if options.retention_policy is not None:
+        installer.retention_policy = options.retention_policy
+    if options.progress_subscriber is not None:
+        installer.events.subscribe(options.progress_subscriber(path))
+
+    try:
+        if not installer.validate_game_path(path):
+            result.error = f"{GAME_EXECUTABLE} not found"
+            return result
+        installer.game_path = path
+
+        report = run_preflight(installer)
+        for check, message in [
+            (CHECK_PATCH_FILES, "Patch files not found"),
+            (CHECK_PERMISSIONS, "Game directory is not writable"),
+            (CHECK_GAME_RUNNING, "Game is running"),
+            (CHECK_DISK_SPACE, "Insufficient disk space"),
+        ]:
+            if not report.ok(check):
+                result.error = message
+                return result
+
+        if not installer.perform_installation(options.configure_compatibility, options.modify_shortcuts):
+            result.error = installer.last_error or "Installation failed"
+            return result
+        installer.wait_for_background_prune()
+
+        result.files_installed = list(installer.files_installed)
+        result.files_skipped = list(installer.files_skipped)
+        result.status = STATUS_INSTALLED if result.files_installed else STATUS_SKIPPED
+        return result
+
+    except Exception as e:
+        result.error = str(e)
+        return result
+    finally:
+        result.seconds = time.monotonic() - start
+        installer.logger.info(f"Fleet target {path}: {result.status} {result.error}".rstrip())
+
+
+def run_fleet(targets: List[str], options: FleetOptions,
+              workers: int = FLEET_WORKERS, on_result=None) -> List[TargetResult]:
+    """
+    Install to every target on a bounded pool; returns results in target order.
+    on_result, if given, is called with each TargetResult as it finishes.
+    """
+    if not targets:
+        return []
+
+    def run_one(path: str) -> TargetResult:
+        result = install_target(path, options)
+        if on_result:
+            on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(targets)))) as executor:
+        return list(executor.map(run_one, targets))
+
+
+def fleet_exit_code(results: List[TargetResult]) -> int:
+    """0 when every target succeeded, 2 on partial failure, 1 when none did"""
+    failed = sum(1 for result in results if not result.ok)
+    if not results or failed == len(results):
+        return 1
+    return 2 if failed else 0
+
+
+def format_summary(results: List[TargetResult]) -> str:
+    """Per-target summary table"""
+    width = max([len("Target")] + [len(result.path) for result in results])
+    lines = [
+        f"{'Target':<{width}}  {'Status':<9}  {'Files':>5}  {'Time':>7}  Error",
+        f"{'-' * width}  {'-' * 9}  {'-' * 5}  {'-' * 7}  -----",
+    ]
+    for result in results:
+        lines.append(
+            f"{result.path:<{width}}  {result.status:<9}  {len(result.files_installed):>5}  "
+            f"{result.seconds:>6.1f}s  {result.error}"
+        )
+    failed = sum(1 for result in results if not result.ok)
+    lines.append(f"{len(results) - failed} of {len(results)} target(s) succeeded")
+    return "\n".join(lines)
+
+
+def write_report(results: List[TargetResult], report_file) -> None:
+    """Write a machine-readable JSON report of the fleet run"""
+    report = {
+        "installer_version": VERSION,
+        "finished": datetime.now().isoformat(timespec="seconds"),
+        "exit_code": fleet_exit_code(results),
+        "targets": [dict(asdict(result), ok=result.ok) for result in results],
+    }
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
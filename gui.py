@@ -15,17 +15,28 @@ import webbrowser
 
 from installer import RebellionFixInstaller
 from config import VERSION, PATCH_FILES
+from events import StepStarted, BytesTransferred
+from preflight import (
+    run_preflight, CHECK_GAME_PATH, CHECK_PATCH_FILES, CHECK_ALREADY_PATCHED,
+    CHECK_PERMISSIONS, CHECK_GAME_RUNNING, CHECK_DISK_SPACE
+)
 from utils import is_admin, run_as_admin
 
 
 class InstallerGUI:
     """Main GUI class for the installer"""
     
-    def __init__(self):
+    def __init__(self, rescan: bool = False):
         self.root = tk.Tk()
         self.installer = RebellionFixInstaller()
+        self.installer.use_discovery_cache = not rescan
         self.current_step = 0
         self.total_steps = 6  # Added shortcut modification step
+        self.wait_for_game = False
+        self.install_thread = None
+        self.closing = False
+        self.step_message = ""
+        self.installer.events.subscribe(self.on_installer_event)
         self.setup_window()
         self.create_widgets()
         
@@ -163,7 +174,7 @@ class InstallerGUI:
         self.exit_button = ttk.Button(
             buttons_frame,
             text="Exit",
-            command=self.root.quit
+            command=self.on_close
         )
         self.exit_button.pack(side=tk.RIGHT)
         
@@ -183,7 +194,7 @@ class InstallerGUI:
         )
         
         if folder:
-            if self.installer.validate_game_path(folder):
+            if self.installer.validate_game_path(folder, remember=True):
                 self.path_var.set(folder)
                 self.installer.game_path = folder
             else:
@@ -194,22 +205,32 @@ class InstallerGUI:
                 )
     
     def auto_detect_game(self):
-        """Auto-detect game installation"""
+        """Auto-detect game installation in a background thread"""
         self.progress_var.set("Searching for game installation...")
-        self.root.update()
+        self.detect_button.config(state="disabled")
         
+        thread = threading.Thread(target=self.run_auto_detect)
+        thread.daemon = True
+        thread.start()
+    
+    def run_auto_detect(self):
+        """Run game detection (common paths, then a scan of all volumes)"""
         game_path = self.installer.find_game_installation()
+        self.root.after(0, lambda: self.finish_auto_detect(game_path))
+    
+    def finish_auto_detect(self, game_path):
+        """Show auto-detection result"""
+        self.detect_button.config(state="normal")
         if game_path:
             self.path_var.set(game_path)
             self.installer.game_path = game_path
             self.progress_var.set(f"Game found: {Path(game_path).name}")
         else:
-            self.progress_var.set("Game not found in common locations - please browse manually")
+            self.progress_var.set("Game not found on any drive - please browse manually")
     
-    def validate_installation(self) -> bool:
-        """Validate installation before starting"""
-        # Check game path
-        if not self.installer.game_path or not self.installer.validate_game_path(self.installer.game_path):
+    def validate_installation(self, report) -> bool:
+        """Report preflight results in order and ask how to proceed"""
+        if not report.ok(CHECK_GAME_PATH):
             messagebox.showerror(
                 "Invalid Game Path",
                 "Please select a valid Star Wars: Rebellion installation folder."
@@ -217,7 +238,7 @@ class InstallerGUI:
             return False
         
         # Check patch files
-        if not self.installer.check_patch_files():
+        if not report.ok(CHECK_PATCH_FILES):
             messagebox.showerror(
                 "Missing Patch Files",
                 "Required patch files are missing. Please ensure the following files are in the same directory as this installer:\n\n" +
@@ -226,10 +247,10 @@ class InstallerGUI:
             return False
         
         # Check if already patched
-        if self.installer.is_already_patched():
+        if not report.ok(CHECK_ALREADY_PATCHED):
             result = messagebox.askyesno(
                 "Already Patched",
-                "The game appears to be already patched with version 1.02 or higher.\n\n"
+                "REBEXE.exe already matches the community fix (game version 1.02).\n\n"
                 "Do you want to continue with the installation anyway?",
                 icon="question"
             )
@@ -242,7 +263,8 @@ class InstallerGUI:
                 "Steam Version Detected",
                 "Steam version of the game detected.\n\n"
                 "WARNING: Steam may verify and restore original files, overwriting this patch.\n"
-                "Consider disabling automatic updates for this game in Steam.\n\n"
+                "Consider disabling automatic updates for this game in Steam, or run the\n"
+                "installer with --watch to re-apply the patch automatically.\n\n"
                 "Do you want to continue with the installation?",
                 icon="warning"
             )
@@ -250,7 +272,7 @@ class InstallerGUI:
                 return False
         
         # Check permissions
-        if not self.installer.check_permissions():
+        if not report.ok(CHECK_PERMISSIONS):
             if not is_admin():
                 result = messagebox.askyesno(
                     "Administrative Rights Required",
@@ -269,17 +291,21 @@ class InstallerGUI:
                 )
                 return False
         
-        # Check if game is running
-        if self.installer.is_game_running():
-            messagebox.showerror(
+        # Check if game is running - offer to install as soon as it closes
+        self.wait_for_game = False
+        if not report.ok(CHECK_GAME_RUNNING):
+            result = messagebox.askyesno(
                 "Game Running",
-                "Star Wars: Rebellion is currently running. Please close the game before installing the patch."
+                "Star Wars: Rebellion is currently running.\n\n"
+                "Would you like to install the patch automatically as soon as the game is closed?",
+                icon="warning"
             )
-            return False
+            if not result:
+                return False
+            self.wait_for_game = True
         
         # Check disk space (need at least 50MB for backup and installation)
-        free_space = self.installer.get_disk_space()
-        if free_space < 50 * 1024 * 1024:  # 50MB
+        if not report.ok(CHECK_DISK_SPACE):
             messagebox.showerror(
                 "Insufficient Disk Space",
                 "Insufficient disk space for installation and backup.\n"
@@ -290,61 +316,66 @@ class InstallerGUI:
         return True
     
     def start_installation(self):
-        """Start the installation process in a separate thread"""
-        if not self.validate_installation():
+        """Run preflight checks in the background, then start the installation"""
+        if not self.installer.game_path:
+            messagebox.showerror(
+                "Invalid Game Path",
+                "Please select a valid Star Wars: Rebellion installation folder."
+            )
             return
         
-        # Disable buttons during installation
-        self.install_button.config(state="disabled")
-        self.uninstall_button.config(state="disabled")
-        self.browse_button.config(state="disabled")
-        self.detect_button.config(state="disabled")
+        # Disable buttons during checks and installation
+        self.disable_buttons()
+        
+        # Run all checks at once off the UI thread, then report in order
+        self.progress_var.set("Checking installation requirements...")
+        self.install_thread = threading.Thread(target=self.run_preflight_checks)
+        self.install_thread.daemon = True
+        self.install_thread.start()
+    
+    def run_preflight_checks(self):
+        """Run preflight checks (worker thread) and hand the report to the UI thread"""
+        report = run_preflight(self.installer)
+        self.root.after(0, lambda: self.finish_preflight(report))
+    
+    def finish_preflight(self, report):
+        """Show preflight results and start the installation if they allow it"""
+        if self.closing:
+            return
+        self.progress_var.set("Ready to install")
+        if not self.validate_installation(report):
+            self.enable_buttons()
+            return
         
         # Set installer options
         self.installer.skip_backup = not self.backup_var.get()
         self.installer.remove_briefings = self.briefing_var.get()
         
         # Start installation thread
-        thread = threading.Thread(target=self.run_installation)
-        thread.daemon = True
-        thread.start()
+        self.installer.cancel_event.clear()
+        self.install_thread = threading.Thread(target=self.run_installation)
+        self.install_thread.daemon = True
+        self.install_thread.start()
     
     def run_installation(self):
         """Run installation process"""
         try:
             self.current_step = 0
-            self.update_progress("Starting installation...", 0)
-            
-            # Step 1: Create backup
-            if not self.installer.skip_backup:
-                self.update_progress("Creating backup...", 1)
-                if not self.installer.create_backup():
-                    raise Exception("Failed to create backup")
-            else:
-                self.current_step += 1
             
-            # Step 2: Install patch files
-            self.update_progress("Installing patch files...", 2)
-            if not self.installer.install_patch_files():
-                raise Exception("Failed to install patch files")
+            # Queued install: start as soon as the game exits
+            if self.wait_for_game:
+                self.update_progress("Waiting for Star Wars: Rebellion to close...", 0)
+                self.installer.wait_for_game_exit()
+                self.wait_for_game = False
             
-            # Step 3: Configure compatibility
-            if self.compatibility_var.get():
-                self.update_progress("Configuring compatibility settings...", 3)
-                self.installer.configure_compatibility()
-            else:
-                self.current_step += 1
-            
-            # Step 4: Modify shortcuts with -w flag (CRITICAL)
-            self.update_progress("Modifying shortcuts with -w flag...", 4)
-            self.installer.modify_shortcuts()
+            self.update_progress("Starting installation...", 0)
             
-            # Step 5: Remove briefings
-            if self.installer.remove_briefings:
-                self.update_progress("Removing briefing files...", 5)
-                self.installer.remove_intro_briefings()
-            else:
-                self.current_step += 1
+            # Steps 1-5: backup, patch files, compatibility, shortcuts, briefings
+            if not self.installer.perform_installation(
+                configure_compatibility=self.compatibility_var.get(),
+                modify_shortcuts=True  # -w flag is CRITICAL
+            ):
+                raise Exception(self.installer.last_error)
             
             # Step 6: Complete
             self.update_progress("Installation completed!", 6)
@@ -367,8 +398,8 @@ class InstallerGUI:
             )
             return
         
-        backup_folders = self.installer.get_backup_folders()
-        if not backup_folders:
+        backup = self.installer.select_backup()
+        if backup is None:
             messagebox.showerror(
                 "No Backup Found",
                 "No backup folders found in the game directory.\n"
@@ -379,22 +410,57 @@ class InstallerGUI:
         result = messagebox.askyesno(
             "Confirm Uninstall",
             f"This will restore original game files from backup.\n\n"
-            f"Backup folder: {backup_folders[0].name}\n\n"
+            f"Backup folder: {backup['folder']}\n\n"
             "Do you want to continue?",
             icon="question"
         )
         
         if result:
-            if self.installer.restore_from_backup():
-                messagebox.showinfo(
-                    "Uninstall Complete",
-                    "The community fix has been uninstalled and original files have been restored."
-                )
-            else:
-                messagebox.showerror(
-                    "Uninstall Failed",
-                    "Failed to restore original files from backup."
-                )
+            # Restoring copies whole files: keep it off the Tk thread like installs
+            self.disable_buttons()
+            self.progress_var.set("Restoring original files...")
+            self.install_thread = threading.Thread(target=self.run_uninstall, args=(backup["id"],))
+            self.install_thread.daemon = True
+            self.install_thread.start()
+    
+    def run_uninstall(self, backup_id: str):
+        """Restore the chosen backup and report back on the Tk thread"""
+        try:
+            restored = self.installer.restore_from_backup(backup_id=backup_id)
+        except Exception as e:
+            self.installer.logger.error(f"Uninstall failed: {e}")
+            restored = False
+        self.root.after(0, lambda: self.finish_uninstall(restored))
+        self.root.after(0, self.enable_buttons)
+    
+    def finish_uninstall(self, restored: bool):
+        """Show the outcome of run_uninstall"""
+        if self.closing:
+            return
+        if restored:
+            self.progress_var.set("Uninstall completed!")
+            messagebox.showinfo(
+                "Uninstall Complete",
+                "The community fix has been uninstalled and original files have been restored."
+            )
+        else:
+            self.progress_var.set("Uninstall failed")
+            messagebox.showerror(
+                "Uninstall Failed",
+                "Failed to restore original files from backup."
+            )
+    
+    def on_installer_event(self, event):
+        """Show installer progress events (called from the installer thread)"""
+        if isinstance(event, StepStarted):
+            self.step_message = event.message
+            self.current_step = event.index
+            self.update_progress(event.message, event.index)
+        elif isinstance(event, BytesTransferred) and event.total:
+            detail = f"{event.done * 100 // event.total}% at {event.mb_per_second:.1f} MB/s"
+            if event.eta_seconds:
+                detail += f", about {event.eta_seconds:.0f}s left"
+            self.update_progress(f"{self.step_message} {detail}", self.current_step)
     
     def update_progress(self, message: str, step: int):
         """Update progress bar and message"""
@@ -407,6 +473,8 @@ class InstallerGUI:
     
     def show_completion_dialog(self):
         """Show installation completion dialog"""
+        if self.closing:
+            return
         # Show multiplayer info first if requested
         from config import MULTIPLAYER_INFO
         messagebox.showinfo(
@@ -434,12 +502,21 @@ class InstallerGUI:
     
     def show_error_dialog(self, error_message: str):
         """Show error dialog"""
+        if self.closing:
+            return
         messagebox.showerror(
             "Installation Failed",
             f"Installation failed with the following error:\n\n{error_message}\n\n"
             "Please check the log file for more details."
         )
     
+    def disable_buttons(self):
+        """Disable buttons while an installation or uninstall runs"""
+        self.install_button.config(state="disabled")
+        self.uninstall_button.config(state="disabled")
+        self.browse_button.config(state="disabled")
+        self.detect_button.config(state="disabled")
+    
     def enable_buttons(self):
         """Re-enable buttons after installation"""
         self.install_button.config(state="normal")
@@ -491,6 +568,32 @@ class InstallerGUI:
                 "Log file not found."
             )
     
+    def is_busy(self) -> bool:
+        """Whether an installation, uninstall or background prune is still running"""
+        return any(thread is not None and thread.is_alive()
+                   for thread in (self.install_thread, self.installer.prune_thread))
+    
+    def on_close(self):
+        """Cancel a running installation or prune cleanly before closing the window"""
+        if self.closing:
+            return
+        if self.is_busy():
+            self.closing = True
+            self.progress_var.set("Cancelling...")
+            self.installer.cancel()
+            self.close_when_stopped()
+        else:
+            self.root.destroy()
+    
+    def close_when_stopped(self):
+        """Destroy the window once the worker threads have rolled back and exited"""
+        # Poll rather than join: the worker needs the Tk loop for its updates
+        if self.is_busy():
+            self.root.after(100, self.close_when_stopped)
+        else:
+            self.root.destroy()
+    
     def run(self):
         """Start the GUI application"""
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.root.mainloop()
@@ -0,0 +1,175 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Streaming multi-digest hash engine
+
+Computes several digests in a single read using a large reusable buffer
+(or mmap for big files), and hashes many files in parallel on a thread
+pool - hashlib releases the GIL, so throughput is bound by the disk.
+Run this module to benchmark hashing throughput on the local disk.
+"""
+
+import os
+import sys
+import mmap
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Sequence
+
+from config import HASH_BUFFER_SIZE, HASH_MMAP_THRESHOLD, HASH_WORKERS
+
+
+def new_hashers(algorithms: Sequence[str]) -> Dict[str, "hashlib._Hash"]:
+    """Create one hashlib object per algorithm name"""
+    return {name: hashlib.new(name) for name in algorithms}
+
+
+def hash_file(file_path, algorithms: Sequence[str] = ("sha256",),
+              buffer_size: int = HASH_BUFFER_SIZE) -> Dict[str, str]:
+    """
+    Hash a file with every requested algorithm in one pass.
+    Returns {algorithm: hexdigest}.
+    """
+    hashers = new_hashers(algorithms)
+    update_all = [hasher.update for hasher in hashers.values()]
+
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size >= HASH_MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, buffer_size):
+                        chunk = view[offset:offset + buffer_size]
+                        for update in update_all:
+                            update(chunk)
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                chunk = view[:count]
+                for update in update_all:
+                    update(chunk)
+
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+
+def _drop_cached_pages(file_path):
+    """Flush a file and evict it from the page cache, where the OS allows"""
+    fadvise = getattr(os, "posix_fadvise", None)
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        if fadvise is not None:
+            fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _hash_file_direct(file_path, algorithm: str, buffer_size: int) -> str:
+    """Hash a file with O_DIRECT reads into a page-aligned buffer"""
+    hasher = hashlib.new(algorithm)
+    fd = os.open(file_path, os.O_RDONLY | os.O_DIRECT)
+    try:
+        with mmap.mmap(-1, buffer_size) as buffer:
+            view = memoryview(buffer)
+            try:
+                while True:
+                    count = os.readv(fd, [buffer])
+                    if count:
+                        hasher.update(view[:count])
+                    # A short direct read only happens at end of file
+                    if count < buffer_size:
+                        break
+            finally:
+                view.release()
+    finally:
+        os.close(fd)
+    return hasher.hexdigest()
+
+
+def hash_file_uncached(file_path, algorithm: str = "sha256",
+                       buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """
+    Hash a file as stored on disk rather than as cached in memory, to
+    verify a write: O_DIRECT where the filesystem supports it, otherwise
+    by dropping the file's cached pages before reading it back.
+    """
+    _drop_cached_pages(file_path)
+    if hasattr(os, "O_DIRECT"):
+        try:
+            return _hash_file_direct(file_path, algorithm, buffer_size)
+        except OSError:
+            pass
+    return hash_file(file_path, (algorithm,), buffer_size)[algorithm]
+
+
+def hash_files(file_paths: Iterable, algorithms: Sequence[str] = ("sha256",),
+               workers: int = HASH_WORKERS) -> Dict[str, Dict[str, str]]:
+    """
+    Hash many files in parallel.
+    Returns {path: {algorithm: hexdigest}}; unreadable files are omitted.
+    """
+    paths = [str(path) for path in file_paths]
+
+    def hash_one(path):
+        try:
+            return path, hash_file(path, algorithms)
+        except OSError:
+            return path, None
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths) or 1))) as executor:
+        for path, digests in executor.map(hash_one, paths):
+            if digests is not None:
+                results[path] = digests
+    return results
+
+
+def benchmark(paths: Sequence[str], algorithms: Sequence[str] = ("md5", "sha256"),
+              workers: int = HASH_WORKERS) -> Dict[str, float]:
+    """Hash the given files and report total bytes, seconds and MB/s"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names)
+        else:
+            files.append(path)
+
+    total_bytes = 0
+    for file_path in files:
+        try:
+            total_bytes += os.path.getsize(file_path)
+        except OSError:
+            pass
+
+    start = time.perf_counter()
+    hash_files(files, algorithms, workers)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "files": len(files),
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "mb_per_second": (total_bytes / (1024 * 1024)) / elapsed if elapsed else 0.0,
+    }
+
+
+if __name__ == '__main__':
+    targets = sys.argv[1:] or [os.path.dirname(os.path.abspath(__file__))]
+    for worker_count in (1, HASH_WORKERS):
+        result = benchmark(targets, workers=worker_count)
+        print(
+            f"{worker_count:>2} worker(s): {result['files']} files, "
+            f"{result['bytes'] / (1024 * 1024):.1f} MB in {result['seconds']:.3f} s "
+            f"({result['mb_per_second']:.1f} MB/s, md5+sha256)"
+        )
@@ -9,16 +9,33 @@ Contributors:
 
 import os
 import shutil
-import subprocess
-import hashlib
 import logging
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Callable
 
-from config import COMMON_PATHS, PATCH_FILES, BACKUP_FILES, VERSION
-from utils import setup_logging, is_admin, run_as_admin, get_file_version, find_shortcuts, modify_shortcut_arguments, create_shortcut
+from config import COMMON_PATHS, PATCH_FILES, BACKUP_FILES, VERSION, PATCHED_EXE_VERSION, GAME_EXECUTABLE, INSTALLATION_STEPS
+from config import BACKUP_ARCHIVE_FILE, BACKUP_ARCHIVE_METHOD, DISCOVERY_CONFIDENT_SCORE, RESTORE_STAGING_DIR
+from discovery import GameDiscovery, best_first
+from discovery_cache import DiscoveryCache
+from backup_catalog import BackupCatalog
+from backup_retention import RetentionPolicy, PruneResult, prune_backups, is_original_backup
+from backup_store import BackupStore
+from checkpoint import CheckpointJournal
+from copy_scheduler import CopyJob, CopyScheduler, OperationCancelled
+from delta import find_delta, apply_delta, DeltaError
+from events import EventBus
+from payload_archive import PayloadArchive, build_archive
+from payload import (
+    find_payload_source, get_payload_archive, payload_available, get_expected_entry,
+    file_matches, sha256_file, write_install_manifest
+)
+from processes import get_process_backend, is_process_running, wait_for_exit
+from storefronts import find_storefront_install, is_steam_install
+from transaction import InstallTransaction, recover_transaction, STATE_STAGING
+from utils import setup_logging, get_file_version, find_shortcuts, modify_shortcut_arguments, create_shortcut
 
 # Windows-only imports
 if sys.platform == 'win32':
@@ -40,28 +57,101 @@ class RebellionFixInstaller:
         self.remove_briefings: bool = False
         self.shortcuts_modified: List[str] = []
         self.is_steam_version: bool = False
+        self.game_candidates: List[str] = []
+        self.use_discovery_cache: bool = True
+        self.force_reinstall: bool = False
+        self.verify_read_back: bool = False
+        # Hash every copy as it is written; off lets the kernel copy files directly
+        self.verify_copies: bool = True
+        self.archive_backups: bool = False
+        self.retention_policy = RetentionPolicy()
+        self.prune_after_install: bool = True
+        self.prune_thread: Optional[threading.Thread] = None
+        self.files_installed: List[str] = []
+        self.files_skipped: List[str] = []
+        self.files_restored: List[str] = []
+        self.files_unchanged: List[str] = []
+        self.files_differing: List[str] = []
+        self.last_error: Optional[str] = None
+        self.events = EventBus()
+        self.cancel_event = threading.Event()
+        self._discovery: Optional[GameDiscovery] = None
+        self.process_backend = get_process_backend()
         self.logger = setup_logging()
+        self.discovery_cache = DiscoveryCache()
         
-    def find_game_installation(self) -> Optional[str]:
+    def find_game_installation(self, deep_scan: bool = True) -> Optional[str]:
         """
-        Find Star Wars: Rebellion installation in common paths
+        Find Star Wars: Rebellion installation
+        Checks the discovery cache, Steam/GOG records and common paths first,
+        then scans all mounted volumes if deep_scan is set
         Returns path if found, None otherwise
         """
         self.logger.info("Searching for game installation...")
         
+        if self.use_discovery_cache:
+            cached = self.discovery_cache.lookup()
+            if cached:
+                self.is_steam_version = cached["is_steam_version"]
+                self.logger.info(f"Found game at: {cached['path']} (cached)")
+                return cached["path"]
+        
+        # Matching every Steam manifest by title is left to explicit rescans
+        storefront_install = find_storefront_install(scan_titles=not self.use_discovery_cache)
+        if storefront_install and (Path(storefront_install.path) / "REBEXE.exe").exists():
+            self.is_steam_version = storefront_install.storefront == "steam"
+            self.logger.info(f"Found game at: {storefront_install.path} ({storefront_install.storefront})")
+            self.discovery_cache.remember(storefront_install.path, self.is_steam_version)
+            return storefront_install.path
+        
         for path in COMMON_PATHS:
             full_path = Path(path)
             exe_path = full_path / "REBEXE.exe"
             
             if exe_path.exists():
                 self.logger.info(f"Found game at: {full_path}")
+                self.is_steam_version = is_steam_install(path)
+                self.discovery_cache.remember(str(full_path), self.is_steam_version)
                 return str(full_path)
         
         self.logger.info("Game not found in common paths")
+        
+        if not deep_scan:
+            return None
+        
+        self.logger.info("Scanning mounted volumes for game installation...")
+        self._discovery = GameDiscovery()
+        if self.is_cancelled():
+            # cancel() ran before there was a discovery to stop
+            self._discovery.stop()
+        candidates = []
+        try:
+            # Candidates stream in as volumes are walked; a confident match ends the scan
+            for candidate in self._discovery.find_all():
+                self.logger.info(f"Candidate installation: {candidate.path}")
+                candidates.append(candidate)
+                if candidate.score >= DISCOVERY_CONFIDENT_SCORE:
+                    break
+        finally:
+            self._discovery = None
+        self.game_candidates = [candidate.path for candidate in best_first(candidates)]
+        if self.is_cancelled():
+            self.logger.info("Game search cancelled")
+            return None
+        if self.game_candidates:
+            self.logger.info(f"Found {len(self.game_candidates)} candidate(s), using: {self.game_candidates[0]}")
+            self.is_steam_version = is_steam_install(self.game_candidates[0])
+            self.discovery_cache.remember(self.game_candidates[0], self.is_steam_version)
+            return self.game_candidates[0]
+        
+        self.logger.info("Game not found on any mounted volume")
         return None
     
-    def validate_game_path(self, path: str) -> bool:
-        """Validate that the given path contains a valid game installation"""
+    def validate_game_path(self, path: str, remember: bool = False) -> bool:
+        """
+        Validate that the given path contains a valid game installation
+        With remember, it is also recorded in the discovery cache
+        """
         game_path = Path(path)
         exe_path = game_path / "REBEXE.exe"
         
@@ -71,35 +161,19 @@ class RebellionFixInstaller:
         
         self.logger.info(f"Valid game installation found at: {path}")
         
-        # Check if this is a Steam installation
-        if "steam" in path.lower():
+        # Check if this is a Steam installation (inside a Steam library)
+        if is_steam_install(path):
             self.is_steam_version = True
             self.logger.info("Steam version detected")
         
+        if remember:
+            self.discovery_cache.remember(path, self.is_steam_version)
         return True
     
     def check_patch_files(self) -> bool:
         """Check if all required patch files are available"""
-        installer_dir = Path(__file__).parent
-        
-        # Check in installer directory first
         for filename in PATCH_FILES:
-            file_path = installer_dir / filename
-            if file_path.exists():
-                continue
-            
-            # Check in attached_assets directory
-            assets_path = installer_dir / "attached_assets" / filename
-            if filename == "REBEXE.exe":
-                assets_path = installer_dir / "attached_assets" / "REBEXE_1751323218170.EXE"
-            elif filename == "D3Dlmm.dll":
-                assets_path = installer_dir / "attached_assets" / "D3DImm_1751323218171.dll"
-            elif filename == "DDraw.dll":
-                assets_path = installer_dir / "attached_assets" / "DDraw_1751323218169.dll"
-            elif filename == "d3drm.dll":
-                assets_path = installer_dir / "attached_assets" / "d3drm_1751323218167.dll"
-            
-            if not assets_path.exists():
+            if not payload_available(filename):
                 self.logger.error(f"Patch file not found: {filename}")
                 return False
         
@@ -107,7 +181,11 @@ class RebellionFixInstaller:
         return True
     
     def is_already_patched(self) -> bool:
-        """Check if the game is already patched by checking REBEXE.exe version"""
+        """
+        Check if the game is already patched: REBEXE.exe matches the payload
+        (size, then SHA-256), or is another build of the fix that carries the
+        patched FileVersion
+        """
         if not self.game_path:
             return False
         
@@ -116,29 +194,50 @@ class RebellionFixInstaller:
             return False
         
         try:
-            version = get_file_version(str(exe_path))
-            # Check if version is 1.02 or higher (patched version)
-            if version and version >= "1.02":
+            expected = get_expected_entry("REBEXE.exe")
+            if expected is not None and file_matches(exe_path, expected):
                 self.logger.info("Game appears to be already patched")
                 return True
+            # Older releases of the fix ship other bytes with the same
+            # version; only the exact patched version counts
+            if get_file_version(str(exe_path)) == PATCHED_EXE_VERSION:
+                self.logger.info("Game appears to be patched by another release of the fix")
+                return True
         except Exception as e:
             self.logger.warning(f"Could not check game version: {e}")
         
         return False
     
-    def get_backup_folders(self) -> List[Path]:
-        """Get list of existing backup folders"""
+    def get_backup_catalog(self) -> Optional[BackupCatalog]:
+        """Get the backup catalog of the game directory"""
         if not self.game_path:
+            return None
+        return BackupCatalog(self.game_path)
+    
+    def get_backups(self) -> List[Dict]:
+        """Get catalog entries of existing backups, most recent first"""
+        catalog = self.get_backup_catalog()
+        return catalog.list() if catalog else []
+    
+    def select_backup(self, backup_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get the backup to restore: the one with backup_id, else the newest
+        backup of unpatched originals (a reinstall backs up patched files),
+        else the newest backup
+        """
+        catalog = self.get_backup_catalog()
+        if catalog is None:
+            return None
+        if backup_id:
+            return catalog.get(backup_id)
+        return next((entry for entry in catalog.list() if is_original_backup(entry)), catalog.latest())
+    
+    def get_backup_folders(self) -> List[Path]:
+        """Get list of existing backup folders, most recent first"""
+        catalog = self.get_backup_catalog()
+        if catalog is None:
             return []
-        
-        game_dir = Path(self.game_path)
-        backup_folders = []
-        
-        for item in game_dir.iterdir():
-            if item.is_dir() and item.name.startswith("Backup_"):
-                backup_folders.append(item)
-        
-        return sorted(backup_folders, key=lambda x: x.stat().st_mtime, reverse=True)
+        return [catalog.folder(entry) for entry in catalog.list()]
     
     def create_backup(self) -> bool:
         """Create backup of original game files"""
@@ -146,22 +245,61 @@ class RebellionFixInstaller:
             self.logger.error("Game path not set")
             return False
         
+        # Never back up a half-installed game
+        self.recover_interrupted_install()
+        self.wait_for_background_prune()
+        
         game_dir = Path(self.game_path)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_dir = game_dir / f"Backup_{timestamp}"
+        # A reinstall within the same second must not overwrite the backup
+        # it follows, which may be the only copy of the originals
+        suffix = 2
+        while backup_dir.exists():
+            backup_dir = game_dir / f"Backup_{timestamp}_{suffix}"
+            suffix += 1
+        archive_file = game_dir / f".{backup_dir.name}.rbpak"
+        
+        checkpoint = CheckpointJournal(game_dir, "backup")
+        if checkpoint.pending:
+            self.logger.info("Resuming interrupted backup")
         
         try:
-            backup_dir.mkdir(exist_ok=True)
-            self.backup_path = str(backup_dir)
+            # Originals go into the object store once and are hardlinked
+            # into the backup folder where the filesystem allows (or, with
+            # archive_backups, into one compressed archive). The folder is
+            # only created once all data is stored, so an interrupted backup
+            # never shows up as the latest one.
+            store = BackupStore(game_dir)
+            source_files = [game_dir / filename for filename in BACKUP_FILES if (game_dir / filename).exists()]
+            if self.archive_backups:
+                manifest_files = self.write_backup_archive(source_files, archive_file)
+                backup_dir.mkdir(exist_ok=True)
+                self.backup_path = str(backup_dir)
+                os.replace(archive_file, backup_dir / BACKUP_ARCHIVE_FILE)
+            else:
+                manifest_files = store.add_files(source_files, self.create_copy_scheduler(checkpoint))
+                backup_dir.mkdir(exist_ok=True)
+                self.backup_path = str(backup_dir)
             
             backed_up_files = []
-            for filename in BACKUP_FILES:
-                source_file = game_dir / filename
-                if source_file.exists():
-                    dest_file = backup_dir / filename
-                    shutil.copy2(source_file, dest_file)
-                    backed_up_files.append(filename)
-                    self.logger.info(f"Backed up: {filename}")
+            for filename, entry in manifest_files.items():
+                if not self.archive_backups:
+                    entry["linked"] = store.link_into(entry["sha256"], backup_dir / filename)
+                backed_up_files.append(filename)
+                self.logger.info(f"Backed up: {filename}")
+                self.events.file_result(filename, "backed_up")
+            
+            store.save_stat_cache()
+            manifest = {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "installer_version": VERSION,
+                "files": manifest_files,
+            }
+            if self.archive_backups:
+                manifest["archive"] = BACKUP_ARCHIVE_FILE
+            store.write_manifest(backup_dir, manifest)
+            BackupCatalog(game_dir).add(backup_dir, manifest)
             
             # Create backup log
             log_file = backup_dir / "backup_log.txt"
@@ -173,15 +311,56 @@ class RebellionFixInstaller:
                 for filename in backed_up_files:
                     f.write(f"- {filename}\n")
             
+            checkpoint.clear()
             self.logger.info(f"Backup created successfully at: {backup_dir}")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to create backup: {e}")
+            # Don't leave an incomplete backup that restore would pick first
+            if self.backup_path == str(backup_dir):
+                shutil.rmtree(backup_dir, ignore_errors=True)
+                self.backup_path = None
+            if archive_file.exists():
+                archive_file.unlink()
             return False
     
-    def install_patch_files(self) -> bool:
-        """Install patch files to game directory"""
+    def write_backup_archive(self, source_files: List[Path], archive_file: Path) -> Dict[str, Dict]:
+        """
+        Compress the originals into one backup archive in a single streaming
+        pass; returns {file name: manifest entry}. Members are decompressed
+        and checked again if verify_read_back is set.
+        """
+        total = sum(source_file.stat().st_size for source_file in source_files)
+        done = 0
+        
+        def on_progress(count: int):
+            nonlocal done
+            if self.cancel_event.is_set():
+                raise OperationCancelled("Backup cancelled")
+            done += count
+            self.events.bytes_progress(done, total)
+        
+        members = build_archive({source_file.name: source_file for source_file in source_files},
+                                archive_file, BACKUP_ARCHIVE_METHOD, on_progress)
+        manifest_files = {member.name: {"sha256": member.sha256, "size": member.size} for member in members}
+        
+        if self.verify_read_back:
+            archive = PayloadArchive(archive_file)
+            for filename, entry in manifest_files.items():
+                if not archive.verify(filename):
+                    archive_file.unlink()
+                    raise OSError(f"Backup archive verification failed for {filename}")
+                entry["verified"] = "read-back"
+        return manifest_files
+    
+    def install_patch_files(self, filenames: Optional[List[str]] = None) -> bool:
+        """
+        Install patch files (all of them, or just filenames) to game directory
+        Files that already match the payload manifest are skipped unless
+        force_reinstall is set. New files are staged first and then swapped
+        in together, so a failure never leaves a half-patched game.
+        """
         if not self.game_path:
             self.logger.error("Game path not set")
             return False
@@ -190,37 +369,84 @@ class RebellionFixInstaller:
             return False
         
         game_dir = Path(self.game_path)
-        installer_dir = Path(__file__).parent
+        self.recover_interrupted_install()
+        self.files_installed = []
+        self.files_skipped = []
+        copy_jobs = []
+        manifest_files = {}
+        
+        # Continue an interrupted install's staging rather than starting over
+        checkpoint = CheckpointJournal(game_dir, "install")
+        transaction = InstallTransaction.load(game_dir)
+        if transaction is not None and transaction.state == STATE_STAGING:
+            self.logger.info(f"Resuming interrupted installation {transaction.transaction_id}")
+        else:
+            transaction = InstallTransaction(game_dir)
         
         try:
-            for filename in PATCH_FILES:
-                # Try installer directory first
-                source_file = installer_dir / filename
-                
-                # If not found, check attached_assets with renamed files
-                if not source_file.exists():
-                    if filename == "REBEXE.exe":
-                        source_file = installer_dir / "attached_assets" / "REBEXE_1751323218170.EXE"
-                    elif filename == "D3Dlmm.dll":
-                        source_file = installer_dir / "attached_assets" / "D3DImm_1751323218171.dll"
-                    elif filename == "DDraw.dll":
-                        source_file = installer_dir / "attached_assets" / "DDraw_1751323218169.dll"
-                    elif filename == "d3drm.dll":
-                        source_file = installer_dir / "attached_assets" / "d3drm_1751323218167.dll"
-                
-                if not source_file.exists():
+            transaction.begin()
+            
+            for filename in filenames or PATCH_FILES:
+                if not payload_available(filename):
                     raise Exception(f"Source file not found: {filename}")
                 
                 dest_file = game_dir / filename
                 
-                # Copy file
-                shutil.copy2(source_file, dest_file)
+                # Skip files that already hold the patched bytes
+                if not self.force_reinstall:
+                    expected = get_expected_entry(filename)
+                    if expected and file_matches(dest_file, expected):
+                        manifest_files[filename] = dict(expected, method="unchanged")
+                        self.files_skipped.append(filename)
+                        self.logger.info(f"Already up to date: {filename}")
+                        self.events.file_result(filename, "skipped", "already up to date")
+                        continue
                 
-                # Verify copy
-                if not dest_file.exists():
-                    raise Exception(f"Failed to copy {filename}")
+                # Rebuild from the user's original when a delta is available,
+                # otherwise queue a full copy
+                staged_file = transaction.staged_path(filename)
+                expected = get_expected_entry(filename)
+                sha256 = self.build_from_delta(filename, dest_file, staged_file, expected)
+                if sha256 is not None:
+                    manifest_files[filename] = {
+                        "sha256": sha256,
+                        "size": staged_file.stat().st_size,
+                        "method": "delta",
+                    }
+                    transaction.add(filename)
+                else:
+                    copy_jobs.append(self.create_payload_job(filename, staged_file, expected))
                 
+                self.files_installed.append(filename)
+            
+            # Stage all full copies in parallel
+            for job in self.create_copy_scheduler(checkpoint).run(copy_jobs):
+                # Verify staged copy
+                if not job.ok or not job.dest.exists():
+                    self.events.file_result(job.name, "failed", job.error or "")
+                    raise Exception(f"Failed to copy {job.name}: {job.error}")
+                manifest_files[job.name] = {
+                    # Unverified copies are recorded with the payload digest they were copied from
+                    "sha256": job.sha256 or job.expected_sha256 or sha256_file(job.dest),
+                    "size": job.size,
+                    "method": "read-back" if self.verify_read_back else "stream" if job.sha256 else "copy",
+                }
+                transaction.add(job.name)
+            
+            # Last point at which a cancel rolls everything back
+            if self.is_cancelled():
+                raise Exception("Installation cancelled")
+            
+            # Swap all staged files into place
+            transaction.commit()
+            checkpoint.clear()
+            try:
+                write_install_manifest(game_dir, manifest_files, self.verify_read_back)
+            except OSError as e:
+                self.logger.warning(f"Could not write install manifest: {e}")
+            for filename in self.files_installed:
                 self.logger.info(f"Installed: {filename}")
+                self.events.file_result(filename, "installed")
             
             # Verify installation by checking REBEXE.exe version
             if self.is_already_patched():
@@ -232,8 +458,143 @@ class RebellionFixInstaller:
                 
         except Exception as e:
             self.logger.error(f"Failed to install patch files: {e}")
+            if transaction.state == STATE_STAGING:
+                # The game is untouched; keep staged data for the next run to resume
+                self.logger.info("Staged files kept; the next installation will resume")
+            else:
+                transaction.rollback()
+                checkpoint.clear()
+            self.files_installed = []
             return False
     
+    def create_payload_job(self, filename: str, dest_file: Path, expected: Optional[Dict]) -> CopyJob:
+        """Copy job for a patch file: streamed from the payload archive, else a loose file copy"""
+        expected_sha256 = expected["sha256"] if expected else None
+        archive = get_payload_archive()
+        if archive is not None and filename in archive:
+            member = archive.member(filename)
+            return CopyJob(archive.path, dest_file, filename, member.size, expected_sha256,
+                           reader=lambda dest, progress, hasher: archive.extract(filename, dest, progress, hasher))
+        return CopyJob(find_payload_source(filename), dest_file, filename, expected_sha256=expected_sha256)
+    
+    def build_from_delta(self, filename: str, original_file: Path, output_file: Path,
+                         expected: Optional[Dict]) -> Optional[str]:
+        """
+        Rebuild a patch file from the installed original using a bundled delta
+        Returns the rebuilt file's SHA-256, or None if no delta applies or
+        the result does not match the payload manifest entry
+        """
+        if not original_file.exists():
+            return None
+        
+        try:
+            source_sha256 = sha256_file(original_file)
+            delta_path = find_delta(filename, source_sha256)
+            if delta_path is None:
+                return None
+            
+            # apply_delta checks the result against the delta's own header;
+            # a stale delta must also match the payload being installed
+            sha256 = apply_delta(original_file, delta_path, output_file, source_sha256)
+            if expected is not None and (sha256 != expected["sha256"]
+                                         or output_file.stat().st_size != expected["size"]):
+                output_file.unlink()
+                raise DeltaError("Rebuilt file does not match the payload")
+            shutil.copystat(original_file, output_file)
+            self.logger.info(f"Rebuilt from delta: {filename}")
+            return sha256
+        except (OSError, DeltaError) as e:
+            self.logger.warning(f"Delta install failed for {filename}, using full copy: {e}")
+            return None
+    
+    def recover_interrupted_install(self, discard_staged: bool = False) -> Optional[str]:
+        """
+        Replay an install transaction interrupted during commit. A staged,
+        uncommitted one is kept for resuming unless discard_staged is set.
+        """
+        if not self.game_path:
+            return None
+        
+        try:
+            result = recover_transaction(self.game_path, discard_staged)
+            if discard_staged:
+                CheckpointJournal(self.game_path, "install").clear()
+            if result:
+                self.logger.warning(f"Interrupted installation found and {result}")
+            return result
+        except Exception as e:
+            self.logger.error(f"Failed to recover interrupted installation: {e}")
+            return None
+    
+    def create_copy_scheduler(self, checkpoint: Optional[CheckpointJournal] = None) -> CopyScheduler:
+        """
+        Create a copy scheduler publishing byte progress on the event bus
+        Unless verify_copies is off, every copy is hashed as it streams (and
+        re-read from disk if verify_read_back is set); with a checkpoint
+        journal, copies resume where an earlier run stopped
+        """
+        return CopyScheduler(progress=self.events.bytes_progress, cancel_event=self.cancel_event,
+                             checkpoint=checkpoint, verify=self.verify_copies,
+                             read_back=self.verify_read_back)
+    
+    def cancel(self):
+        """
+        Ask the running operation to stop as soon as possible. Copies stop
+        within one progress chunk and an interrupted install is rolled back.
+        """
+        self.cancel_event.set()
+        discovery = self._discovery
+        if discovery is not None:
+            discovery.stop()
+    
+    def is_cancelled(self) -> bool:
+        """Check whether cancel() has been requested"""
+        return self.cancel_event.is_set()
+    
+    def run_step(self, step: str, index: int, action: Callable[[], bool]) -> bool:
+        """Run one installation step, publishing its start and outcome"""
+        self.events.step_started(step, INSTALLATION_STEPS[index], index, len(INSTALLATION_STEPS) - 1)
+        if self.is_cancelled():
+            return False
+        ok = bool(action())
+        self.events.step_finished(step, ok)
+        return ok
+    
+    def perform_installation(self, configure_compatibility: bool = True,
+                             modify_shortcuts: bool = True) -> bool:
+        """
+        Run the installation steps in order, publishing progress events
+        Returns False and sets last_error if a required step fails or the
+        installation is cancelled
+        """
+        self.last_error = None
+        
+        if not self.skip_backup:
+            if not self.run_step("backup", 1, self.create_backup):
+                self.last_error = "Installation cancelled" if self.is_cancelled() else "Failed to create backup"
+                return False
+        
+        if not self.run_step("install", 2, self.install_patch_files):
+            self.last_error = "Installation cancelled" if self.is_cancelled() else "Failed to install patch files"
+            return False
+        
+        if configure_compatibility:
+            self.run_step("compatibility", 3, self.configure_compatibility)
+        
+        if modify_shortcuts:
+            self.run_step("shortcuts", 4, self.modify_shortcuts)
+        
+        if self.remove_briefings:
+            self.run_step("briefings", 5, self.remove_intro_briefings)
+        
+        if self.is_cancelled():
+            self.last_error = "Installation cancelled"
+            return False
+        
+        if self.prune_after_install and not self.skip_backup:
+            self.start_background_prune()
+        return True
+    
     def modify_shortcuts(self) -> bool:
         """Find and modify existing shortcuts to add -w flag"""
         if not self.game_path:
@@ -279,17 +640,7 @@ class RebellionFixInstaller:
     
     def check_existing_backups(self) -> List[str]:
         """Check for existing backup folders and return their names"""
-        if not self.game_path:
-            return []
-        
-        game_dir = Path(self.game_path)
-        backups = []
-        
-        for item in game_dir.iterdir():
-            if item.is_dir() and item.name.startswith("Backup_"):
-                backups.append(item.name)
-        
-        return sorted(backups, reverse=True)  # Most recent first
+        return [entry["folder"] for entry in self.get_backups()]  # Most recent first
     
     def configure_compatibility(self) -> bool:
         """Configure Windows compatibility settings for REBEXE.exe"""
@@ -357,52 +708,195 @@ class RebellionFixInstaller:
             self.logger.error(f"Failed to remove briefing files: {e}")
             return False
     
-    def restore_from_backup(self) -> bool:
-        """Restore game files from the most recent backup"""
+    def restore_from_backup(self, verify_only: bool = False, backup_id: Optional[str] = None) -> bool:
+        """
+        Restore game files from the backup with the given id, or the newest
+        backup of the original files (see select_backup)
+        Only files that differ from the backup (by size, then by digest) are
+        rewritten. With verify_only nothing is written; returns True only if
+        the game already matches the backup. A restore that leaves the game
+        patched fails. files_restored, files_unchanged and files_differing
+        report what was found.
+        """
         if not self.game_path:
             self.logger.error("Game path not set")
             return False
         
-        backup_folders = self.get_backup_folders()
-        if not backup_folders:
-            self.logger.error("No backup folders found")
+        self.wait_for_background_prune()
+        catalog = self.get_backup_catalog()
+        backup = self.select_backup(backup_id)
+        if backup is None:
+            if backup_id:
+                self.logger.error(f"Backup not found: {backup_id}")
+            else:
+                self.logger.error("No backup folders found")
             return False
         
-        # Use most recent backup
-        backup_dir = backup_folders[0]
+        # A pending install would be superseded by the restore
+        if not verify_only:
+            self.recover_interrupted_install(discard_staged=True)
+        
+        backup_dir = catalog.folder(backup)
         game_dir = Path(self.game_path)
+        self.logger.info(f"Using backup: {backup['folder']}")
+        self.files_restored = []
+        self.files_unchanged = []
+        self.files_differing = []
+        
+        store = BackupStore(game_dir)
+        # Files are restored into a staging folder and swapped into place, so
+        # an interrupted restore never leaves a half-written game file
+        staging_dir = game_dir / RESTORE_STAGING_DIR
+        checkpoint = CheckpointJournal(game_dir, "restore")
+        if checkpoint.pending and not verify_only:
+            self.logger.info("Resuming interrupted restore")
         
         try:
-            restored_files = []
-            for filename in BACKUP_FILES:
-                backup_file = backup_dir / filename
-                if backup_file.exists():
-                    dest_file = game_dir / filename
-                    shutil.copy2(backup_file, dest_file)
-                    restored_files.append(filename)
-                    self.logger.info(f"Restored: {filename}")
+            # Compare backed up files, including briefing files if they were backed up
+            copy_jobs = []
+            manifest_files = backup["files"]
+            archive = PayloadArchive(backup_dir / backup["archive"]) if backup.get("archive") else None
+            for filename in dict.fromkeys(BACKUP_FILES + ["ALBRIEF.dll", "EMBRIEF.dll"]):
+                if archive is not None:
+                    # Only the index is read here; members are streamed when restored
+                    backup_file = archive.path if filename in archive else None
+                else:
+                    backup_file = store.resolve(backup_dir, filename)
+                if backup_file is None and archive is None and filename in manifest_files:
+                    # The catalog knows the content even if the folder is gone
+                    object_file = store.object_path(manifest_files[filename]["sha256"])
+                    backup_file = object_file if object_file.exists() else None
+                if backup_file is None:
+                    if filename in manifest_files:
+                        raise Exception(f"Backed-up copy of {filename} is missing")
+                    continue
+                
+                expected = manifest_files.get(filename)
+                if not expected:
+                    # Backups made before manifests existed: digest the copy itself
+                    sha256, size = store.digest(backup_file)
+                    expected = {"sha256": sha256, "size": size}
+                
+                if self.matches_backup(store, game_dir / filename, expected):
+                    self.files_unchanged.append(filename)
+                    self.events.file_result(filename, "unchanged")
+                    continue
+                
+                self.files_differing.append(filename)
+                self.logger.info(f"Differs from backup: {filename}")
+                if verify_only:
+                    self.events.file_result(filename, "differs")
+                elif archive is not None:
+                    copy_jobs.append(CopyJob(
+                        archive.path, staging_dir / filename, filename, expected["size"], expected["sha256"],
+                        reader=lambda dest, progress, hasher, name=filename: archive.extract(name, dest, progress, hasher)))
+                else:
+                    copy_jobs.append(CopyJob(backup_file, staging_dir / filename, filename,
+                                             expected_sha256=expected["sha256"]))
+            
+            if verify_only:
+                store.save_stat_cache()
+                self.logger.info(f"Verified against backup: {len(self.files_unchanged)} unchanged, "
+                                 f"{len(self.files_differing)} differ")
+                return not self.files_differing
+            
+            if copy_jobs:
+                staging_dir.mkdir(exist_ok=True)
+            for job in self.create_copy_scheduler(checkpoint).run(copy_jobs):
+                if not job.ok:
+                    self.events.file_result(job.name, "failed", job.error or "")
+                    raise Exception(f"Failed to restore {job.name}: {job.error}")
+            
+            # Every file is staged and verified: swap them over the game files
+            for job in copy_jobs:
+                with open(job.dest, 'rb') as f:
+                    os.fsync(f.fileno())
+                os.replace(job.dest, game_dir / job.name)
+                self.files_restored.append(job.name)
+                self.logger.info(f"Restored: {job.name}")
+                self.events.file_result(job.name, "restored")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            
+            if not self.files_restored and not is_original_backup(backup):
+                self.logger.error(f"Backup {backup['id']} holds patched files; no original files to restore")
+                return False
             
-            # Restore briefing files if they were backed up
             for filename in ["ALBRIEF.dll", "EMBRIEF.dll"]:
-                backup_file = backup_dir / filename
-                if backup_file.exists():
-                    dest_file = game_dir / filename
-                    shutil.copy2(backup_file, dest_file)
-                    restored_files.append(filename)
-                    self.logger.info(f"Restored: {filename}")
-                
                 # Remove .backup version if it exists
                 backup_version = game_dir / f"{filename}.backup"
                 if backup_version.exists():
                     backup_version.unlink()
             
-            self.logger.info(f"Restored {len(restored_files)} files from backup")
+            store.save_stat_cache()
+            checkpoint.clear()
+            self.logger.info(f"Restored {len(self.files_restored)} files from backup, "
+                             f"{len(self.files_unchanged)} already matched")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to restore from backup: {e}")
             return False
     
+    def matches_backup(self, store: BackupStore, game_file: Path, expected: Dict) -> bool:
+        """Compare a game file with a backup manifest entry: size first, then cached digest"""
+        try:
+            if game_file.stat().st_size != expected["size"]:
+                return False
+            return store.digest(game_file)[0] == expected["sha256"]
+        except OSError:
+            return False
+    
+    def gc_backups(self) -> bool:
+        """Remove backup store objects no longer referenced by any backup"""
+        if not self.game_path:
+            self.logger.error("Game path not set")
+            return False
+        
+        self.wait_for_background_prune()
+        try:
+            removed, freed = BackupStore(self.game_path).gc()
+            self.logger.info(f"Backup gc removed {removed} object(s), freed {freed} bytes")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to clean up backup store: {e}")
+            return False
+    
+    def prune_backups(self, dry_run: bool = False,
+                      policy: Optional[RetentionPolicy] = None) -> Optional[PruneResult]:
+        """
+        Delete backups outside the retention policy (retention_policy unless
+        given), never the last original one; with dry_run only report them
+        Returns the result, or None on failure
+        """
+        if not self.game_path:
+            self.logger.error("Game path not set")
+            return None
+        
+        try:
+            result = prune_backups(self.game_path, policy or self.retention_policy, dry_run, self.cancel_event)
+            self.logger.info(f"Backup pruning {'would delete' if dry_run else 'deleted'} "
+                             f"{len(result.deleted)} backup(s), {result.bytes_before} -> {result.bytes_after} bytes")
+            return result
+        except Exception as e:
+            self.logger.error(f"Failed to prune backups: {e}")
+            return None
+    
+    def start_background_prune(self):
+        """
+        Prune backups on a worker thread so the install finishes without waiting
+        The thread is a daemon and stops on cancel(); pruning is safe to
+        interrupt, and callers that exit afterwards wait_for_background_prune
+        """
+        self.wait_for_background_prune()
+        self.prune_thread = threading.Thread(target=self.prune_backups, name="backup-prune", daemon=True)
+        self.prune_thread.start()
+    
+    def wait_for_background_prune(self):
+        """Let a background prune finish before touching the backups again"""
+        if self.prune_thread is not None:
+            self.prune_thread.join()
+            self.prune_thread = None
+    
     def check_permissions(self) -> bool:
         """Check if we have write permissions to the game directory"""
         if not self.game_path:
@@ -431,14 +925,14 @@ class RebellionFixInstaller:
     
     def is_game_running(self) -> bool:
         """Check if the game is currently running"""
-        try:
-            # Use tasklist to check for running processes
-            result = subprocess.run(
-                ["tasklist", "/FI", "IMAGENAME eq REBEXE.exe"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return "REBEXE.exe" in result.stdout
-        except Exception:
-            return False
+        return is_process_running(GAME_EXECUTABLE, self.process_backend)
+    
+    def wait_for_game_exit(self, timeout: Optional[float] = None,
+                           stop_event: Optional[threading.Event] = None) -> bool:
+        """Wait until the game has exited; False on timeout or stop request"""
+        self.logger.info("Waiting for the game to exit...")
+        if wait_for_exit(GAME_EXECUTABLE, timeout, self.process_backend, stop_event or self.cancel_event):
+            self.logger.info("Game has exited")
+            return True
+        self.logger.warning("Stopped waiting for the game to exit")
+        return False
@@ -5,11 +5,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        ('attached_assets/*.dll', 'attached_assets'),
-        ('attached_assets/*.EXE', 'attached_assets'),
-        ('attached_assets/*.exe', 'attached_assets'),
-        ('*.dll', '.'),
-        ('*.exe', '.'),
+        ('payload.rbpak', '.'),
+        ('deltas', 'deltas'),
     ],
     hiddenimports=[],
     hookspath=[],
@@ -10,12 +10,17 @@ Contributors:
 
 import sys
 import argparse
-import os
-from pathlib import Path
+from typing import Optional
 
 from gui import InstallerGUI
 from installer import RebellionFixInstaller
-from config import VERSION, PATCH_FILES
+from config import VERSION, FLEET_WORKERS, BACKUP_KEEP_LAST, BACKUP_KEEP_DAYS, BACKUP_MAX_BYTES
+from backup_retention import RetentionPolicy
+from events import CliProgressRenderer, JsonLinesEmitter
+from fingerprint import FingerprintDB, load_reference
+from watcher import PatchWatcher
+from fleet import FleetOptions, expand_targets, run_fleet, fleet_exit_code, format_summary, write_report
+from preflight import run_preflight, CHECK_PATCH_FILES, CHECK_PERMISSIONS, CHECK_GAME_RUNNING, CHECK_DISK_SPACE, CHECK_ALREADY_PATCHED
 
 
 def parse_arguments():
@@ -49,64 +54,258 @@ def parse_arguments():
         help='Skip backup creation'
     )
     
+    parser.add_argument(
+        '--targets',
+        type=str,
+        help='Install to many games: a file with one path per line, or a folder to search'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=FLEET_WORKERS,
+        help=f'Games installed to at the same time with --targets (default: {FLEET_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--report',
+        type=str,
+        help='Write a JSON report of a --targets run to this file'
+    )
+    
     parser.add_argument(
         '--uninstall',
         action='store_true',
         help='Uninstall patch and restore from backup'
     )
     
+    parser.add_argument(
+        '--list-backups',
+        action='store_true',
+        help='List the backups of the game installation'
+    )
+    
+    parser.add_argument(
+        '--restore',
+        type=str,
+        metavar='ID',
+        help='Uninstall by restoring the backup with this id (see --list-backups)'
+    )
+    
+    parser.add_argument(
+        '--verify-only',
+        action='store_true',
+        help='Compare game files with the latest backup without changing anything'
+    )
+    
+    parser.add_argument(
+        '--gc-backups',
+        action='store_true',
+        help='Remove backup store data no longer used by any backup'
+    )
+    
+    parser.add_argument(
+        '--prune-backups',
+        action='store_true',
+        help='Delete old backups outside the retention policy'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --prune-backups, only list the backups that would be deleted'
+    )
+    
+    parser.add_argument(
+        '--keep',
+        type=int,
+        default=BACKUP_KEEP_LAST,
+        help=f'Newest backups always kept (default: {BACKUP_KEEP_LAST})'
+    )
+    
+    parser.add_argument(
+        '--keep-days',
+        type=float,
+        default=BACKUP_KEEP_DAYS,
+        help=f'Backups younger than this many days are kept (default: {BACKUP_KEEP_DAYS})'
+    )
+    
+    parser.add_argument(
+        '--max-backup-mb',
+        type=int,
+        default=BACKUP_MAX_BYTES // (1024 * 1024),
+        help=f'Space backups may use, in MB; 0 for no limit (default: {BACKUP_MAX_BYTES // (1024 * 1024)})'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Reinstall patch files even if they are already up to date'
+    )
+    
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Re-read every copied file from disk to verify it was written correctly'
+    )
+    
+    parser.add_argument(
+        '--fast-copy',
+        action='store_true',
+        help='Let the system copy files directly instead of checksumming each copy'
+    )
+    
+    parser.add_argument(
+        '--archive-backup',
+        action='store_true',
+        help='Store the backup as a single compressed archive'
+    )
+    
+    parser.add_argument(
+        '--wait',
+        action='store_true',
+        help='If the game is running, wait for it to close and then install'
+    )
+    
+    parser.add_argument(
+        '--progress',
+        choices=['text', 'json'],
+        default='text',
+        help='Progress output: text meter or one JSON event per line'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and re-apply patch files that get reverted (e.g. by Steam)'
+    )
+    
+    parser.add_argument(
+        '--scan',
+        action='store_true',
+        help='Fingerprint the game directory and report files that changed'
+    )
+    
+    parser.add_argument(
+        '--reference',
+        type=str,
+        metavar='FILE',
+        help="With --scan, compare with this saved fingerprint file, or 'patched' for the patched build"
+    )
+    
+    parser.add_argument(
+        '--save-fingerprint',
+        type=str,
+        metavar='FILE',
+        help='With --scan, also save the fingerprint to this file for use as a reference'
+    )
+    
+    parser.add_argument(
+        '--rescan',
+        action='store_true',
+        help='Ignore cached game locations and search again'
+    )
+    
+    # With --progress json, stdout is kept for the event stream (see main())
+    parser.set_defaults(event_stream=sys.stdout)
+    
     return parser.parse_args()
 
 
+def retention_policy_from_args(args) -> RetentionPolicy:
+    """Build the backup retention policy from the command line"""
+    return RetentionPolicy(keep_last=args.keep, max_age_days=args.keep_days,
+                           max_bytes=args.max_backup_mb * 1024 * 1024)
+
+
+def subscribe_progress(installer, args):
+    """Send installer progress events to the console in the chosen format"""
+    if args.progress == 'json':
+        installer.events.subscribe(JsonLinesEmitter(args.event_stream))
+    else:
+        installer.events.subscribe(CliProgressRenderer())
+
+
+def resolve_game_path(installer, args) -> Optional[str]:
+    """
+    Set the installer's game path from --path, or by searching for the game
+    Prints the error and returns None if the path is invalid or nothing is found
+    """
+    if args.path:
+        if not installer.validate_game_path(args.path):
+            print(f"Error: Invalid game path: {args.path}")
+            return None
+        installer.game_path = args.path
+    else:
+        game_path = installer.find_game_installation()
+        if not game_path:
+            print("Error: Could not find Star Wars: Rebellion installation")
+            return None
+        installer.game_path = game_path
+    return installer.game_path
+
+
 def run_silent_install(args):
     """Run silent installation with command line arguments"""
     installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    subscribe_progress(installer, args)
     
     try:
         # Set options based on arguments
         installer.skip_backup = args.nobackup
         installer.remove_briefings = args.nobriefing
+        installer.force_reinstall = args.force
+        installer.verify_read_back = args.verify
+        installer.verify_copies = not args.fast_copy
+        installer.archive_backups = args.archive_backup
+        installer.retention_policy = retention_policy_from_args(args)
         
         # Find or set game path
-        if args.path:
-            if not installer.validate_game_path(args.path):
-                print(f"Error: Invalid game path: {args.path}")
-                return False
-            installer.game_path = args.path
-        else:
-            game_path = installer.find_game_installation()
-            if not game_path:
-                print("Error: Could not find Star Wars: Rebellion installation")
-                return False
-            installer.game_path = game_path
+        if not resolve_game_path(installer, args):
+            return False
         
         print(f"Installing to: {installer.game_path}")
         
-        # Check for patch files
-        if not installer.check_patch_files():
+        # Run all preflight checks at once
+        report = run_preflight(installer)
+        
+        if not report.ok(CHECK_PATCH_FILES):
             print("Error: Patch files not found. Please ensure patch files are in the same directory as this installer.")
             return False
         
-        # Run installation steps
-        if not args.nobackup:
-            print("Creating backup...")
-            if not installer.create_backup():
-                print("Error: Failed to create backup")
+        if not report.ok(CHECK_PERMISSIONS):
+            print("Error: Unable to write to the game directory. Try running as administrator.")
+            return False
+        
+        if not report.ok(CHECK_GAME_RUNNING):
+            if not args.wait:
+                print("Error: Star Wars: Rebellion is currently running. Please close the game first (or use --wait).")
+                return False
+            print("Waiting for Star Wars: Rebellion to close...")
+            if not installer.wait_for_game_exit():
+                print("Error: Stopped waiting before Star Wars: Rebellion closed.")
                 return False
         
-        print("Installing patch files...")
-        if not installer.install_patch_files():
-            print("Error: Failed to install patch files")
+        if not report.ok(CHECK_DISK_SPACE):
+            print("Error: Insufficient disk space for installation and backup.")
             return False
         
-        print("Configuring compatibility settings...")
-        installer.configure_compatibility()
+        if not report.ok(CHECK_ALREADY_PATCHED):
+            if args.force:
+                print("Note: The game appears to be already patched. Reinstalling.")
+            else:
+                print("Note: The game appears to be already patched. Files that are up to date will be skipped (use --force to reinstall).")
         
-        if args.nobriefing:
-            print("Removing briefing files...")
-            installer.remove_intro_briefings()
+        # Run installation steps (shortcuts are left alone in silent mode)
+        if not installer.perform_installation(configure_compatibility=True, modify_shortcuts=False):
+            print(f"Error: {installer.last_error}")
+            return False
+        if installer.files_skipped:
+            print(f"Skipped {len(installer.files_skipped)} file(s) already up to date")
         
         print("Installation completed successfully!")
+        installer.wait_for_background_prune()
         return True
         
     except Exception as e:
@@ -114,27 +313,82 @@ def run_silent_install(args):
         return False
 
 
+def run_fleet_install(args):
+    """Install to every game listed or found by --targets; returns the exit code"""
+    try:
+        targets = expand_targets(args.targets)
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    if not targets:
+        print(f"Error: No game installations found in {args.targets}")
+        return 1
+    
+    options = FleetOptions(
+        skip_backup=args.nobackup,
+        remove_briefings=args.nobriefing,
+        force_reinstall=args.force,
+        verify_read_back=args.verify,
+        verify_copies=not args.fast_copy,
+        archive_backups=args.archive_backup,
+        retention_policy=retention_policy_from_args(args),
+    )
+    if args.progress == 'json':
+        # Targets install concurrently, so only the JSON stream (tagged per target) is live
+        options.progress_subscriber = lambda path: JsonLinesEmitter(args.event_stream, target=path)
+    print(f"Installing to {len(targets)} target(s) with {args.workers} worker(s)...")
+    results = run_fleet(
+        targets, options, args.workers,
+        on_result=lambda result: print(f"  {result.status}: {result.path}")
+    )
+    
+    print()
+    print(format_summary(results))
+    if args.report:
+        try:
+            write_report(results, args.report)
+            print(f"Report written to: {args.report}")
+        except OSError as e:
+            print(f"Error: Could not write report: {e}")
+    
+    return fleet_exit_code(results)
+
+
 def run_uninstall(args):
     """Run uninstallation process"""
     installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    subscribe_progress(installer, args)
+    
+    installer.verify_read_back = args.verify
+    installer.verify_copies = not args.fast_copy
     
     try:
         # Find game path
-        if args.path:
-            if not installer.validate_game_path(args.path):
-                print(f"Error: Invalid game path: {args.path}")
-                return False
-            installer.game_path = args.path
-        else:
-            game_path = installer.find_game_installation()
-            if not game_path:
-                print("Error: Could not find Star Wars: Rebellion installation")
-                return False
-            installer.game_path = game_path
+        if not resolve_game_path(installer, args):
+            return False
+        
+        if args.verify_only:
+            print(f"Verifying against backup: {installer.game_path}")
+            if installer.restore_from_backup(verify_only=True, backup_id=args.restore):
+                print(f"All {len(installer.files_unchanged)} backed-up file(s) match the backup")
+                return True
+            if installer.files_differing:
+                print(f"{len(installer.files_differing)} file(s) differ from the backup: "
+                      f"{', '.join(installer.files_differing)}")
+            else:
+                print("Error: Failed to verify against backup")
+            return False
         
         print(f"Uninstalling from: {installer.game_path}")
         
-        if installer.restore_from_backup():
+        if installer.restore_from_backup(backup_id=args.restore):
+            if not installer.files_restored:
+                print("All files already match the original backup - nothing to uninstall")
+                return True
+            print(f"Restored {len(installer.files_restored)} file(s); "
+                  f"{len(installer.files_unchanged)} already matched the backup")
             print("Patch uninstalled successfully!")
             return True
         else:
@@ -146,17 +400,169 @@ def run_uninstall(args):
         return False
 
 
+def run_list_backups(args):
+    """Print the backup catalog of the game installation"""
+    installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    
+    if not resolve_game_path(installer, args):
+        return False
+    
+    backups = installer.get_backups()
+    if not backups:
+        print(f"No backups found in: {installer.game_path}")
+        return True
+    
+    print(f"Backups in: {installer.game_path} (most recent first)")
+    print(f"{'ID':<17}  {'Created':<19}  {'Version':<10}  {'Files':>5}  {'Size':>10}")
+    for backup in backups:
+        print(f"{backup['id']:<17}  {(backup['created'] or '?'):<19}  {(backup['installer_version'] or '?'):<10}  "
+              f"{len(backup['files']):>5}  {backup['size'] / (1024 * 1024):>7.1f} MB")
+    return True
+
+
+def run_prune_backups(args):
+    """Delete backups outside the retention policy, or just list them with --dry-run"""
+    installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    
+    if not resolve_game_path(installer, args):
+        return False
+    
+    result = installer.prune_backups(dry_run=args.dry_run, policy=retention_policy_from_args(args))
+    if result is None:
+        print("Error: Failed to prune backups")
+        return False
+    
+    action = "Would delete" if args.dry_run else "Deleted"
+    for backup_id in result.deleted:
+        print(f"  {action.lower()}: {backup_id}")
+    if result.protected:
+        print(f"  keeping original: {result.protected}")
+    print(f"{action} {len(result.deleted)} backup(s), keeping {len(result.kept)}; "
+          f"backups use {result.bytes_before / (1024 * 1024):.1f} MB -> {result.bytes_after / (1024 * 1024):.1f} MB")
+    return True
+
+
+def run_watch(args):
+    """Watch the patch files and re-apply any that get reverted, until interrupted"""
+    installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    subscribe_progress(installer, args)
+    installer.verify_read_back = args.verify
+    installer.verify_copies = not args.fast_copy
+    
+    if not resolve_game_path(installer, args):
+        return False
+    
+    if not installer.check_patch_files():
+        print("Error: Required patch files not found")
+        return False
+    
+    watcher = PatchWatcher(installer)
+    print(f"Watching patch files in {installer.game_path} (Ctrl+C to stop)...")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+    print(f"Stopped watching; re-applied the patch {watcher.repairs} time(s)")
+    return True
+
+
+def run_scan(args):
+    """
+    Fingerprint the game directory and diff it against a reference, or
+    against the previous scan. Returns 0 if nothing differs, 2 if files
+    differ and 1 on error.
+    """
+    installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    
+    if not resolve_game_path(installer, args):
+        return 1
+    
+    try:
+        db = FingerprintDB(installer.game_path)
+        if args.reference:
+            reference, partial = load_reference(args.reference)
+        else:
+            reference, partial = dict(db.records), False
+        had_previous = bool(db.records)
+        
+        stats = db.scan()
+        db.save()
+        if args.save_fingerprint:
+            db.save(args.save_fingerprint)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    
+    print(f"Scanned {installer.game_path}: {stats.files} file(s), {stats.hashed} hashed, {stats.seconds:.2f}s")
+    if not args.reference and not had_previous:
+        print("First scan recorded; later scans report changes since this one")
+        return 0
+    
+    diff = db.diff(reference, partial)
+    print(diff.format())
+    return 0 if diff.clean else 2
+
+
+def run_gc_backups(args):
+    """Remove unreferenced objects from the backup store"""
+    installer = RebellionFixInstaller()
+    installer.use_discovery_cache = not args.rescan
+    
+    if not resolve_game_path(installer, args):
+        return False
+    
+    print(f"Cleaning up backup store in: {installer.game_path}")
+    if installer.gc_backups():
+        print("Backup store cleaned up successfully!")
+        return True
+    print("Error: Failed to clean up backup store")
+    return False
+
+
 def main():
     """Main application entry point"""
+    args = parse_arguments()
+    
+    if args.progress == 'json':
+        # Keep stdout machine-readable: everything printed for people goes to stderr
+        sys.stdout = sys.stderr
+    
     # Check if running on Windows
     if sys.platform != 'win32':
         print("Note: This installer is designed for Windows. Running in demo mode on Linux.")
         print("Some features will be simulated for demonstration purposes.")
     
-    args = parse_arguments()
+    # Handle backup store cleanup
+    if args.gc_backups:
+        success = run_gc_backups(args)
+        sys.exit(0 if success else 1)
+    
+    if args.watch:
+        success = run_watch(args)
+        sys.exit(0 if success else 1)
+    
+    if args.scan:
+        sys.exit(run_scan(args))
+    
+    if args.prune_backups:
+        success = run_prune_backups(args)
+        sys.exit(0 if success else 1)
+    
+    # Handle fleet install
+    if args.targets:
+        sys.exit(run_fleet_install(args))
+    
+    # Handle backup listing
+    if args.list_backups:
+        success = run_list_backups(args)
+        sys.exit(0 if success else 1)
     
-    # Handle uninstall
-    if args.uninstall:
+    # Handle uninstall (or just verifying against the backup)
+    if args.uninstall or args.restore or args.verify_only:
         success = run_uninstall(args)
         sys.exit(0 if success else 1)
     
@@ -167,7 +573,7 @@ def main():
     
     # Run GUI application
     try:
-        app = InstallerGUI()
+        app = InstallerGUI(rescan=args.rescan)
         app.run()
     except Exception as e:
         print(f"Failed to start GUI: {str(e)}")
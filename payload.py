@@ -0,0 +1,152 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Patch payload lookup and manifest
+
+Locates the bundled patch files - members of the payload archive, or loose
+files in a development tree - and compares installed files against the
+payload manifest (size + SHA-256) so files that are already correct can be
+skipped. After an install, the verified digests of the files put in place
+are recorded in an install manifest in the game directory. Run this module
+to regenerate PATCH_FILE_HASHES for config.py.
+"""
+
+import os
+import sys
+import json
+import logging
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from hashing import hash_file
+from config import PATCH_FILES, PATCH_FILE_ASSET_NAMES, PATCH_FILE_HASHES, INSTALL_MANIFEST_FILE, VERSION, PAYLOAD_ARCHIVE
+from payload_archive import PayloadArchive, PayloadArchiveError
+
+
+def get_installer_dir() -> Path:
+    """Get the directory holding the bundled patch files"""
+    return Path(__file__).parent
+
+
+@lru_cache(maxsize=None)
+def get_payload_archive(installer_dir: Optional[Path] = None) -> Optional[PayloadArchive]:
+    """Open the bundled payload archive once; None if there is none"""
+    archive_path = (installer_dir or get_installer_dir()) / PAYLOAD_ARCHIVE
+    if not archive_path.exists():
+        return None
+    try:
+        return PayloadArchive(archive_path)
+    except (OSError, PayloadArchiveError) as e:
+        logging.getLogger('rebellion_installer').warning(f"Ignoring unreadable payload archive: {e}")
+        return None
+
+
+def payload_available(filename: str) -> bool:
+    """Whether a patch file can be installed, from the archive or a loose file"""
+    archive = get_payload_archive()
+    if archive is not None and filename in archive:
+        return True
+    return find_payload_source(filename) is not None
+
+
+def find_payload_source(filename: str, installer_dir: Optional[Path] = None) -> Optional[Path]:
+    """Find a loose patch file in the installer directory or attached_assets"""
+    installer_dir = installer_dir or get_installer_dir()
+
+    source_file = installer_dir / filename
+    if source_file.exists():
+        return source_file
+
+    assets_file = installer_dir / "attached_assets" / PATCH_FILE_ASSET_NAMES.get(filename, filename)
+    if assets_file.exists():
+        return assets_file
+
+    return None
+
+
+def sha256_file(file_path) -> str:
+    """Calculate the SHA-256 digest of a file"""
+    return hash_file(file_path, ("sha256",))["sha256"]
+
+
+def describe_file(file_path) -> Dict[str, object]:
+    """Build a manifest entry (size + SHA-256) for a file"""
+    return {"size": os.path.getsize(file_path), "sha256": sha256_file(file_path)}
+
+
+def get_expected_entry(filename: str) -> Optional[Dict[str, object]]:
+    """Get the manifest entry for a patch file, from config or the bundled file"""
+    entry = PATCH_FILE_HASHES.get(filename)
+    if entry:
+        return entry
+
+    source_file = find_payload_source(filename)
+    if source_file is None:
+        return None
+    return describe_file(source_file)
+
+
+def file_matches(file_path, expected: Dict[str, object]) -> bool:
+    """Check a file against a manifest entry: size first, digest only if sizes agree"""
+    try:
+        if os.path.getsize(file_path) != expected["size"]:
+            return False
+        return sha256_file(file_path) == expected["sha256"]
+    except OSError:
+        return False
+
+
+def build_payload_manifest(installer_dir: Optional[Path] = None) -> Dict[str, Dict[str, object]]:
+    """Build the manifest for all patch files"""
+    manifest = {}
+    for filename in PATCH_FILES:
+        source_file = find_payload_source(filename, installer_dir)
+        if source_file is None:
+            raise FileNotFoundError(f"Patch file not found: {filename}")
+        manifest[filename] = describe_file(source_file)
+    return manifest
+
+
+def format_manifest(manifest: Dict[str, Dict[str, object]]) -> str:
+    """Format a manifest as the PATCH_FILE_HASHES block in config.py"""
+    lines = ["PATCH_FILE_HASHES = {"]
+    for filename, entry in manifest.items():
+        lines.append(f'    "{filename}": {{')
+        lines.append(f'        "size": {entry["size"]},')
+        lines.append(f'        "sha256": "{entry["sha256"]}",')
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def write_install_manifest(game_dir, files: Dict[str, Dict[str, object]], read_back: bool = False):
+    """
+    Record the installed patch files in the game directory.
+    files maps file name to {"sha256", "size", "method"}.
+    """
+    manifest = {
+        "installed": datetime.now().isoformat(timespec="seconds"),
+        "installer_version": VERSION,
+        "read_back_verified": read_back,
+        "files": files,
+    }
+    manifest_file = Path(game_dir) / INSTALL_MANIFEST_FILE
+    tmp_file = manifest_file.with_suffix(".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, manifest_file)
+
+
+def read_install_manifest(game_dir) -> Optional[dict]:
+    """Load the install manifest written by the last installation, if any"""
+    try:
+        with open(Path(game_dir) / INSTALL_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == '__main__':
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(format_manifest(build_payload_manifest(directory)))
@@ -0,0 +1,240 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Indexed compressed payload archive
+
+All patch files ship in one archive: a fixed header, then a fixed-size
+index entry per member (name, compression, data offset, sizes, SHA-256),
+then the compressed member data. Opening the archive reads the header and
+index in one go, so member lookup is a dict hit, and members are
+decompressed straight to their destination and verified as they stream.
+Run this module to build the archive from the loose patch files. Archived
+backups use the same format.
+"""
+
+import os
+import sys
+import lzma
+import zlib
+import shutil
+import struct
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config import COPY_BUFFER_SIZE, PAYLOAD_ARCHIVE
+
+MAGIC = b"RBPAK\x00\x00\x01"
+# magic, member count
+HEADER = struct.Struct("<8sI")
+# name, method, data offset, stored size, size, sha256
+ENTRY = struct.Struct("<64sBQQQ32s")
+
+METHOD_STORE = 0
+METHOD_ZLIB = 1
+METHOD_LZMA = 2
+
+COMPRESSORS = {
+    "zlib": (METHOD_ZLIB, lambda: zlib.compressobj(9)),
+    "lzma": (METHOD_LZMA, lambda: lzma.LZMACompressor(preset=9 | lzma.PRESET_EXTREME)),
+}
+
+
+class PayloadArchiveError(Exception):
+    """Raised for a malformed archive or a member that fails verification"""
+
+
+@dataclass
+class ArchiveMember:
+    """One file in the archive"""
+    name: str
+    method: int
+    offset: int
+    stored_size: int
+    size: int
+    sha256: str
+
+
+class PayloadArchive:
+    """Read-only access to a payload archive"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.members: Dict[str, ArchiveMember] = {}
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise PayloadArchiveError("Truncated payload archive")
+            magic, count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise PayloadArchiveError("Not a payload archive")
+
+            index = f.read(ENTRY.size * count)
+            if len(index) != ENTRY.size * count:
+                raise PayloadArchiveError("Truncated payload archive index")
+            for name, method, offset, stored_size, size, sha256 in ENTRY.iter_unpack(index):
+                member = ArchiveMember(name.rstrip(b"\0").decode("utf-8"), method, offset,
+                                       stored_size, size, sha256.hex())
+                self.members[member.name] = member
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def member(self, name: str) -> ArchiveMember:
+        try:
+            return self.members[name]
+        except KeyError:
+            raise PayloadArchiveError(f"{name} is not in the payload archive")
+
+    def _iter_data(self, member: ArchiveMember) -> Iterator[bytes]:
+        """Yield a member's uncompressed data"""
+        if member.method == METHOD_ZLIB:
+            decompressor = zlib.decompressobj()
+        elif member.method == METHOD_LZMA:
+            decompressor = lzma.LZMADecompressor()
+        elif member.method == METHOD_STORE:
+            decompressor = None
+        else:
+            raise PayloadArchiveError(f"Unknown compression method {member.method} for {member.name}")
+
+        with open(self.path, 'rb') as f:
+            f.seek(member.offset)
+            remaining = member.stored_size
+            while remaining:
+                data = f.read(min(COPY_BUFFER_SIZE, remaining))
+                if not data:
+                    raise PayloadArchiveError(f"Payload archive truncated in {member.name}")
+                remaining -= len(data)
+                yield decompressor.decompress(data) if decompressor else data
+            if member.method == METHOD_ZLIB:
+                yield decompressor.flush()
+
+    def extract(self, name: str, dest, progress: Optional[Callable[[int], None]] = None,
+                hasher=None) -> str:
+        """
+        Stream a member to dest, verifying its size and SHA-256.
+        progress and hasher work as in file_copy.copy_file.
+        """
+        member = self.member(name)
+        digest = hashlib.sha256()
+        written = 0
+        with open(dest, 'wb') as out:
+            for chunk in self._iter_data(member):
+                if not chunk:
+                    continue
+                out.write(chunk)
+                digest.update(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                written += len(chunk)
+                if progress:
+                    progress(len(chunk))
+
+        if written != member.size or digest.hexdigest() != member.sha256:
+            raise PayloadArchiveError(f"{name} in the payload archive is corrupt")
+        return "archive"
+
+    def verify(self, name: str) -> bool:
+        """Decompress a member without writing it and check its size and SHA-256"""
+        member = self.member(name)
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in self._iter_data(member):
+            digest.update(chunk)
+            size += len(chunk)
+        return size == member.size and digest.hexdigest() == member.sha256
+
+
+def _write_member(out, name: str, path: Path, method: str,
+                  progress: Optional[Callable[[int], None]]) -> ArchiveMember:
+    """
+    Compress one file into out as it is read, hashing it on the way. If
+    compression did not make it smaller the member is rewritten uncompressed,
+    which is the only case where the source is read twice.
+    """
+    method_id, new_compressor = COMPRESSORS[method]
+    compressor = new_compressor()
+    offset = out.tell()
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+            out.write(compressor.compress(chunk))
+            if progress:
+                progress(len(chunk))
+        out.write(compressor.flush())
+
+        if out.tell() - offset >= size:
+            method_id = METHOD_STORE
+            out.seek(offset)
+            out.truncate()
+            f.seek(0)
+            shutil.copyfileobj(f, out, COPY_BUFFER_SIZE)
+
+    return ArchiveMember(name, method_id, offset, out.tell() - offset, size, digest.hexdigest())
+
+
+def _write_index(out, members: List[ArchiveMember]):
+    out.seek(0)
+    out.write(HEADER.pack(MAGIC, len(members)))
+    for member in members:
+        encoded_name = member.name.encode("utf-8")
+        if len(encoded_name) > 64:
+            raise PayloadArchiveError(f"Member name too long: {member.name}")
+        out.write(ENTRY.pack(encoded_name, member.method, member.offset, member.stored_size,
+                             member.size, bytes.fromhex(member.sha256)))
+
+
+def build_archive(files: Dict[str, Path], output, method: str = "lzma",
+                  progress: Optional[Callable[[int], None]] = None) -> List[ArchiveMember]:
+    """
+    Pack {member name: file} into an archive in one streaming pass: the
+    index space is reserved up front and filled in once every member is
+    written. A member is stored uncompressed when compression would not
+    make it smaller. progress, if given, is called with each chunk's size.
+    """
+    members = []
+    data_offset = HEADER.size + ENTRY.size * len(files)
+
+    tmp_output = Path(output).with_suffix(".tmp")
+    try:
+        with open(tmp_output, 'wb') as out:
+            out.seek(data_offset)
+            for name, path in files.items():
+                members.append(_write_member(out, name, path, method, progress))
+            _write_index(out, members)
+            out.flush()
+            os.fsync(out.fileno())
+    except Exception:
+        try:
+            tmp_output.unlink()
+        except OSError:
+            pass
+        raise
+    os.replace(tmp_output, output)
+    return members
+
+
+if __name__ == '__main__':
+    from config import PATCH_FILES
+    from payload import find_payload_source
+
+    source_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    output_file = sys.argv[2] if len(sys.argv) > 2 else PAYLOAD_ARCHIVE
+    sources = {}
+    for filename in PATCH_FILES:
+        source = find_payload_source(filename, source_dir)
+        if source is None:
+            sys.exit(f"Patch file not found: {filename}")
+        sources[filename] = source
+
+    total_size = 0
+    for built in build_archive(sources, output_file):
+        total_size += built.size
+        print(f"  {built.name:<12} {built.size:>9} -> {built.stored_size:>9} bytes")
+    print(f"Wrote {output_file}: {total_size} -> {os.path.getsize(output_file)} bytes")
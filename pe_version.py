@@ -0,0 +1,125 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Pure-Python PE version-resource reader
+
+Memory-maps a PE image and walks the headers straight to the RT_VERSION
+resource, touching only the pages that hold the headers, the resource
+directory and VS_FIXEDFILEINFO. Works identically on every platform.
+"""
+
+import mmap
+import struct
+from typing import Optional, Tuple
+
+RT_VERSION = 16
+RESOURCE_DIRECTORY_INDEX = 2
+VS_FIXEDFILEINFO_SIGNATURE = 0xFEEF04BD
+SUBDIRECTORY_FLAG = 0x80000000
+
+# Bound on how far into the version resource the fixed info may start
+FIXED_INFO_SEARCH_LIMIT = 256
+
+
+class PEFormatError(Exception):
+    """Raised when a file is not a PE image or has no version resource"""
+
+
+def _rva_to_offset(sections, rva: int) -> int:
+    for virtual_address, virtual_size, raw_size, raw_pointer in sections:
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return raw_pointer + (rva - virtual_address)
+    raise PEFormatError(f"RVA 0x{rva:x} is outside all sections")
+
+
+def _first_entry(view, directory_offset: int, wanted_id: Optional[int] = None) -> int:
+    """
+    Return OffsetToData of a resource directory entry: the entry with
+    wanted_id, or the first entry if wanted_id is None
+    """
+    named, ids = struct.unpack_from("<HH", view, directory_offset + 12)
+    entries_offset = directory_offset + 16
+    for index in range(named + ids):
+        name, offset_to_data = struct.unpack_from("<II", view, entries_offset + index * 8)
+        if wanted_id is None or (index >= named and name == wanted_id):
+            return offset_to_data
+    raise PEFormatError("Resource entry not found")
+
+
+def _read_fixed_file_info(view) -> Tuple[int, int, int, int]:
+    if view[:2] != b"MZ":
+        raise PEFormatError("Missing MZ header")
+
+    pe_offset = struct.unpack_from("<I", view, 0x3C)[0]
+    if view[pe_offset:pe_offset + 4] != b"PE\0\0":
+        raise PEFormatError("Missing PE signature")
+
+    coff_offset = pe_offset + 4
+    section_count, = struct.unpack_from("<H", view, coff_offset + 2)
+    optional_size, = struct.unpack_from("<H", view, coff_offset + 16)
+    optional_offset = coff_offset + 20
+
+    magic, = struct.unpack_from("<H", view, optional_offset)
+    if magic == 0x10B:
+        data_directories = optional_offset + 96
+    elif magic == 0x20B:
+        data_directories = optional_offset + 112
+    else:
+        raise PEFormatError(f"Unknown optional header magic 0x{magic:x}")
+
+    resource_rva, resource_size = struct.unpack_from("<II", view, data_directories + RESOURCE_DIRECTORY_INDEX * 8)
+    if not resource_rva or not resource_size:
+        raise PEFormatError("No resource directory")
+
+    sections = []
+    section_table = optional_offset + optional_size
+    for index in range(section_count):
+        virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from(
+            "<IIII", view, section_table + index * 40 + 8
+        )
+        sections.append((virtual_address, virtual_size, raw_size, raw_pointer))
+
+    resource_base = _rva_to_offset(sections, resource_rva)
+
+    # Type (RT_VERSION) -> name (first) -> language (first) -> data entry
+    offset = _first_entry(view, resource_base, RT_VERSION)
+    for _ in range(2):
+        if not offset & SUBDIRECTORY_FLAG:
+            break
+        offset = _first_entry(view, resource_base + (offset & ~SUBDIRECTORY_FLAG))
+    if offset & SUBDIRECTORY_FLAG:
+        raise PEFormatError("Malformed version resource directory")
+
+    data_rva, data_size = struct.unpack_from("<II", view, resource_base + offset)
+    data_offset = _rva_to_offset(sections, data_rva)
+
+    # VS_VERSIONINFO header and key precede the 32-bit aligned fixed info
+    signature = struct.pack("<I", VS_FIXEDFILEINFO_SIGNATURE)
+    fixed_offset = view.find(signature, data_offset, data_offset + min(data_size, FIXED_INFO_SEARCH_LIMIT))
+    if fixed_offset == -1:
+        raise PEFormatError("VS_FIXEDFILEINFO not found")
+
+    file_version_ms, file_version_ls = struct.unpack_from("<II", view, fixed_offset + 8)
+    return (
+        file_version_ms >> 16,
+        file_version_ms & 0xFFFF,
+        file_version_ls >> 16,
+        file_version_ls & 0xFFFF,
+    )
+
+
+def read_file_version(file_path: str) -> Tuple[int, int, int, int]:
+    """
+    Read the FileVersion of a PE image as a comparable
+    (major, minor, build, revision) tuple
+    """
+    with open(file_path, "rb") as f:
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise PEFormatError("File is empty")
+        try:
+            return _read_fixed_file_info(view)
+        except struct.error:
+            raise PEFormatError("Truncated PE image")
+        finally:
+            view.close()
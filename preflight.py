@@ -0,0 +1,146 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Concurrent preflight checks
+
+Runs every pre-installation check at once on a thread pool and returns a
+single report, so preflight takes as long as the slowest check rather than
+the sum of all of them.
+"""
+
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from config import MIN_DISK_SPACE, GAME_EXECUTABLE
+
+# Check names, in the order results are presented to the user
+CHECK_GAME_PATH = "game_path"
+CHECK_PATCH_FILES = "patch_files"
+CHECK_ALREADY_PATCHED = "already_patched"
+CHECK_PERMISSIONS = "permissions"
+CHECK_GAME_RUNNING = "game_running"
+CHECK_DISK_SPACE = "disk_space"
+
+CHECK_DESCRIPTIONS = {
+    CHECK_GAME_PATH: "Game installation path",
+    CHECK_PATCH_FILES: "Patch files available",
+    CHECK_ALREADY_PATCHED: "Game not already patched",
+    CHECK_PERMISSIONS: "Write permission to game folder",
+    CHECK_GAME_RUNNING: "Game not running",
+    CHECK_DISK_SPACE: "Free disk space",
+}
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a single preflight check"""
+    name: str
+    ok: bool
+    value: Any = None
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class PreflightReport:
+    """Results of all preflight checks"""
+    checks: Dict[str, CheckResult] = field(default_factory=dict)
+    total_time: float = 0.0
+
+    def __getitem__(self, name: str) -> CheckResult:
+        return self.checks[name]
+
+    def ok(self, name: str) -> bool:
+        """Whether a check passed (missing checks count as passed)"""
+        result = self.checks.get(name)
+        return result is None or result.ok
+
+    @property
+    def passed(self) -> bool:
+        return all(result.ok for result in self.checks.values())
+
+    def failures(self) -> List[CheckResult]:
+        return [result for result in self.checks.values() if not result.ok]
+
+    def format(self) -> str:
+        """Human-readable summary with per-check timings"""
+        lines = []
+        for result in self.checks.values():
+            status = "OK  " if result.ok else "FAIL"
+            description = CHECK_DESCRIPTIONS.get(result.name, result.name)
+            line = f"[{status}] {description} ({result.duration * 1000:.0f} ms)"
+            if result.error:
+                line += f" - {result.error}"
+            lines.append(line)
+        lines.append(f"Preflight completed in {self.total_time * 1000:.0f} ms")
+        return "\n".join(lines)
+
+
+def build_checks(installer, min_disk_space: int = MIN_DISK_SPACE) -> Dict[str, Callable[[], CheckResult]]:
+    """
+    Build the standard set of checks for an installer instance. The checks
+    run concurrently, so they only read installer state.
+    """
+
+    def game_path():
+        valid = bool(installer.game_path) and (Path(installer.game_path) / GAME_EXECUTABLE).exists()
+        return CheckResult(CHECK_GAME_PATH, valid, installer.game_path)
+
+    def patch_files():
+        return CheckResult(CHECK_PATCH_FILES, installer.check_patch_files())
+
+    def already_patched():
+        patched = installer.is_already_patched()
+        return CheckResult(CHECK_ALREADY_PATCHED, not patched, patched)
+
+    def permissions():
+        return CheckResult(CHECK_PERMISSIONS, installer.check_permissions())
+
+    def game_running():
+        running = installer.is_game_running()
+        return CheckResult(CHECK_GAME_RUNNING, not running, running)
+
+    def disk_space():
+        free_space = installer.get_disk_space()
+        return CheckResult(CHECK_DISK_SPACE, free_space >= min_disk_space, free_space)
+
+    return {
+        CHECK_GAME_PATH: game_path,
+        CHECK_PATCH_FILES: patch_files,
+        CHECK_ALREADY_PATCHED: already_patched,
+        CHECK_PERMISSIONS: permissions,
+        CHECK_GAME_RUNNING: game_running,
+        CHECK_DISK_SPACE: disk_space,
+    }
+
+
+def _timed(name: str, check: Callable[[], CheckResult]) -> CheckResult:
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        result = CheckResult(name, False, error=str(e))
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def run_checks(checks: Dict[str, Callable[[], CheckResult]]) -> PreflightReport:
+    """Run checks concurrently and collect them into a report"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(checks))) as executor:
+        futures = {name: executor.submit(_timed, name, check) for name, check in checks.items()}
+        report = PreflightReport({name: future.result() for name, future in futures.items()})
+    report.total_time = time.perf_counter() - start
+    return report
+
+
+def run_preflight(installer, min_disk_space: int = MIN_DISK_SPACE) -> PreflightReport:
+    """Run all standard preflight checks for an installer instance"""
+    report = run_checks(build_checks(installer, min_disk_space))
+    installer.logger.info("Preflight results:\n" + report.format())
+    if report.ok(CHECK_GAME_PATH):
+        # Record the Steam flag and cache the location once the checks are done
+        installer.validate_game_path(installer.game_path)
+    return report
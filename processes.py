@@ -0,0 +1,250 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Native process inspection
+
+Enumerates processes without spawning tasklist: a Toolhelp snapshot on
+Windows, a /proc scan on Linux/Wine and an in-memory fake for tests.
+wait_for_exit blocks on the process handle (WaitForSingleObject / pidfd)
+so the installer can start as soon as the game closes.
+"""
+
+import os
+import sys
+import time
+import select
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+# Length of each kernel wait, so a stop request is honoured promptly
+WAIT_SLICE = 0.5
+
+
+def _image_name(path: str) -> str:
+    """Get the lower-case image name from a Windows or POSIX path"""
+    return path.replace('\\', '/').rsplit('/', 1)[-1].lower()
+
+
+class ProcessBackend(ABC):
+    """Base process backend"""
+
+    @abstractmethod
+    def find_pids(self, image_name: str) -> List[int]:
+        """Get the ids of all processes running the given image"""
+
+    def wait_pid(self, pid: int, timeout: float) -> bool:
+        """Wait up to timeout seconds for a process to exit; True if it has"""
+        deadline = time.monotonic() + timeout
+        while pid in self.find_pids_any():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(0.1, remaining))
+        return True
+
+    def find_pids_any(self) -> List[int]:
+        return []
+
+    def is_running(self, image_name: str) -> bool:
+        return bool(self.find_pids(image_name))
+
+
+class ToolhelpBackend(ProcessBackend):
+    """Windows backend using a Toolhelp32 snapshot via ctypes"""
+
+    TH32CS_SNAPPROCESS = 0x00000002
+    SYNCHRONIZE = 0x00100000
+    WAIT_OBJECT_0 = 0x00000000
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", wintypes.LONG),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        self._ctypes = ctypes
+        self._entry_type = PROCESSENTRY32W
+        self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self._kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+
+    def _snapshot(self) -> Dict[int, str]:
+        ctypes = self._ctypes
+        snapshot = self._kernel32.CreateToolhelp32Snapshot(self.TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == ctypes.c_void_p(-1).value:
+            raise OSError(ctypes.get_last_error(), "CreateToolhelp32Snapshot failed")
+
+        processes = {}
+        try:
+            entry = self._entry_type()
+            entry.dwSize = ctypes.sizeof(entry)
+            more = self._kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while more:
+                processes[entry.th32ProcessID] = entry.szExeFile
+                more = self._kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            self._kernel32.CloseHandle(snapshot)
+        return processes
+
+    def find_pids(self, image_name: str) -> List[int]:
+        wanted = image_name.lower()
+        return [pid for pid, name in self._snapshot().items() if name.lower() == wanted]
+
+    def find_pids_any(self) -> List[int]:
+        return list(self._snapshot())
+
+    def wait_pid(self, pid: int, timeout: float) -> bool:
+        handle = self._kernel32.OpenProcess(self.SYNCHRONIZE, False, pid)
+        if not handle:
+            # Already gone (or not ours to open) - fall back to polling
+            return super().wait_pid(pid, timeout)
+        try:
+            result = self._kernel32.WaitForSingleObject(handle, int(timeout * 1000))
+            return result == self.WAIT_OBJECT_0
+        finally:
+            self._kernel32.CloseHandle(handle)
+
+
+class ProcfsBackend(ProcessBackend):
+    """Linux/Wine backend scanning /proc"""
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+
+    def _matches(self, pid_dir: str, wanted: str) -> bool:
+        try:
+            with open(os.path.join(pid_dir, "cmdline"), "rb") as f:
+                argv0 = f.read().split(b"\0", 1)[0].decode("utf-8", "replace")
+            if argv0 and _image_name(argv0) == wanted:
+                return True
+            # Wine shows the Windows image name as comm (max 15 chars)
+            with open(os.path.join(pid_dir, "comm"), "r", encoding="utf-8", errors="replace") as f:
+                return f.read().strip().lower() == wanted[:15]
+        except OSError:
+            return False
+
+    def find_pids(self, image_name: str) -> List[int]:
+        wanted = image_name.lower()
+        pids = []
+        try:
+            with os.scandir(self.proc_root) as entries:
+                for entry in entries:
+                    if entry.name.isdigit() and self._matches(entry.path, wanted):
+                        pids.append(int(entry.name))
+        except OSError:
+            pass
+        return pids
+
+    def find_pids_any(self) -> List[int]:
+        try:
+            return [int(name) for name in os.listdir(self.proc_root) if name.isdigit()]
+        except OSError:
+            return []
+
+    def wait_pid(self, pid: int, timeout: float) -> bool:
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is None or self.proc_root != "/proc":
+            return super().wait_pid(pid, timeout)
+        try:
+            fd = pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return super().wait_pid(pid, timeout)
+        try:
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            return bool(poller.poll(int(timeout * 1000)))
+        finally:
+            os.close(fd)
+
+
+class FakeProcessBackend(ProcessBackend):
+    """In-memory backend for tests: {pid: image_name}"""
+
+    def __init__(self, processes: Optional[Dict[int, str]] = None):
+        self.processes = dict(processes or {})
+        self._changed = threading.Condition()
+
+    def start(self, pid: int, image_name: str):
+        with self._changed:
+            self.processes[pid] = image_name
+            self._changed.notify_all()
+
+    def exit(self, pid: int):
+        with self._changed:
+            self.processes.pop(pid, None)
+            self._changed.notify_all()
+
+    def find_pids(self, image_name: str) -> List[int]:
+        wanted = image_name.lower()
+        with self._changed:
+            return [pid for pid, name in self.processes.items() if _image_name(name) == wanted]
+
+    def find_pids_any(self) -> List[int]:
+        with self._changed:
+            return list(self.processes)
+
+    def wait_pid(self, pid: int, timeout: float) -> bool:
+        with self._changed:
+            return self._changed.wait_for(lambda: pid not in self.processes, timeout)
+
+
+def get_process_backend() -> ProcessBackend:
+    """Get the native process backend for the current platform"""
+    if sys.platform == 'win32':
+        try:
+            return ToolhelpBackend()
+        except (OSError, AttributeError, ImportError):
+            pass
+    return ProcfsBackend()
+
+
+def is_process_running(image_name: str, backend: Optional[ProcessBackend] = None) -> bool:
+    """Check if a process with the given image name is running"""
+    backend = backend or get_process_backend()
+    try:
+        return backend.is_running(image_name)
+    except OSError:
+        return False
+
+
+def wait_for_exit(image_name: str, timeout: Optional[float] = None,
+                  backend: Optional[ProcessBackend] = None,
+                  stop_event: Optional[threading.Event] = None) -> bool:
+    """
+    Block until no process with the given image name is running.
+    Returns True once they have all exited, False on timeout or stop request.
+    """
+    backend = backend or get_process_backend()
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while True:
+        pids = backend.find_pids(image_name)
+        if not pids:
+            return True
+
+        for pid in pids:
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                wait = WAIT_SLICE
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                if backend.wait_pid(pid, wait):
+                    break
@@ -0,0 +1,382 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Steam and GOG library manifest readers
+
+Resolves storefront installs straight from the launcher's own records
+(Steam libraryfolders.vdf / appmanifest_*.acf, GOG registry keys and the
+Galaxy database) instead of probing the filesystem. Registry access goes
+through a swappable backend so the lookups can run against fixture files.
+"""
+
+import os
+import sys
+import json
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    STEAM_APP_ID, STEAM_REGISTRY_KEYS, GOG_REGISTRY_KEYS,
+    GOG_GALAXY_DB, STOREFRONT_TITLE_KEYWORDS
+)
+
+logger = logging.getLogger('rebellion_installer')
+
+
+@dataclass(frozen=True)
+class StorefrontInstall:
+    """An install directory resolved from a storefront record"""
+    path: str
+    storefront: str  # "steam" or "gog"
+
+
+# ---------------------------------------------------------------------------
+# Registry backends
+# ---------------------------------------------------------------------------
+
+class RegistryBackend:
+    """Read-only registry access; key paths look like r"HKLM\\SOFTWARE\\..." """
+
+    def subkeys(self, key_path: str) -> List[str]:
+        return []
+
+    def values(self, key_path: str) -> Dict[str, str]:
+        return {}
+
+
+class WindowsRegistryBackend(RegistryBackend):
+    """Registry backend using winreg"""
+
+    def _open(self, key_path: str):
+        import winreg
+        hive_name, _, sub_key = key_path.partition("\\")
+        hives = {
+            "HKLM": winreg.HKEY_LOCAL_MACHINE,
+            "HKCU": winreg.HKEY_CURRENT_USER,
+        }
+        return winreg.OpenKey(hives[hive_name.upper()], sub_key)
+
+    def subkeys(self, key_path: str) -> List[str]:
+        import winreg
+        names = []
+        try:
+            with self._open(key_path) as key:
+                index = 0
+                while True:
+                    try:
+                        names.append(winreg.EnumKey(key, index))
+                    except OSError:
+                        break
+                    index += 1
+        except (OSError, KeyError):
+            pass
+        return names
+
+    def values(self, key_path: str) -> Dict[str, str]:
+        import winreg
+        result = {}
+        try:
+            with self._open(key_path) as key:
+                index = 0
+                while True:
+                    try:
+                        name, value, _ = winreg.EnumValue(key, index)
+                    except OSError:
+                        break
+                    result[name] = str(value)
+                    index += 1
+        except (OSError, KeyError):
+            pass
+        return result
+
+
+class FixtureRegistryBackend(RegistryBackend):
+    """
+    Registry backend backed by a dict or JSON file of the form
+    {"HKLM\\\\SOFTWARE\\\\GOG.com\\\\Games\\\\123": {"path": "..."}}
+    """
+
+    def __init__(self, data):
+        if isinstance(data, (str, Path)):
+            with open(data, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        self.data = {k.lower(): v for k, v in data.items()}
+
+    def subkeys(self, key_path: str) -> List[str]:
+        prefix = key_path.lower().rstrip("\\") + "\\"
+        names = []
+        for key in self.data:
+            if key.startswith(prefix):
+                name = key[len(prefix):].split("\\", 1)[0]
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def values(self, key_path: str) -> Dict[str, str]:
+        return dict(self.data.get(key_path.lower().rstrip("\\"), {}))
+
+
+def get_registry_backend() -> RegistryBackend:
+    """Get the registry backend for the current platform"""
+    if sys.platform == 'win32':
+        return WindowsRegistryBackend()
+    return RegistryBackend()
+
+
+# ---------------------------------------------------------------------------
+# Valve KeyValues (VDF / ACF)
+# ---------------------------------------------------------------------------
+
+def _tokenize_vdf(text: str):
+    """Yield tokens from a KeyValues document: strings, '{' and '}'"""
+    i = 0
+    length = len(text)
+    while i < length:
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c == '/' and text.startswith('//', i):
+            end = text.find('\n', i)
+            i = length if end == -1 else end
+        elif c in '{}':
+            yield c
+            i += 1
+        elif c == '"':
+            i += 1
+            chars = []
+            while i < length and text[i] != '"':
+                if text[i] == '\\' and i + 1 < length:
+                    i += 1
+                    chars.append({'n': '\n', 't': '\t'}.get(text[i], text[i]))
+                else:
+                    chars.append(text[i])
+                i += 1
+            i += 1
+            yield ''.join(chars)
+        else:
+            start = i
+            while i < length and not text[i].isspace() and text[i] not in '{}"':
+                i += 1
+            yield text[start:i]
+
+
+def parse_vdf(text: str) -> dict:
+    """Parse a Valve KeyValues document into nested dicts (keys lower-cased)"""
+    root = {}
+    stack = [root]
+    key = None
+    for token in _tokenize_vdf(text):
+        if token == '{':
+            child = {}
+            stack[-1][(key or '').lower()] = child
+            stack.append(child)
+            key = None
+        elif token == '}':
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = token
+        else:
+            stack[-1][key.lower()] = token
+            key = None
+    return root
+
+
+def _read_vdf(path: Path) -> Optional[dict]:
+    try:
+        return parse_vdf(path.read_text(encoding='utf-8', errors='replace'))
+    except OSError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Steam
+# ---------------------------------------------------------------------------
+
+def find_steam_roots(registry: Optional[RegistryBackend] = None) -> List[Path]:
+    """Get candidate Steam client directories"""
+    registry = registry or get_registry_backend()
+    roots = []
+    for key_path, value_name in STEAM_REGISTRY_KEYS:
+        value = registry.values(key_path).get(value_name)
+        if value:
+            roots.append(Path(value))
+
+    if sys.platform != 'win32':
+        home = Path.home()
+        roots.extend([
+            home / ".steam" / "steam",
+            home / ".local" / "share" / "Steam",
+            home / ".var" / "app" / "com.valvesoftware.Steam" / ".local" / "share" / "Steam",
+        ])
+
+    unique = []
+    for root in roots:
+        if root not in unique:
+            unique.append(root)
+    return unique
+
+
+def read_steam_libraries(steam_root: Path) -> Dict[str, List[str]]:
+    """
+    Read libraryfolders.vdf and return {library_path: [app ids]}.
+    Old-format files list bare paths with no app ids.
+    """
+    data = _read_vdf(Path(steam_root) / "steamapps" / "libraryfolders.vdf")
+    if not data:
+        return {}
+
+    folders = data.get("libraryfolders", {})
+    libraries = {}
+    for key, value in folders.items():
+        if not key.isdigit():
+            continue
+        if isinstance(value, dict):
+            if value.get("path"):
+                libraries[value["path"]] = list(value.get("apps", {}).keys())
+        elif value:
+            libraries[value] = []
+    return libraries
+
+
+def read_steam_app_manifest(library_path: str, app_id: str = STEAM_APP_ID) -> Optional[str]:
+    """Resolve an app's install directory from its appmanifest_<id>.acf"""
+    steamapps = Path(library_path) / "steamapps"
+    data = _read_vdf(steamapps / f"appmanifest_{app_id}.acf")
+    if not data:
+        return None
+    install_dir = data.get("appstate", {}).get("installdir")
+    if not install_dir:
+        return None
+    return str(steamapps / "common" / install_dir)
+
+
+def find_steam_install(registry: Optional[RegistryBackend] = None,
+                       steam_roots: Optional[List[Path]] = None,
+                       scan_titles: bool = False) -> Optional[str]:
+    """
+    Find the game through the Steam library manifests. Only the game's own
+    appmanifest is read, unless scan_titles is set: then, if the app id is
+    not listed, every manifest is read to match the title (explicit rescans).
+    """
+    if steam_roots is None:
+        steam_roots = find_steam_roots(registry)
+
+    for steam_root in steam_roots:
+        libraries = read_steam_libraries(steam_root)
+        # The client directory is always a library, even if not listed
+        libraries.setdefault(str(steam_root), [])
+
+        # Libraries that list the app id are checked first; old-format
+        # entries without app lists are checked afterwards
+        ordered = sorted(libraries.items(), key=lambda item: STEAM_APP_ID not in item[1])
+        for library_path, app_ids in ordered:
+            if app_ids and STEAM_APP_ID not in app_ids:
+                continue
+            install_path = read_steam_app_manifest(library_path)
+            if install_path:
+                logger.info(f"Steam manifest points to: {install_path}")
+                return install_path
+
+        if not scan_titles:
+            continue
+        # App id not listed anywhere - fall back to matching manifest titles
+        for library_path in libraries:
+            install_path = find_steam_manifest_by_title(library_path)
+            if install_path:
+                logger.info(f"Steam manifest points to: {install_path}")
+                return install_path
+    return None
+
+
+def find_steam_manifest_by_title(library_path: str) -> Optional[str]:
+    """Resolve the install directory by matching appmanifest titles"""
+    steamapps = Path(library_path) / "steamapps"
+    try:
+        manifests = list(steamapps.glob("appmanifest_*.acf"))
+    except OSError:
+        return None
+
+    for manifest in manifests:
+        data = _read_vdf(manifest)
+        app_state = (data or {}).get("appstate", {})
+        if _is_rebellion_title(app_state.get("name", "")) and app_state.get("installdir"):
+            return str(steamapps / "common" / app_state["installdir"])
+    return None
+
+
+def is_steam_install(path: str) -> bool:
+    """Check whether a path lies inside a Steam library's steamapps folder"""
+    parts = [part.lower() for part in Path(path).parts]
+    for index, part in enumerate(parts[:-1]):
+        if part == "steamapps" and parts[index + 1] == "common":
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# GOG
+# ---------------------------------------------------------------------------
+
+def _is_rebellion_title(title: str) -> bool:
+    lowered = title.lower()
+    return all(keyword in lowered for keyword in STOREFRONT_TITLE_KEYWORDS)
+
+
+def find_gog_install_from_registry(registry: Optional[RegistryBackend] = None) -> Optional[str]:
+    """Find the game through the GOG installer registry records"""
+    registry = registry or get_registry_backend()
+    for base_key in GOG_REGISTRY_KEYS:
+        for game_id in registry.subkeys(base_key):
+            values = registry.values(f"{base_key}\\{game_id}")
+            if _is_rebellion_title(values.get("gameName", "")) and values.get("path"):
+                logger.info(f"GOG registry points to: {values['path']}")
+                return values["path"]
+    return None
+
+
+def find_gog_install_from_galaxy(db_path: Optional[str] = None) -> Optional[str]:
+    """Find the game through the GOG Galaxy 2.0 database"""
+    db_path = db_path or os.path.expandvars(GOG_GALAXY_DB)
+    if not os.path.isfile(db_path):
+        return None
+
+    try:
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(
+                "SELECT ibp.installationPath, ld.title FROM InstalledBaseProducts ibp "
+                "JOIN LimitedDetails ld ON ld.productId = ibp.productId"
+            ).fetchall()
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read GOG Galaxy database: {e}")
+        return None
+
+    for install_path, title in rows:
+        if title and install_path and _is_rebellion_title(title):
+            logger.info(f"GOG Galaxy points to: {install_path}")
+            return install_path
+    return None
+
+
+def find_storefront_install(registry: Optional[RegistryBackend] = None,
+                            steam_roots: Optional[List[Path]] = None,
+                            galaxy_db: Optional[str] = None,
+                            scan_titles: bool = False) -> Optional[StorefrontInstall]:
+    """Resolve the install directory from Steam or GOG records"""
+    registry = registry or get_registry_backend()
+
+    path = find_steam_install(registry, steam_roots, scan_titles)
+    if path:
+        return StorefrontInstall(path, "steam")
+
+    path = find_gog_install_from_registry(registry) or find_gog_install_from_galaxy(galaxy_db)
+    if path:
+        return StorefrontInstall(path, "gog")
+
+    return None
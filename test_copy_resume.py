@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Resumable copy tests
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from checkpoint import CheckpointJournal
+from config import COPY_CHECKPOINT_CHUNK, COPY_RESUMABLE_MIN_SIZE
+from copy_scheduler import CopyJob, CopyScheduler
+from file_copy import STRATEGY_RESUMABLE
+
+DATA = os.urandom(COPY_RESUMABLE_MIN_SIZE + 3 * COPY_CHECKPOINT_CHUNK)
+DIGEST = hashlib.sha256(DATA).hexdigest()
+
+
+def copy(tmp_path, cancel_event=None, progress=None) -> CopyJob:
+    scheduler = CopyScheduler(checkpoint=CheckpointJournal(tmp_path, "test"), verify=True,
+                              cancel_event=cancel_event, progress=progress)
+    return scheduler.run([CopyJob(tmp_path / "source", tmp_path / "dest", expected_sha256=DIGEST)])[0]
+
+
+def test_interrupted_copy_resumes_from_checkpoint(tmp_path):
+    (tmp_path / "source").write_bytes(DATA)
+    cancel = threading.Event()
+    # Cancel once the first checkpointed chunk is durable
+    job = copy(tmp_path, cancel, progress=lambda done, total: cancel.set())
+    assert not job.ok
+    offset = CheckpointJournal(tmp_path, "test").resume_offset(tmp_path / "source", tmp_path / "dest")
+    assert 0 < offset < len(DATA)
+
+    reported = []
+    job = copy(tmp_path, progress=lambda done, total: reported.append(done))
+    assert job.ok and job.strategy == STRATEGY_RESUMABLE and job.sha256 == DIGEST
+    assert (tmp_path / "dest").read_bytes() == DATA
+    # The kept prefix is counted at once, not copied again
+    assert reported[0] == offset
+
+
+def test_corrupt_resumed_prefix_is_caught_and_recopied(tmp_path):
+    (tmp_path / "source").write_bytes(DATA)
+    (tmp_path / "dest").write_bytes(b"\0" * COPY_CHECKPOINT_CHUNK)
+    CheckpointJournal(tmp_path, "test").record(tmp_path / "source", tmp_path / "dest", COPY_CHECKPOINT_CHUNK)
+
+    job = copy(tmp_path)
+    assert not job.ok and "Checksum mismatch" in job.error
+    # The failed prefix is forgotten, so the next run starts over
+    job = copy(tmp_path)
+    assert job.ok and (tmp_path / "dest").read_bytes() == DATA
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Binary delta tests
+"""
+
+import json
+import sys
+import hashlib
+from pathlib import Path
+
+import pytest
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import installer as installer_module
+from config import GAME_EXECUTABLE, INSTALL_MANIFEST_FILE
+from delta import DeltaError, apply_delta, create_delta, delta_filename
+from installer import RebellionFixInstaller
+from payload import find_payload_source, get_expected_entry
+
+ORIGINAL = b"original build " * 64
+
+
+def test_apply_delta_round_trip(tmp_path):
+    target = ORIGINAL[:200] + b"patched bytes" + ORIGINAL[300:]
+    (tmp_path / "original").write_bytes(ORIGINAL)
+    (tmp_path / "delta").write_bytes(create_delta(ORIGINAL, target))
+
+    digest = apply_delta(tmp_path / "original", tmp_path / "delta", tmp_path / "output")
+    assert (tmp_path / "output").read_bytes() == target
+    assert digest == hashlib.sha256(target).hexdigest()
+
+
+def test_apply_delta_rejects_other_original_of_same_size(tmp_path):
+    (tmp_path / "original").write_bytes(b"x" * len(ORIGINAL))
+    (tmp_path / "delta").write_bytes(create_delta(ORIGINAL, ORIGINAL + b"patch"))
+
+    with pytest.raises(DeltaError):
+        apply_delta(tmp_path / "original", tmp_path / "delta", tmp_path / "output")
+    assert not (tmp_path / "output").exists()
+
+
+def install_with_delta(tmp_path, monkeypatch, target: bytes) -> dict:
+    """Install REBEXE.exe over ORIGINAL with a delta producing target; returns the install manifest"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    delta_dir = tmp_path / "deltas"
+    delta_dir.mkdir()
+    delta_path = delta_dir / delta_filename(GAME_EXECUTABLE, hashlib.sha256(ORIGINAL).hexdigest())
+    delta_path.write_bytes(create_delta(ORIGINAL, target))
+    monkeypatch.setattr(installer_module, "find_delta",
+                        lambda filename, sha256: delta_path if delta_path.name == delta_filename(filename, sha256) else None)
+
+    game_dir = tmp_path / "game"
+    game_dir.mkdir()
+    (game_dir / GAME_EXECUTABLE).write_bytes(ORIGINAL)
+    installer = RebellionFixInstaller()
+    installer.game_path = str(game_dir)
+    assert installer.install_patch_files([GAME_EXECUTABLE])
+
+    payload = find_payload_source(GAME_EXECUTABLE).read_bytes()
+    assert (game_dir / GAME_EXECUTABLE).read_bytes() == payload
+    with open(game_dir / INSTALL_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)["files"][GAME_EXECUTABLE]
+
+
+def test_install_rebuilds_from_matching_delta(tmp_path, monkeypatch):
+    payload = find_payload_source(GAME_EXECUTABLE).read_bytes()
+    entry = install_with_delta(tmp_path, monkeypatch, payload)
+    assert entry["method"] == "delta"
+    assert entry["sha256"] == get_expected_entry(GAME_EXECUTABLE)["sha256"]
+
+
+def test_install_falls_back_when_delta_is_stale(tmp_path, monkeypatch):
+    entry = install_with_delta(tmp_path, monkeypatch, b"an older patched build" * 300)
+    assert entry["method"] != "delta"
+    assert entry["sha256"] == get_expected_entry(GAME_EXECUTABLE)["sha256"]
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Game discovery tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import GAME_EXECUTABLE
+from discovery import GameDiscovery
+
+
+def make_game(directory: Path) -> Path:
+    directory.mkdir(parents=True)
+    (directory / GAME_EXECUTABLE).write_bytes(b"game")
+    return directory
+
+
+def test_finds_game_and_skips_backup_folders(tmp_path):
+    game = make_game(tmp_path / "Games" / "Rebellion")
+    make_game(game / "Backup_20250101_120000")
+    found = [candidate.path for candidate in GameDiscovery(roots=[str(tmp_path)]).find_all()]
+    assert found == [str(game)]
+
+
+def test_stop_before_scan_is_kept(tmp_path):
+    make_game(tmp_path / "Games" / "Rebellion")
+    discovery = GameDiscovery(roots=[str(tmp_path)])
+    discovery.stop()
+    assert list(discovery.find_all()) == []
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Discovery cache tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import GAME_EXECUTABLE
+from discovery_cache import DiscoveryCache
+
+
+def make_game(directory: Path) -> Path:
+    directory.mkdir(parents=True)
+    (directory / GAME_EXECUTABLE).write_bytes(b"game")
+    return directory
+
+
+def test_remember_stores_absolute_paths(tmp_path, monkeypatch):
+    game = make_game(tmp_path / "g1")
+    monkeypatch.chdir(tmp_path)
+    cache = DiscoveryCache(tmp_path / "cache.json")
+    assert cache.remember("g1")
+
+    monkeypatch.chdir("/")
+    assert DiscoveryCache(tmp_path / "cache.json").lookup()["path"] == str(game.resolve())
+
+
+def test_remember_persists_last_seen(tmp_path):
+    first = make_game(tmp_path / "first")
+    second = make_game(tmp_path / "second")
+    cache = DiscoveryCache(tmp_path / "cache.json")
+    cache.remember(str(first))
+    cache.remember(str(second))
+    cache.remember(str(first))
+
+    # The most recently seen install wins after a reload, too
+    assert DiscoveryCache(tmp_path / "cache.json").lookup()["path"] == str(first)
+
+
+def test_lookup_drops_vanished_and_relative_entries(tmp_path):
+    game = make_game(tmp_path / "game")
+    cache = DiscoveryCache(tmp_path / "cache.json")
+    cache.remember(str(game))
+    cache.entries["relative/game"] = dict(cache.entries[str(game)], last_seen=1e12)
+    cache.entries[str(tmp_path / "gone")] = dict(cache.entries[str(game)], last_seen=1e13)
+
+    assert cache.lookup()["path"] == str(game)
+    assert list(DiscoveryCache(tmp_path / "cache.json").entries) == [str(game)]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Fleet mode tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import GAME_EXECUTABLE
+from fleet import FleetOptions, expand_targets, run_fleet, fleet_exit_code
+
+
+def make_game(directory: Path) -> Path:
+    """Create a fake game directory holding an unpatched executable"""
+    directory.mkdir(parents=True)
+    (directory / GAME_EXECUTABLE).write_bytes(b"original build" * 8)
+    return directory
+
+
+def test_expand_targets_skips_backup_folders(tmp_path, monkeypatch):
+    """Backup folders hold a copy of REBEXE.exe but must never become targets"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    root = tmp_path / "fl"
+    games = [str(make_game(root / name)) for name in ("a", "b")]
+    assert expand_targets(str(root)) == games
+
+    options = FleetOptions(configure_compatibility=False, modify_shortcuts=False)
+    for _ in range(2):
+        results = run_fleet(expand_targets(str(root)), options, workers=2)
+        assert [result.path for result in results] == games
+        assert fleet_exit_code(results) == 0
+
+    # The first run's backups exist, yet expansion still finds only the games
+    backups = sorted(item for item in Path(games[0]).iterdir() if item.name.startswith("Backup_"))
+    assert len(backups) == 2
+    assert expand_targets(str(root)) == games
+    # Fleet targets are never offered to later runs as the detected game
+    assert not (tmp_path / "cache").exists()
+    for backup in backups:
+        assert not any(item.name.startswith("Backup_") for item in backup.iterdir())
+    assert (backups[0] / GAME_EXECUTABLE).read_bytes() == b"original build" * 8
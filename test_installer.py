@@ -114,6 +114,23 @@ def test_all_features():
     print("  --nobriefing      Remove briefing files automatically")
     print("  --nobackup        Skip backup creation")
     print("  --uninstall       Uninstall patch and restore from backup")
+    print("  --force           Reinstall files that are already up to date")
+    print("  --verify          Read back copied files to verify them")
+    print("  --fast-copy       Copy with the system's fastest method, without checksums")
+    print("  --archive-backup  Store the backup as one compressed archive")
+    print("  --wait            Install once the running game has closed")
+    print("  --gc-backups      Remove unreferenced backup store data")
+    print("  --verify-only     Compare game files with the latest backup")
+    print("  --list-backups    List backups of the game installation")
+    print("  --restore ID      Restore a specific backup")
+    print("  --prune-backups   Delete old backups (--dry-run to preview)")
+    print("  --keep N          Newest backups kept when pruning")
+    print("  --scan            Report game files that changed since last scan")
+    print("  --reference FILE  Compare --scan with a fingerprint or 'patched'")
+    print("  --watch           Re-apply patch files reverted by Steam")
+    print("  --progress json   Emit progress events as JSON lines")
+    print("  --targets FILE    Install to many games (file of paths or folder)")
+    print("  --rescan          Ignore cached game location and search again")
     print("  --help            Show help message")
     print()
     
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Already-patched detection tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import installer as installer_module
+from config import GAME_EXECUTABLE, PATCHED_EXE_VERSION
+from installer import RebellionFixInstaller
+from payload import find_payload_source
+
+
+def make_installer(tmp_path, monkeypatch, exe: bytes) -> RebellionFixInstaller:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    game_dir = tmp_path / "game"
+    game_dir.mkdir()
+    (game_dir / GAME_EXECUTABLE).write_bytes(exe)
+    installer = RebellionFixInstaller()
+    installer.game_path = str(game_dir)
+    return installer
+
+
+def test_payload_executable_is_patched(tmp_path, monkeypatch):
+    installer = make_installer(tmp_path, monkeypatch, find_payload_source(GAME_EXECUTABLE).read_bytes())
+    assert installer.is_already_patched()
+
+
+def test_other_release_is_detected_by_file_version(tmp_path, monkeypatch):
+    installer = make_installer(tmp_path, monkeypatch, b"older release of the fix" * 8)
+    versions = {}
+    monkeypatch.setattr(installer_module, "get_file_version", lambda path: versions.get("exe"))
+    assert not installer.is_already_patched()
+
+    versions["exe"] = PATCHED_EXE_VERSION
+    assert installer.is_already_patched()
+
+    versions["exe"] = (0, 1, 0, 3)
+    assert not installer.is_already_patched()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Process detection tests
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import GAME_EXECUTABLE
+from installer import RebellionFixInstaller
+from processes import FakeProcessBackend, ProcfsBackend, is_process_running, wait_for_exit
+
+
+def test_procfs_backend_matches_argv0_and_wine_comm(tmp_path):
+    for pid, cmdline, comm in [
+        ("101", b"C:\\Games\\Rebellion\\REBEXE.exe\0-w\0", "wine-preloader"),
+        ("102", b"wine-preloader\0", "REBEXE.exe"),
+        ("103", b"/usr/bin/python3\0", "python3"),
+    ]:
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / "cmdline").write_bytes(cmdline)
+        (tmp_path / pid / "comm").write_text(comm + "\n")
+    (tmp_path / "self").mkdir()
+
+    backend = ProcfsBackend(str(tmp_path))
+    assert sorted(backend.find_pids(GAME_EXECUTABLE)) == [101, 102]
+    assert sorted(backend.find_pids_any()) == [101, 102, 103]
+
+
+def test_wait_for_exit_returns_when_game_closes():
+    backend = FakeProcessBackend({42: "C:\\Games\\REBEXE.exe"})
+    assert is_process_running(GAME_EXECUTABLE, backend)
+
+    timer = threading.Timer(0.1, backend.exit, args=(42,))
+    timer.start()
+    assert wait_for_exit(GAME_EXECUTABLE, timeout=5, backend=backend)
+    assert not is_process_running(GAME_EXECUTABLE, backend)
+
+
+def test_wait_for_exit_times_out_or_stops():
+    backend = FakeProcessBackend({42: "REBEXE.exe"})
+    assert not wait_for_exit(GAME_EXECUTABLE, timeout=0.1, backend=backend)
+
+    stop = threading.Event()
+    stop.set()
+    assert not wait_for_exit(GAME_EXECUTABLE, backend=backend, stop_event=stop)
+
+
+def test_installer_uses_its_process_backend(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    installer = RebellionFixInstaller()
+    installer.process_backend = FakeProcessBackend({7: "rebexe.exe"})
+    assert installer.is_game_running()
+    installer.cancel()
+    assert not installer.wait_for_game_exit()
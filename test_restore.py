@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Backup restore tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import GAME_EXECUTABLE, RESTORE_STAGING_DIR
+from installer import RebellionFixInstaller
+from payload import find_payload_source
+
+ORIGINAL = b"original build" * 8
+
+
+def install(game_dir: Path) -> RebellionFixInstaller:
+    """Back up and patch game_dir the way a (re)install does"""
+    installer = RebellionFixInstaller()
+    installer.game_path = str(game_dir)
+    assert installer.perform_installation(configure_compatibility=False, modify_shortcuts=False)
+    installer.wait_for_background_prune()
+    return installer
+
+
+def test_uninstall_after_reinstall_restores_originals(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    game_dir = tmp_path / "game"
+    game_dir.mkdir()
+    (game_dir / GAME_EXECUTABLE).write_bytes(ORIGINAL)
+
+    install(game_dir)
+    # The reinstall's backup holds the patched files and is the newest
+    installer = install(game_dir)
+    backups = installer.get_backups()
+    assert len(backups) == 2
+    assert installer.select_backup()["id"] == backups[1]["id"]
+
+    assert installer.restore_from_backup()
+    assert installer.files_restored
+    assert (game_dir / GAME_EXECUTABLE).read_bytes() == ORIGINAL
+    # Files are staged and swapped in, then the staging folder goes away
+    assert not (game_dir / RESTORE_STAGING_DIR).exists()
+    assert installer.restore_from_backup(verify_only=True)
+
+
+def test_restoring_patched_backup_is_not_success(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    game_dir = tmp_path / "game"
+    game_dir.mkdir()
+    (game_dir / GAME_EXECUTABLE).write_bytes(ORIGINAL)
+
+    install(game_dir)
+    installer = install(game_dir)
+    patched = installer.get_backups()[0]
+    assert not installer.restore_from_backup(backup_id=patched["id"])
+    assert (game_dir / GAME_EXECUTABLE).read_bytes() == find_payload_source(GAME_EXECUTABLE).read_bytes()
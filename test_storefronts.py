@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Storefront manifest tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import STEAM_APP_ID
+from storefronts import (
+    FixtureRegistryBackend, find_steam_roots, find_steam_install, find_storefront_install,
+    is_steam_install, parse_vdf, read_steam_libraries
+)
+
+LIBRARY_FOLDERS = """
+"libraryfolders"
+{
+    // Comments and escaped backslashes as written by the Steam client
+    "0"
+    {
+        "path"      "%(client)s"
+        "apps"
+        {
+            "228980"    "123"
+        }
+    }
+    "1"
+    {
+        "path"      "%(library)s"
+        "apps"
+        {
+            "%(app_id)s"    "456"
+        }
+    }
+}
+"""
+
+APP_MANIFEST = """
+"AppState"
+{
+    "appid"     "%(app_id)s"
+    "name"      "%(name)s"
+    "installdir"        "Star Wars Rebellion"
+}
+"""
+
+
+def make_steam(tmp_path, app_id=STEAM_APP_ID, name="Star Wars: Rebellion"):
+    """Create a Steam client with a second library holding the game"""
+    client = tmp_path / "Steam"
+    library = tmp_path / "Library"
+    (client / "steamapps").mkdir(parents=True)
+    (library / "steamapps").mkdir(parents=True)
+    (client / "steamapps" / "libraryfolders.vdf").write_text(
+        LIBRARY_FOLDERS % {"client": str(client).replace("\\", "\\\\"),
+                           "library": str(library).replace("\\", "\\\\"), "app_id": app_id})
+    (library / "steamapps" / f"appmanifest_{app_id}.acf").write_text(APP_MANIFEST % {"app_id": app_id, "name": name})
+    return client, library
+
+
+def test_parse_vdf_lowercases_keys_and_unescapes():
+    data = parse_vdf('"Root" { "Path" "C:\\\\Games" "Nested" { "Key" "v" } }')
+    assert data == {"root": {"path": "C:\\Games", "nested": {"key": "v"}}}
+
+
+def test_read_steam_libraries(tmp_path):
+    client, library = make_steam(tmp_path)
+    libraries = read_steam_libraries(client)
+    assert libraries == {str(client): ["228980"], str(library): [STEAM_APP_ID]}
+
+
+def test_find_steam_install_from_app_manifest(tmp_path):
+    client, library = make_steam(tmp_path)
+    install = find_steam_install(steam_roots=[client])
+    assert install == str(library / "steamapps" / "common" / "Star Wars Rebellion")
+    assert is_steam_install(install)
+
+
+def test_title_scan_only_on_request(tmp_path):
+    client, library = make_steam(tmp_path, app_id="999999")
+    assert find_steam_install(steam_roots=[client]) is None
+    assert find_steam_install(steam_roots=[client], scan_titles=True) == \
+        str(library / "steamapps" / "common" / "Star Wars Rebellion")
+
+
+def test_steam_root_from_registry_fixture(tmp_path):
+    registry = FixtureRegistryBackend({r"HKCU\Software\Valve\Steam": {"SteamPath": str(tmp_path / "Steam")}})
+    assert find_steam_roots(registry)[0] == tmp_path / "Steam"
+
+
+def test_gog_install_from_registry_fixture(tmp_path):
+    registry = FixtureRegistryBackend({
+        r"HKLM\SOFTWARE\GOG.com\Games\1207658878": {"gameName": "Star Wars: Rebellion", "path": r"C:\GOG Games\Rebellion"},
+        r"HKLM\SOFTWARE\GOG.com\Games\1207658879": {"gameName": "Another Game", "path": r"C:\GOG Games\Other"},
+    })
+    install = find_storefront_install(registry, steam_roots=[], galaxy_db=str(tmp_path / "missing.db"))
+    assert install is not None
+    assert (install.path, install.storefront) == (r"C:\GOG Games\Rebellion", "gog")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Star Wars: Rebellion Community Fix Installer - Install transaction tests
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add project directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import INSTALL_JOURNAL_FILE, INSTALL_STAGING_DIR
+from transaction import InstallTransaction, recover_transaction, STATE_COMMITTING, STATE_STAGING
+
+FILES = ["REBEXE.exe", "DDraw.dll"]
+
+
+def stage(game_dir: Path) -> InstallTransaction:
+    """Stage new content for FILES over originals in game_dir"""
+    for filename in FILES:
+        (game_dir / filename).write_bytes(b"original " + filename.encode())
+    transaction = InstallTransaction(game_dir)
+    transaction.begin()
+    for filename in FILES:
+        transaction.staged_path(filename).write_bytes(b"patched " + filename.encode())
+        transaction.add(filename)
+    return transaction
+
+
+def contents(game_dir: Path):
+    return [(game_dir / filename).read_bytes().split(b" ")[0] for filename in FILES]
+
+
+def test_commit_swaps_files_and_cleans_up(tmp_path):
+    stage(tmp_path).commit()
+    assert contents(tmp_path) == [b"patched", b"patched"]
+    assert not (tmp_path / INSTALL_JOURNAL_FILE).exists()
+    assert not (tmp_path / INSTALL_STAGING_DIR).exists()
+
+
+def test_rollback_keeps_originals(tmp_path):
+    stage(tmp_path).rollback()
+    assert contents(tmp_path) == [b"original", b"original"]
+    assert not (tmp_path / INSTALL_JOURNAL_FILE).exists()
+
+
+def test_commit_interrupted_midway_is_replayed(tmp_path):
+    transaction = stage(tmp_path)
+    transaction.originals_dir.mkdir(parents=True)
+    transaction.state = STATE_COMMITTING
+    transaction._write_journal()
+    # Crash after the first file was swapped in
+    os.replace(tmp_path / FILES[0], transaction.originals_dir / FILES[0])
+    os.replace(transaction.staged_path(FILES[0]), tmp_path / FILES[0])
+
+    assert recover_transaction(tmp_path) == "replayed"
+    assert contents(tmp_path) == [b"patched", b"patched"]
+    assert InstallTransaction.load(tmp_path) is None
+
+
+def test_staging_transaction_is_kept_for_resume(tmp_path):
+    stage(tmp_path)
+    assert recover_transaction(tmp_path) is None
+    pending = InstallTransaction.load(tmp_path)
+    assert pending.state == STATE_STAGING and pending.files == FILES
+    assert contents(tmp_path) == [b"original", b"original"]
+
+    assert recover_transaction(tmp_path, discard_staged=True) == "rolled back"
+    assert contents(tmp_path) == [b"original", b"original"]
+    assert InstallTransaction.load(tmp_path) is None
@@ -0,0 +1,181 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Staged, journaled install transactions
+
+Every new file is first written to a staging area on the same volume as
+the game. Commit then swaps all of them in with back-to-back os.replace
+renames, moving the replaced originals aside so they can be put back.
+A journal records progress, so an interrupted commit is replayed (and an
+interrupted staging resumed) the next time the installer runs.
+"""
+
+import os
+import json
+import shutil
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from config import INSTALL_STAGING_DIR, INSTALL_JOURNAL_FILE
+from file_copy import copy_file
+
+# Journal states
+STATE_STAGING = "staging"
+STATE_COMMITTING = "committing"
+STATE_COMMITTED = "committed"
+
+logger = logging.getLogger('rebellion_installer')
+
+
+def _fsync_file(path: Path):
+    try:
+        with open(path, 'rb+') as f:
+            os.fsync(f.fileno())
+    except OSError:
+        pass
+
+
+class InstallTransaction:
+    """All-or-nothing replacement of a set of files in the game directory"""
+
+    def __init__(self, game_dir, transaction_id: Optional[str] = None):
+        self.game_dir = Path(game_dir)
+        self.transaction_id = transaction_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.staging_dir = self.game_dir / INSTALL_STAGING_DIR / self.transaction_id
+        self.originals_dir = self.staging_dir / "originals"
+        self.journal_file = self.game_dir / INSTALL_JOURNAL_FILE
+        self.files: List[str] = []
+        self.state = STATE_STAGING
+
+    # -- journal -----------------------------------------------------------
+
+    def _write_journal(self):
+        data = {
+            "transaction_id": self.transaction_id,
+            "state": self.state,
+            "files": self.files,
+        }
+        tmp_file = self.journal_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.journal_file)
+
+    @classmethod
+    def load(cls, game_dir) -> Optional["InstallTransaction"]:
+        """Load the pending transaction for a game directory, if any"""
+        journal_file = Path(game_dir) / INSTALL_JOURNAL_FILE
+        try:
+            with open(journal_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        transaction = cls(game_dir, data.get("transaction_id"))
+        transaction.files = list(data.get("files", []))
+        transaction.state = data.get("state", STATE_STAGING)
+        return transaction
+
+    # -- staging -----------------------------------------------------------
+
+    def begin(self):
+        """Create the staging area and journal"""
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self._write_journal()
+
+    def staged_path(self, filename: str) -> Path:
+        """Get the staging path for a file; write the new content there"""
+        return self.staging_dir / filename
+
+    def add(self, filename: str):
+        """Register a fully written staged file"""
+        _fsync_file(self.staged_path(filename))
+        if filename not in self.files:
+            self.files.append(filename)
+        self._write_journal()
+
+    def stage_copy(self, filename: str, source_file):
+        """Stage a copy of source_file as filename"""
+        copy_file(source_file, self.staged_path(filename))
+        self.add(filename)
+
+    # -- commit / recovery --------------------------------------------------
+
+    def commit(self):
+        """Swap all staged files into place"""
+        self.originals_dir.mkdir(parents=True, exist_ok=True)
+        self.state = STATE_COMMITTING
+        self._write_journal()
+
+        self._replay()
+
+        self.state = STATE_COMMITTED
+        self._write_journal()
+        self._cleanup()
+
+    def _replay(self):
+        """Move each staged file into place, keeping the original aside"""
+        for filename in self.files:
+            staged = self.staged_path(filename)
+            if not staged.exists():
+                # Already swapped in by an earlier, interrupted commit
+                continue
+            dest = self.game_dir / filename
+            original = self.originals_dir / filename
+            if dest.exists() and not original.exists():
+                os.replace(dest, original)
+            os.replace(staged, dest)
+
+    def rollback(self):
+        """Put back any originals already swapped out and discard staged files"""
+        for filename in self.files:
+            original = self.originals_dir / filename
+            dest = self.game_dir / filename
+            if original.exists():
+                os.replace(original, dest)
+            elif self.state == STATE_COMMITTING and not self.staged_path(filename).exists():
+                # Swapped in where no original existed - remove it again
+                try:
+                    dest.unlink()
+                except OSError:
+                    pass
+        self._cleanup()
+
+    def _cleanup(self):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        try:
+            self.staging_dir.parent.rmdir()
+        except OSError:
+            pass
+        try:
+            self.journal_file.unlink()
+        except OSError:
+            pass
+
+
+def recover_transaction(game_dir, discard_staged: bool = False) -> Optional[str]:
+    """
+    Finish a transaction interrupted by a crash during commit. One that was
+    still staging has not touched the game and is left for the next install
+    to resume, unless discard_staged is set.
+    Returns "replayed", "rolled back" or None if nothing was done.
+    """
+    transaction = InstallTransaction.load(game_dir)
+    if transaction is None:
+        return None
+
+    if transaction.state in (STATE_COMMITTING, STATE_COMMITTED):
+        # Every file was staged and verified before commit began - finish it
+        transaction._replay()
+        transaction._cleanup()
+        logger.info(f"Replayed interrupted install transaction {transaction.transaction_id}")
+        return "replayed"
+
+    if not discard_staged:
+        return None
+
+    transaction.rollback()
+    logger.info(f"Rolled back interrupted install transaction {transaction.transaction_id}")
+    return "rolled back"
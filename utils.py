@@ -8,6 +8,9 @@ import sys
 import logging
 import subprocess
 from pathlib import Path
+from typing import Optional, Tuple
+
+from pe_version import read_file_version, PEFormatError
 
 # Windows-only imports
 if sys.platform == 'win32':
@@ -77,34 +80,18 @@ def run_as_admin():
         print(f"Failed to run as administrator: {e}")
 
 
-def get_file_version(file_path: str) -> str:
-    """Get file version from Windows executable"""
-    if sys.platform != 'win32':
-        # On non-Windows, assume patched version for demo purposes
-        return "1.02" if "REBEXE" in file_path else "1.0"
-    
+def get_file_version(file_path: str) -> Optional[Tuple[int, int, int, int]]:
+    """Get file version from a Windows executable as a comparable tuple"""
     try:
-        import win32api
-        info = win32api.GetFileVersionInfo(file_path, "\\")
-        ms = info['FileVersionMS']
-        ls = info['FileVersionLS']
-        version = f"{win32api.HIWORD(ms)}.{win32api.LOWORD(ms)}"
-        return version
-    except:
-        return ""
+        return read_file_version(file_path)
+    except (OSError, PEFormatError):
+        return None
 
 
 def calculate_file_hash(file_path: str, algorithm: str = 'md5') -> str:
     """Calculate hash of a file"""
-    import hashlib
-    
-    hash_algo = getattr(hashlib, algorithm)()
-    
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_algo.update(chunk)
-    
-    return hash_algo.hexdigest()
+    from hashing import hash_file
+    return hash_file(file_path, (algorithm,))[algorithm]
 
 
 def check_disk_space(path: str, required_bytes: int) -> bool:
@@ -211,13 +198,5 @@ def get_windows_version() -> str:
 
 def is_process_running(process_name: str) -> bool:
     """Check if a process is currently running"""
-    try:
-        result = subprocess.run(
-            ["tasklist", "/FI", f"IMAGENAME eq {process_name}"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        return process_name.lower() in result.stdout.lower()
-    except:
-        return False
+    from processes import is_process_running as native_is_process_running
+    return native_is_process_running(process_name)
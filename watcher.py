@@ -0,0 +1,321 @@
+"""
+Star Wars: Rebellion Community Fix Installer
+Patch watcher
+
+Keeps the patch applied when something (typically Steam's "verify integrity
+of game files") puts the original files back. The game directory is watched
+with inotify on Linux/Wine or a change notification on Windows, falling back
+to polling the patch files' stat. The watcher sleeps in the kernel until the
+directory changes, waits for the changes to settle (so a whole Steam
+validation pass causes one repair), then checks the patch files and
+reinstalls only those whose size or SHA-256 no longer match the payload.
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import PATCH_FILES, GAME_EXECUTABLE, WATCH_DEBOUNCE, WATCH_MAX_DELAY, WATCH_POLL_INTERVAL
+from payload import get_expected_entry, sha256_file
+from processes import is_process_running
+
+
+class ChangeBackend(ABC):
+    """Base directory change backend"""
+
+    @abstractmethod
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the watched files may have changed (True), the timeout
+        passes or wake() is called (False). timeout None waits indefinitely.
+        """
+
+    @abstractmethod
+    def wake(self):
+        """Make a blocked wait() return"""
+
+    def close(self):
+        pass
+
+
+class InotifyBackend(ChangeBackend):
+    """Linux/Wine backend watching the game directory with inotify"""
+
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, directory: str, filenames: Sequence[str]):
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.filenames = {name.lower() for name in filenames}
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory rather than the files: replacing a file by
+        # rename would silently end a watch on the file itself
+        mask = (self.IN_ATTRIB | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO
+                | self.IN_CREATE | self.IN_DELETE)
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self._wake_read, self._wake_write = os.pipe()
+
+    def _drain(self) -> bool:
+        """Read pending events; True if any concerns a watched file"""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_len = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset:offset + name_len].rstrip(b"\0").decode("utf-8", "replace")
+                offset += name_len
+                relevant = relevant or name.lower() in self.filenames
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd, self._wake_read], [], [], remaining)
+            if self._wake_read in ready:
+                os.read(self._wake_read, 64)
+                return False
+            if not ready:
+                return False
+            if self._drain():
+                return True
+
+    def wake(self):
+        try:
+            os.write(self._wake_write, b"\0")
+        except OSError:
+            pass
+
+    def close(self):
+        for fd in (self.fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class DirectoryChangeBackend(ChangeBackend):
+    """Windows backend using a directory change notification handle"""
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+    FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    WAIT_OBJECT_0 = 0x00000000
+    INFINITE = 0xFFFFFFFF
+
+    def __init__(self, directory: str, filenames: Sequence[str]):
+        import ctypes
+        from ctypes import wintypes
+        self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self.kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self.kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.CreateEventW.restype = wintypes.HANDLE
+        self.kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE),
+                                                         wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        for name in ("FindNextChangeNotification", "FindCloseChangeNotification", "SetEvent", "CloseHandle"):
+            getattr(self.kernel32, name).argtypes = [wintypes.HANDLE]
+
+        self.change_handle = self.kernel32.FindFirstChangeNotificationW(
+            directory, False,
+            self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if not self.change_handle or self.change_handle == wintypes.HANDLE(-1).value:
+            raise OSError(ctypes.get_last_error(), f"FindFirstChangeNotification failed for {directory}")
+        self.wake_handle = self.kernel32.CreateEventW(None, False, False, None)
+        self.handles = (wintypes.HANDLE * 2)(self.change_handle, self.wake_handle)
+        # The notification does not name files, so tell them apart by stat
+        self.poller = PollingBackend(directory, filenames)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.INFINITE if deadline is None else \
+                int(max(0.0, deadline - time.monotonic()) * 1000)
+            result = self.kernel32.WaitForMultipleObjects(2, self.handles, False, remaining)
+            if result != self.WAIT_OBJECT_0:
+                return False
+            self.kernel32.FindNextChangeNotification(self.change_handle)
+            if self.poller.changed():
+                return True
+
+    def wake(self):
+        self.kernel32.SetEvent(self.wake_handle)
+
+    def close(self):
+        self.kernel32.FindCloseChangeNotification(self.change_handle)
+        self.kernel32.CloseHandle(self.wake_handle)
+
+
+class PollingBackend(ChangeBackend):
+    """Fallback backend comparing the watched files' stat every interval"""
+
+    def __init__(self, directory: str, filenames: Sequence[str], interval: float = WATCH_POLL_INTERVAL):
+        self.paths = [os.path.join(directory, name) for name in filenames]
+        self.interval = interval
+        self._wake = threading.Event()
+        self._last = self._snapshot()
+
+    def _snapshot(self) -> List[Optional[Tuple[int, int, int]]]:
+        snapshot = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                snapshot.append((st.st_size, st.st_mtime_ns, st.st_ino))
+            except OSError:
+                snapshot.append(None)
+        return snapshot
+
+    def changed(self) -> bool:
+        """Whether any watched file's stat changed since the last call"""
+        snapshot = self._snapshot()
+        if snapshot == self._last:
+            return False
+        self._last = snapshot
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._wake.wait(self.interval if remaining is None else min(self.interval, remaining)):
+                self._wake.clear()
+                return False
+            if self.changed():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def wake(self):
+        self._wake.set()
+
+
+def get_watch_backend(directory: str, filenames: Sequence[str]) -> ChangeBackend:
+    """Get the native change backend for the current platform"""
+    try:
+        if sys.platform == 'win32':
+            return DirectoryChangeBackend(directory, filenames)
+        if sys.platform.startswith('linux'):
+            return InotifyBackend(directory, filenames)
+    except (OSError, AttributeError, ImportError) as e:
+        logging.getLogger('rebellion_installer').warning(f"Falling back to polling for file changes: {e}")
+    return PollingBackend(directory, filenames)
+
+
+class PatchWatcher:
+    """Re-applies patch files that have been reverted"""
+
+    def __init__(self, installer, backend: Optional[ChangeBackend] = None,
+                 debounce: float = WATCH_DEBOUNCE, max_delay: float = WATCH_MAX_DELAY):
+        self.installer = installer
+        self.game_dir = Path(installer.game_path)
+        self.backend = backend or get_watch_backend(str(self.game_dir), PATCH_FILES)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.logger = logging.getLogger('rebellion_installer')
+        self.repairs = 0
+        self._expected = {filename: get_expected_entry(filename) for filename in PATCH_FILES}
+        # Stat of each file when it last matched the payload, or last did not,
+        # so unchanged files are not rehashed or reported twice
+        self._good: Dict[str, Tuple[int, int, int]] = {}
+        self._bad: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._stop = threading.Event()
+
+    def check(self) -> List[str]:
+        """
+        Get the patch files that stopped matching the payload since the last
+        check. A file that still fails after a repair is not reported again
+        until it changes, so a broken repair cannot loop.
+        """
+        reverted = []
+        for filename, expected in self._expected.items():
+            if expected is None:
+                continue
+            try:
+                st = os.stat(self.game_dir / filename)
+                signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+            except OSError:
+                st = signature = None
+            if self._good.get(filename) == signature:
+                continue
+            if filename in self._bad and self._bad[filename] == signature:
+                continue
+            if st is not None and st.st_size == expected["size"] \
+                    and sha256_file(self.game_dir / filename) == expected["sha256"]:
+                self._good[filename] = signature
+                self._bad.pop(filename, None)
+            else:
+                self._good.pop(filename, None)
+                self._bad[filename] = signature
+                reverted.append(filename)
+        return reverted
+
+    def repair(self, reverted: List[str]) -> bool:
+        """Reinstall the given patch files, once the game is no longer running"""
+        self.logger.info(f"Patch files reverted: {', '.join(reverted)}")
+        if is_process_running(GAME_EXECUTABLE, self.installer.process_backend):
+            if not self.installer.wait_for_game_exit(stop_event=self._stop):
+                return False
+        repaired = self.installer.install_patch_files(reverted)
+        # Take in the repaired files, so the repair's own writes are not mistaken for a revert
+        still_reverted = self.check()
+        if repaired and not still_reverted:
+            self.repairs += 1
+            self.logger.info(f"Re-applied patch files: {', '.join(self.installer.files_installed)}")
+            return True
+        self.logger.error(f"Failed to re-apply reverted patch files: {', '.join(still_reverted or reverted)}")
+        return False
+
+    def run(self):
+        """Repair now if needed, then watch until stop() is called"""
+        self.logger.info(f"Watching patch files in {self.game_dir}")
+        try:
+            reverted = self.check()
+            if reverted:
+                self.repair(reverted)
+            while not self._stop.is_set():
+                if not self.backend.wait():
+                    continue
+                # Let a burst of changes (a whole verify pass) settle first
+                settle_by = time.monotonic() + self.max_delay
+                while not self._stop.is_set() and time.monotonic() < settle_by \
+                        and self.backend.wait(self.debounce):
+                    pass
+                if self._stop.is_set():
+                    break
+                reverted = self.check()
+                if reverted:
+                    self.repair(reverted)
+        finally:
+            self.backend.close()
+            self.logger.info("Stopped watching patch files")
+
+    def stop(self):
+        """Ask run() to return"""
+        self._stop.set()
+        self.installer.cancel()
+        self.backend.wake()